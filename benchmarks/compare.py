@@ -0,0 +1,42 @@
+"""
+Compares two benchmark result files, exits with status 1 when a scenario got slower (or uses more memory) than the
+threshold.
+
+    python benchmarks/compare.py baseline.json results.json --threshold 10
+"""
+
+import argparse
+import json
+import sys
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare benchmark results")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="allowed slowdown in percent"
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)["results"]
+    with open(args.current) as file:
+        current = json.load(file)["results"]
+
+    regressions = 0
+    for name in sorted(set(baseline) & set(current)):
+        metric = "bytes_per_item" if "bytes_per_item" in current[name] else "mean_us"
+        before = baseline[name][metric]
+        after = current[name][metric]
+        change = (after - before) / before * 100
+        marker = ""
+        if change > args.threshold:
+            marker = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<56}{before:>12.2f}{after:>12.2f}{change:>+9.1f}%{marker}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
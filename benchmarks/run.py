@@ -0,0 +1,65 @@
+"""
+Runs the benchmark suite and writes the results as JSON.
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --filter end_to_end --calls 5000 --threads 16
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import scenarios
+
+try:
+    from journyio.version import version
+except ImportError:
+    version = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="journy.io SDK benchmarks")
+    parser.add_argument("--output", help="file to write the JSON results to")
+    parser.add_argument(
+        "--filter", default="", help="only run scenarios containing this text"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    results = scenarios.run(
+        lambda name: args.filter in name, args.repeat, args.calls, args.threads
+    )
+    report = {
+        "sdk_version": version,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "results": results,
+    }
+
+    for name, result in results.items():
+        if "bytes_per_item" in result:
+            print(f"{name:<56}{result['bytes_per_item']:>12.0f} bytes per item")
+        else:
+            line = f"{name:<56}{result['mean_us']:>12.2f} µs{result['ops_per_sec']:>14.0f} ops/s"
+            if "connections" in result:
+                line += f"{result['connections']:>8} sockets"
+            if "ratio" in result:
+                line += f"{result['ratio']:>8.3f} ratio"
+            print(line)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,519 @@
+"""
+Benchmark scenarios for the SDK hot paths. Every scenario returns a dict of measurements.
+"""
+
+import asyncio
+import gc
+import json
+import threading
+import time
+import timeit
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from journyio.account_identified import AccountIdentified
+from journyio.client import AsyncClient, Client, Config, Properties
+from journyio.compression import DeflateCompressor, GzipCompressor, RequestCompression
+from journyio.events import Event, Metadata
+from journyio.httpclient import (
+    AsyncHttpClientAiohttp,
+    AsyncHttpClientHttpx,
+    HttpClient,
+    HttpClientHttpx,
+    HttpClientRequests,
+    HttpHeaders,
+    HttpRequest,
+    HttpResponse,
+    Method,
+    _http_response,
+    aiohttp,
+    httpx,
+)
+from journyio.memo import LinkMemo
+from journyio.results import Success
+from journyio.tracker import BufferedTracker, OverflowPolicy
+from journyio.user_identified import UserIdentified
+from requests.structures import CaseInsensitiveDict
+
+from stub_server import StubServer, h2
+
+headers = HttpHeaders()
+headers["X-RateLimit-Remaining"] = "4999"
+created_response = HttpResponse(201, headers, {"meta": {"requestId": "requestId"}})
+snippet_response = HttpResponse(
+    200,
+    headers,
+    {
+        "data": {"domain": "journy.io", "snippet": "<script></script>"},
+        "meta": {"requestId": "requestId"},
+    },
+)
+validate_response = HttpResponse(
+    200,
+    headers,
+    {"data": {"permissions": ["TrackData"]}, "meta": {"requestId": "requestId"}},
+)
+
+
+class NullHttpClient(HttpClient):
+    """
+    HttpClient without I/O, so only the cost of the SDK itself is measured.
+    """
+
+    def send(self, request):
+        if request.method is Method.GET:
+            if "/tracking/snippet" in request.url:
+                return snippet_response
+            return validate_response
+        return created_response
+
+
+user = UserIdentified("user_id", "user@journy.io")
+account = AccountIdentified("account_id", "www.journy.io")
+members = [UserIdentified.by_user_id(f"user-{i}") for i in range(10)]
+date = datetime(2020, 11, 2, 13, 37, 40)
+
+
+def create_metadata() -> Metadata:
+    metadata = Metadata()
+    metadata["plan"] = "pro"
+    metadata["seats"] = 5
+    metadata["trial"] = False
+    return metadata
+
+
+def create_properties() -> Properties:
+    properties = Properties()
+    properties["name"] = "Journy"
+    properties["plan"] = "pro"
+    properties["seats"] = 5
+    properties["tags"] = ["a", "b"]
+    properties["registered_at"] = date
+    return properties
+
+
+def create_event() -> Event:
+    return (
+        Event.for_user_in_account("login", user, account)
+        .happened_at(date)
+        .with_metadata(create_metadata())
+    )
+
+
+def measure_ops(function, repeat: int) -> dict:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat, number)) / number
+    return {
+        "mean_us": best * 1e6,
+        "ops_per_sec": 1 / best,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def percentile(values: list, fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def measure_calls(call, calls: int, threads: int) -> dict:
+    latencies = []
+    lock = threading.Lock()
+
+    def work(count: int):
+        measured = []
+        for _ in range(count):
+            started = time.perf_counter()
+            call()
+            measured.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(measured)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [
+            executor.submit(work, calls // threads + (i < calls % threads))
+            for i in range(threads)
+        ]:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "ops_per_sec": calls / elapsed,
+        "mean_us": sum(latencies) / len(latencies) * 1e6,
+        "p50_us": percentile(latencies, 0.5) * 1e6,
+        "p90_us": percentile(latencies, 0.9) * 1e6,
+        "p99_us": percentile(latencies, 0.99) * 1e6,
+        "calls": calls,
+        "threads": threads,
+    }
+
+
+def measure_tasks(call, calls: int, tasks: int, close) -> dict:
+    """
+    Like measure_calls, with tasks coroutines awaiting call() concurrently on one event loop. close() is awaited
+    on the same loop afterwards.
+    """
+    latencies = []
+
+    async def work(count: int):
+        for _ in range(count):
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    async def main():
+        try:
+            await asyncio.gather(
+                *[work(calls // tasks + (i < calls % tasks)) for i in range(tasks)]
+            )
+        finally:
+            await close()
+
+    started = time.perf_counter()
+    asyncio.run(main())
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "ops_per_sec": calls / elapsed,
+        "mean_us": sum(latencies) / len(latencies) * 1e6,
+        "p50_us": percentile(latencies, 0.5) * 1e6,
+        "p99_us": percentile(latencies, 0.99) * 1e6,
+        "calls": calls,
+        "tasks": tasks,
+    }
+
+
+def counting_connections(server: StubServer, measure) -> dict:
+    before = server.connections
+    result = measure()
+    result["connections"] = server.connections - before
+    return result
+
+
+def measure_batch(send, calls: int) -> dict:
+    started = time.perf_counter()
+    send()
+    elapsed = time.perf_counter() - started
+    return {
+        "ops_per_sec": calls / elapsed,
+        "mean_us": elapsed / calls * 1e6,
+        "calls": calls,
+    }
+
+
+def measure_memory(create, count: int) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [create(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {"bytes_per_item": (after - before) / len(items), "items": count}
+
+
+def queued_event(i: int) -> Event:
+    metadata = Metadata()
+    metadata["plan"] = "pro"
+    return Event.for_user_in_account(
+        "login", UserIdentified.by_user_id(f"user-{i}"), account
+    ).with_metadata(metadata)
+
+
+def memory_scenarios(count: int) -> dict:
+    return {
+        "memory.queued_event": lambda: measure_memory(queued_event, count),
+        "memory.event_for_user": lambda: measure_memory(
+            lambda i: Event.for_user("login", user), count
+        ),
+        "memory.success": lambda: measure_memory(
+            lambda i: Success("requestId", i, None), count
+        ),
+    }
+
+
+def construction_scenarios(repeat: int) -> dict:
+    return {
+        "construction.user_identified": lambda: measure_ops(
+            lambda: UserIdentified("user_id", "user@journy.io"), repeat
+        ),
+        "construction.event": lambda: measure_ops(
+            lambda: Event.for_user("login", user), repeat
+        ),
+        "construction.event_with_metadata": lambda: measure_ops(create_event, repeat),
+        "construction.metadata": lambda: measure_ops(create_metadata, repeat),
+        "construction.properties": lambda: measure_ops(create_properties, repeat),
+    }
+
+
+def request_building_scenarios(repeat: int) -> dict:
+    client = Client(NullHttpClient(), Config("api-key"))
+    event = create_event()
+    properties = create_properties()
+    calls = {
+        "add_event": lambda: client.add_event(event),
+        "upsert_user": lambda: client.upsert_user(user, properties),
+        "delete_user": lambda: client.delete_user(user),
+        "upsert_account": lambda: client.upsert_account(account, properties),
+        "delete_account": lambda: client.delete_account(account),
+        "add_users_to_account": lambda: client.add_users_to_account(account, members),
+        "remove_users_from_account": lambda: client.remove_users_from_account(
+            account, members
+        ),
+        "link": lambda: client.link(user, "device-id"),
+        "get_tracking_snippet": lambda: client.get_tracking_snippet("journy.io"),
+        "get_api_key_details": lambda: client.get_api_key_details(),
+    }
+    memo_client = Client(NullHttpClient(), Config("api-key", link_memo=LinkMemo()))
+    memo_client.link(user, "device-id")
+    calls["link_memo_hit"] = lambda: memo_client.link(user, "device-id")
+    return {
+        f"request_building.{name}": (lambda call=call: measure_ops(call, repeat))
+        for name, call in calls.items()
+    }
+
+
+def dict_build_scenarios(repeat: int) -> dict:
+    """
+    Builds and sends the requests the way the client did before request templates, as a baseline for the
+    request_building scenarios: new HttpHeaders per call, URL concatenation and json.dumps of a body dictionary.
+    """
+    http_client = NullHttpClient()
+    event = create_event()
+    properties = create_properties()
+
+    def send(path: str, body: dict):
+        request_headers = HttpHeaders()
+        request_headers["Content-Type"] = "application/json"
+        request_headers["User-Agent"] = "python-sdk/0.0.0"
+        request_headers["x-api-key"] = "api-key"
+        return http_client.send(
+            HttpRequest(
+                "https://api.journy.io" + path,
+                Method.POST,
+                request_headers,
+                json.dumps(body),
+            )
+        )
+
+    calls = {
+        "add_event": lambda: send(
+            "/track",
+            {
+                "identification": {
+                    "user": user.format_identification(),
+                    "account": account.format_identification(),
+                },
+                "name": event.name,
+                "metadata": event.metadata.metadata,
+                "triggeredAt": event.date.isoformat(),
+            },
+        ),
+        "upsert_user": lambda: send(
+            "/users/upsert",
+            {
+                "identification": user.format_identification(),
+                "properties": properties.properties,
+            },
+        ),
+        "add_users_to_account": lambda: send(
+            "/accounts/users/add",
+            {
+                "account": account.format_identification(),
+                "users": [
+                    {"identification": member.format_identification()}
+                    for member in members
+                ],
+            },
+        ),
+    }
+    return {
+        f"dict_build.{name}": (lambda call=call: measure_ops(call, repeat))
+        for name, call in calls.items()
+    }
+
+
+def response_scenarios(repeat: int, count: int) -> dict:
+    """
+    Turning a received response into a Success, with the headers and body an API gateway typically sends.
+    The memory scenarios measure what a kept HttpResponse holds on to.
+    """
+    codec = Config("api-key").codec
+    received_headers = CaseInsensitiveDict(
+        {
+            "Date": "Sun, 18 Oct 2026 10:00:00 GMT",
+            "Content-Type": "application/json; charset=utf-8",
+            "Content-Length": "36",
+            "Connection": "keep-alive",
+            "Server": "nginx",
+            "Vary": "Origin",
+            "X-Request-Id": "requestId",
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "4999",
+            "X-RateLimit-Reset": "30",
+        }
+    )
+    responses = {
+        "created": (201, b'{"meta": {"requestId": "requestId"}}'),
+        "no_content": (204, b""),
+    }
+    scenarios = {}
+    for name, (status_code, content) in responses.items():
+
+        def handle(i=None, status_code=status_code, content=content):
+            return _http_response(status_code, received_headers, content, None, codec)
+
+        scenarios[f"response.{name}"] = lambda handle=handle: measure_ops(
+            lambda: Client._handle_response(handle()), repeat
+        )
+        scenarios[f"memory.response_{name}"] = lambda handle=handle: measure_memory(
+            handle, count
+        )
+    return scenarios
+
+
+def compression_scenarios(repeat: int) -> dict:
+    """
+    Compression of the body of add_users_to_account with 1000 users, ratio is the compressed size relative to the original.
+    """
+    users = [UserIdentified.by_user_id(f"user-{i}") for i in range(1000)]
+    body = (
+        '{"account": {"accountId": "account_id"}, "users": ['
+        + ", ".join(
+            f'{{"identification": {{"userId": "{user.user_id}"}}}}' for user in users
+        )
+        + "]}"
+    )
+    scenarios = {}
+    for compressor in (GzipCompressor(1), GzipCompressor(6), DeflateCompressor(6)):
+        compression = RequestCompression(compressor, threshold=0)
+
+        def measure(compression=compression):
+            result = measure_ops(lambda: compression.apply({}, body), repeat)
+            result["ratio"] = compression.ratio
+            return result
+
+        name = f"compression.members_1000.{compressor.encoding}_{compressor.level}"
+        scenarios[name] = measure
+    return scenarios
+
+
+def end_to_end_scenarios(server_url: str, calls: int, threads: int) -> dict:
+    http_client = HttpClientRequests(pool_maxsize=max(threads, 10))
+    client = Client(http_client, Config("api-key", server_url))
+    event = create_event()
+    properties = create_properties()
+
+    def tracker():
+        buffered = BufferedTracker(
+            client,
+            flush_at=100,
+            workers=threads,
+            overflow_policy=OverflowPolicy.BLOCK,
+        )
+        for _ in range(calls):
+            buffered.add_event(event)
+        buffered.flush()
+        buffered.close()
+
+    return {
+        "end_to_end.single_thread.add_event": lambda: measure_calls(
+            lambda: client.add_event(event), calls, 1
+        ),
+        "end_to_end.single_thread.upsert_user": lambda: measure_calls(
+            lambda: client.upsert_user(user, properties), calls, 1
+        ),
+        "end_to_end.single_thread.get_tracking_snippet": lambda: measure_calls(
+            lambda: client.get_tracking_snippet("journy.io"), calls, 1
+        ),
+        f"end_to_end.threads_{threads}.add_event": lambda: measure_calls(
+            lambda: client.add_event(event), calls, threads
+        ),
+        f"end_to_end.threads_{threads}.upsert_user": lambda: measure_calls(
+            lambda: client.upsert_user(user, properties), calls, threads
+        ),
+        "end_to_end.batched.add_events": lambda: measure_batch(
+            lambda: client.add_events([event] * calls, parallelism=threads), calls
+        ),
+        "end_to_end.batched.tracker": lambda: measure_batch(tracker, calls),
+    }
+
+
+def transport_scenarios(server: StubServer, calls: int, threads: int) -> dict:
+    """
+    Concurrent upserts over the pooled HTTP/1.1 transports, or over the HTTP/2 transports when the server is h2c.
+    Every scenario reports the number of sockets it opened.
+    """
+    properties = create_properties()
+    tasks = threads * 8
+    http2 = server.http2
+    name = "http2" if http2 else "http1"
+    if http2:
+        http_client = HttpClientHttpx(http1=False, max_connections=threads)
+    else:
+        http_client = HttpClientRequests(pool_maxsize=threads)
+    client = Client(http_client, Config("api-key", server.url))
+
+    def measure_async():
+        if http2:
+            async_http_client = AsyncHttpClientHttpx(http1=False, max_connections=tasks)
+        else:
+            async_http_client = AsyncHttpClientAiohttp(
+                max_concurrency=tasks, pool_maxsize=tasks
+            )
+        async_client = AsyncClient(async_http_client, Config("api-key", server.url))
+        return measure_tasks(
+            lambda: async_client.upsert_user(user, properties),
+            calls,
+            tasks,
+            async_http_client.close,
+        )
+
+    scenarios = {
+        f"transport.{name}.threads_{threads}.upsert_user": lambda: counting_connections(
+            server,
+            lambda: measure_calls(
+                lambda: client.upsert_user(user, properties), calls, threads
+            ),
+        ),
+    }
+    if http2 or aiohttp is not None:
+        scenarios[f"transport.{name}.tasks_{tasks}.upsert_user"] = (
+            lambda: counting_connections(server, measure_async)
+        )
+    return scenarios
+
+
+def run(
+    select=lambda name: True, repeat: int = 5, calls: int = 2000, threads: int = 8
+) -> dict:
+    """
+    Runs the selected scenarios and returns their measurements by name.
+    """
+    results = {}
+    scenarios = dict(construction_scenarios(repeat))
+    scenarios.update(request_building_scenarios(repeat))
+    scenarios.update(dict_build_scenarios(repeat))
+    scenarios.update(memory_scenarios(calls * 10))
+    scenarios.update(compression_scenarios(repeat))
+    scenarios.update(response_scenarios(repeat, calls * 10))
+    for name, scenario in scenarios.items():
+        if select(name):
+            results[name] = scenario()
+
+    with StubServer() as server:
+        scenarios = end_to_end_scenarios(server.url, calls, threads)
+        scenarios.update(transport_scenarios(server, calls, threads))
+        for name, scenario in scenarios.items():
+            if select(name):
+                results[name] = scenario()
+
+    if httpx is not None and h2 is not None and select("transport.http2"):
+        with StubServer(http2=True) as server:
+            for name, scenario in transport_scenarios(server, calls, threads).items():
+                if select(name):
+                    results[name] = scenario()
+    return results
@@ -0,0 +1,184 @@
+"""
+Local stub of the journy.io API for end-to-end benchmarks, answers every request like the API does.
+It speaks HTTP/1.1, or HTTP/2 without TLS (h2c with prior knowledge) when the h2 package is installed.
+"""
+
+import asyncio
+import json
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+except ImportError:  # pragma: no cover
+    h2 = None
+
+CREATED_BODY = json.dumps({"meta": {"requestId": "requestId"}}).encode()
+SNIPPET_BODY = json.dumps(
+    {
+        "data": {"domain": "journy.io", "snippet": "<script></script>"},
+        "meta": {"requestId": "requestId"},
+    }
+).encode()
+VALIDATE_BODY = json.dumps(
+    {"data": {"permissions": ["TrackData"]}, "meta": {"requestId": "requestId"}}
+).encode()
+
+
+def route(method: str, path: str):
+    if method == "GET":
+        if path.startswith("/tracking/snippet"):
+            return 200, SNIPPET_BODY
+        return 200, VALIDATE_BODY
+    if method == "DELETE":
+        return 202, CREATED_BODY
+    return 201, CREATED_BODY
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffer the response so headers and body go out in one segment and delayed ACKs do not stall the client.
+    wbufsize = -1
+
+    def __respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        status_code, body = route(self.command, self.path)
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Remaining", "4999")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.__respond()
+
+    def do_POST(self):
+        self.__respond()
+
+    def do_DELETE(self):
+        self.__respond()
+
+    def log_message(self, *args):
+        pass
+
+
+class CountingHTTPServer(ThreadingHTTPServer):
+    def __init__(self, address, connections):
+        super().__init__(address, StubHandler)
+        self.connections = connections
+
+    def process_request(self, request, client_address):
+        with self.connections.get_lock():
+            self.connections.value += 1
+        super().process_request(request, client_address)
+
+
+class H2Protocol(asyncio.Protocol):
+    """
+    Serves one HTTP/2 connection, every stream is answered as soon as its request ended.
+    """
+
+    def __init__(self, connections):
+        self.connections = connections
+        self.connection = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        self.requests = {}
+        self.transport = None
+
+    def connection_made(self, transport):
+        with self.connections.get_lock():
+            self.connections.value += 1
+        self.transport = transport
+        self.connection.initiate_connection()
+        transport.write(self.connection.data_to_send())
+
+    def data_received(self, data: bytes):
+        try:
+            events = self.connection.receive_data(data)
+        except h2.exceptions.ProtocolError:
+            self.transport.write(self.connection.data_to_send())
+            self.transport.close()
+            return
+        for event in events:
+            if isinstance(event, h2.events.RequestReceived):
+                self.requests[event.stream_id] = dict(event.headers)
+            elif isinstance(event, h2.events.DataReceived):
+                self.connection.acknowledge_received_data(
+                    event.flow_controlled_length, event.stream_id
+                )
+            elif isinstance(event, h2.events.StreamEnded):
+                self.respond(event.stream_id, self.requests.pop(event.stream_id))
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                self.transport.close()
+        self.transport.write(self.connection.data_to_send())
+
+    def respond(self, stream_id: int, headers: dict):
+        status_code, body = route(headers[":method"], headers[":path"])
+        self.connection.send_headers(
+            stream_id,
+            [
+                (":status", str(status_code)),
+                ("content-type", "application/json"),
+                ("content-length", str(len(body))),
+                ("x-ratelimit-remaining", "4999"),
+            ],
+        )
+        self.connection.send_data(stream_id, body, end_stream=True)
+
+
+def serve_h2(host: str, port: int, addresses, connections):
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(
+        loop.create_server(lambda: H2Protocol(connections), host, port)
+    )
+    addresses.put(server.sockets[0].getsockname()[:2])
+    loop.run_forever()
+
+
+def serve(host: str, port: int, addresses, connections):
+    server = CountingHTTPServer((host, port), connections)
+    addresses.put(server.server_address[:2])
+    server.serve_forever()
+
+
+class StubServer(object):
+    """
+    Runs the stub in a separate process, so it does not compete with the measured client for the GIL.
+    connections counts the sockets the clients opened to it.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, http2: bool = False):
+        if http2 and h2 is None:
+            raise RuntimeError("The h2 package is required for the HTTP/2 stub.")
+        self.http2 = http2
+        addresses = multiprocessing.Queue()
+        self.__connections = multiprocessing.Value("i", 0)
+        self.process = multiprocessing.Process(
+            target=serve_h2 if http2 else serve,
+            args=(host, port, addresses, self.__connections),
+            daemon=True,
+        )
+        self.process.start()
+        self.host, self.port = addresses.get(timeout=10)
+
+    @property
+    def connections(self) -> int:
+        return self.__connections.value
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.process.terminate()
+        self.process.join()
@@ -0,0 +1,111 @@
+"""
+Command line interface of the journy.io SDK.
+
+    JOURNY_API_KEY=... python -m journyio import users users.csv --checkpoint users.checkpoint
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from .client import Client, Config
+from .httpclient import HttpClientRequests
+from .importer import BulkImporter, ImportKind, ImportProgress
+from .retry import RetryPolicy
+from .utils import JournyException
+
+
+def report(progress: ImportProgress, final: bool = False):
+    print(
+        f"{'done' if final else 'progress'}: offset={progress.offset} sent={progress.sent} "
+        f"skipped={progress.skipped} failed={progress.failed} invalid={progress.invalid} "
+        f"rate={progress.records_per_second:.1f}/s",
+        file=sys.stderr,
+    )
+
+
+def import_command(args) -> int:
+    api_key = args.api_key or os.environ.get("JOURNY_API_KEY")
+    if not api_key:
+        print(
+            "An API key is required, pass --api-key or set JOURNY_API_KEY.",
+            file=sys.stderr,
+        )
+        return 2
+
+    reported_at = [0.0]
+
+    def on_progress(progress: ImportProgress):
+        now = time.monotonic()
+        if now - reported_at[0] >= args.progress_interval:
+            reported_at[0] = now
+            report(progress)
+
+    http_client = HttpClientRequests(pool_maxsize=args.parallelism)
+    client = Client(
+        http_client, Config(api_key, args.root_url, retry_policy=RetryPolicy())
+    )
+    try:
+        importer = BulkImporter(
+            client,
+            ImportKind.USERS if args.kind == "users" else ImportKind.ACCOUNTS,
+            id_column=args.id_column,
+            secondary_column=args.secondary_column,
+            property_columns=args.properties.split(",") if args.properties else None,
+            chunk_size=args.chunk_size,
+            parallelism=args.parallelism,
+            checkpoint_path=args.checkpoint,
+            on_progress=on_progress,
+        )
+        progress = importer.import_file(args.path, args.format)
+    except JournyException as e:
+        print(e, file=sys.stderr)
+        return 2
+    finally:
+        http_client.close()
+    report(progress, True)
+    return 1 if progress.failed else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m journyio")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    importer = commands.add_parser(
+        "import", help="upsert users or accounts from a CSV or JSONL file"
+    )
+    importer.add_argument("kind", choices=["users", "accounts"])
+    importer.add_argument("path")
+    importer.add_argument("--format", choices=["csv", "jsonl"])
+    importer.add_argument("--api-key", help="defaults to JOURNY_API_KEY")
+    importer.add_argument("--root-url", default="https://api.journy.io")
+    importer.add_argument(
+        "--id-column", help="defaults to user_id for users and account_id for accounts"
+    )
+    importer.add_argument(
+        "--secondary-column", help="defaults to email for users and domain for accounts"
+    )
+    importer.add_argument(
+        "--properties", help="comma separated property columns, defaults to all others"
+    )
+    importer.add_argument("--chunk-size", type=int, default=1000)
+    importer.add_argument("--parallelism", type=int, default=8)
+    importer.add_argument(
+        "--checkpoint", help="file to store the offset in for resuming"
+    )
+    importer.add_argument(
+        "--progress-interval",
+        type=float,
+        default=5.0,
+        help="seconds between progress reports",
+    )
+    importer.set_defaults(run=import_command)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,8 @@ from .utils import assert_journy
 
 
 class AccountIdentified(object):
+    __slots__ = ("account_id", "domain")
+
     def __init__(self, account_id: str or None, domain: str or None):
         assert_journy(
             account_id or domain, "Account id and domain can not both be empty"
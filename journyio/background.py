@@ -0,0 +1,251 @@
+import atexit
+import threading
+import time
+from collections import deque
+from enum import Enum
+
+from .client import AsyncClient, Client
+from .process import register_after_fork
+from .utils import JournyException, assert_journy
+
+
+class OverflowPolicy(Enum):
+    BLOCK = 1
+    DROP_NEWEST = 2
+    DROP_OLDEST = 3
+    RAISE = 4
+
+
+class BackgroundQueue(object):
+    """
+    Queues items in memory and sends them to the API on background worker threads.
+    Subclasses decide how items are stored, taken from the queue and sent by overriding the underscore methods.
+    """
+
+    _name = "queue"
+    _item_name = "item"
+
+    # Once closed, the queue is abandoned after this many requests in a row raised, the API is likely unreachable.
+    MAX_CLOSE_FAILURES = 3
+
+    def __init__(
+        self,
+        client: Client,
+        max_queue_size: int,
+        workers: int,
+        overflow_policy: OverflowPolicy,
+        on_result,
+        exit_timeout: float,
+    ):
+        assert_journy(
+            isinstance(client, Client) and not isinstance(client, AsyncClient),
+            "The client is not a synchronous Client object.",
+        )
+        assert_journy(
+            isinstance(max_queue_size, int) and max_queue_size > 0,
+            "The max_queue_size is not a positive int.",
+        )
+        assert_journy(
+            isinstance(workers, int) and workers > 0,
+            "The workers is not a positive int.",
+        )
+        assert_journy(
+            isinstance(overflow_policy, OverflowPolicy),
+            "The overflow_policy is not an OverflowPolicy object.",
+        )
+        assert_journy(
+            isinstance(exit_timeout, (int, float)) and exit_timeout > 0,
+            "The exit_timeout is not a positive number.",
+        )
+
+        self.client = client
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.on_result = on_result
+        self.exit_timeout = exit_timeout
+        self.dropped = 0
+
+        self.workers = workers
+        self._closed = False
+        self.__close_deadline = None
+        self._reset()
+        atexit.register(self.__close_at_exit)
+        register_after_fork(self)
+
+    def _reset(self):
+        self._queue = self._new_queue()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._flush_requested = False
+        self.__failures = 0
+
+        self.__workers = [
+            threading.Thread(
+                target=self.__work, name=f"journyio-{self._name}-{i}", daemon=True
+            )
+            for i in range(self.workers)
+        ]
+        for worker in self.__workers:
+            worker.start()
+
+    @property
+    def queue_size(self) -> int:
+        return len(self._queue)
+
+    def _put(self, item) -> bool:
+        """
+        Queues the item, returns False if the item was dropped because the queue is full.
+        """
+        with self._lock:
+            assert_journy(not self._closed, f"The {self._name} is closed.")
+            if self._coalesce(item):
+                return True
+            if len(self._queue) >= self.max_queue_size:
+                if self.overflow_policy is OverflowPolicy.RAISE:
+                    raise JournyException(f"The {self._item_name} queue is full.")
+                if self.overflow_policy is OverflowPolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                if self.overflow_policy is OverflowPolicy.DROP_OLDEST:
+                    self._pop_oldest()
+                    self.dropped += 1
+                else:
+                    while len(self._queue) >= self.max_queue_size:
+                        self._not_full.wait()
+                        assert_journy(not self._closed, f"The {self._name} is closed.")
+            self._append(item)
+        return True
+
+    def flush(self, timeout: float or None = None) -> bool:
+        """
+        Sends all queued items and waits until they are handled.
+        Returns False if the timeout passed before the queue was drained.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._flush_requested = True
+            self._not_empty.notify_all()
+            while self._queue or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+            self._flush_requested = False
+        return True
+
+    def close(self, timeout: float or None = None):
+        """
+        Drains the queue and stops the worker threads, waiting at most timeout seconds in total.
+        New items are refused afterwards. Items that are not sent when the timeout passed, or after
+        MAX_CLOSE_FAILURES requests in a row raised, are dropped.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self.__close_deadline = deadline
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        for worker in self.__workers:
+            worker.join(
+                None if deadline is None else max(deadline - time.monotonic(), 0)
+            )
+        atexit.unregister(self.__close_at_exit)
+
+    def __close_at_exit(self):
+        self.close(self.exit_timeout)
+
+    def _after_fork(self):
+        # The queued items are sent by the parent, the child starts with an empty queue and new workers.
+        if not self._closed:
+            self._reset()
+
+    def _new_queue(self):
+        return deque()
+
+    def _coalesce(self, item) -> bool:
+        # Called with the lock held, returns True if the item does not have to be queued.
+        return False
+
+    def _append(self, item):
+        # Called with the lock held.
+        self._queue.append(item)
+        self._not_empty.notify()
+
+    def _pop_oldest(self):
+        # Called with the lock held.
+        self._queue.popleft()
+
+    def _take(self) -> list:
+        # Called with the lock held, waits for items and returns the next ones to send or [] once closed and drained.
+        while not self._queue and not self._closed:
+            self._not_empty.wait()
+        return [self._queue.popleft()] if self._queue else []
+
+    def _send(self, item, timeout: float or None):
+        raise NotImplementedError()
+
+    def _report(self, item, result):
+        self.on_result(item, result)
+
+    def _done(self, batch: list):
+        # Called with the lock held once the batch is sent.
+        pass
+
+    def __remaining(self) -> float or None:
+        # The time left to send items in, None when there is no limit.
+        if not self._closed:
+            return None
+        if self.__failures >= self.MAX_CLOSE_FAILURES:
+            return 0.0
+        if self.__close_deadline is None:
+            return None
+        return self.__close_deadline - time.monotonic()
+
+    def __next_batch(self) -> list:
+        with self._lock:
+            remaining = self.__remaining()
+            if remaining is not None and remaining <= 0:
+                self.dropped += len(self._queue)
+                self._queue.clear()
+                if not self._in_flight:
+                    self._idle.notify_all()
+            batch = self._take()
+            self._in_flight += len(batch)
+            if batch:
+                self._not_full.notify_all()
+            return batch
+
+    def __work(self):
+        while True:
+            batch = self.__next_batch()
+            if not batch and self._closed:
+                return
+            for item in batch:
+                remaining = self.__remaining()
+                if remaining is not None and remaining <= 0:
+                    with self._lock:
+                        self.dropped += 1
+                    continue
+                try:
+                    result = self._send(item, remaining)
+                except Exception as e:
+                    result = e
+                with self._lock:
+                    self.__failures = (
+                        self.__failures + 1 if isinstance(result, Exception) else 0
+                    )
+                if self.on_result is not None:
+                    try:
+                        self._report(item, result)
+                    except Exception:
+                        pass
+            with self._lock:
+                self._in_flight -= len(batch)
+                self._done(batch)
+                if not self._queue and not self._in_flight:
+                    self._idle.notify_all()
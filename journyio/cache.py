@@ -0,0 +1,206 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from .process import register_after_fork
+from .results import Success
+from .utils import assert_journy
+
+
+class CacheBackend:
+    """
+    Interface for the storage of a ResponseCache. Implement it to share cached responses between processes.
+    get returns None for keys that are missing or expired.
+    """
+
+    def get(self, key: str):
+        pass
+
+    def set(self, key: str, value, ttl: float):
+        pass
+
+    def delete(self, key: str):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LruCacheBackend(CacheBackend):
+    """
+    In-process backend that evicts expired entries and, when max_size entries are stored, the least recently used one.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        assert_journy(
+            isinstance(max_size, int) and max_size > 0,
+            "The max_size is not a positive int.",
+        )
+        self.max_size = max_size
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        register_after_fork(self)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key: str):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self.__entries[key]
+                return None
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float):
+        with self.__lock:
+            self.__entries[key] = (time.monotonic() + ttl, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def _after_fork(self):
+        self.__lock = threading.Lock()
+
+    def __str__(self):
+        return f"LruCacheBackend({self.max_size}, {len(self)})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class ResponseCache(object):
+    """
+    Caches successful responses of get_tracking_snippet and get_api_key_details for ttl seconds.
+    Concurrent misses for the same key share a single request. Failures are never cached.
+    """
+
+    def __init__(self, backend: CacheBackend or None = None, ttl: float = 300.0):
+        if backend is None:
+            backend = LruCacheBackend()
+        assert_journy(
+            isinstance(backend, CacheBackend),
+            "The backend is not a CacheBackend object.",
+        )
+        assert_journy(
+            isinstance(ttl, (int, float)) and ttl > 0,
+            "The ttl is not a positive number.",
+        )
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.__lock = threading.Lock()
+        self.__loading = {}
+        self.__loading_async = {}
+        register_after_fork(self)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_or_load(self, key: str, load):
+        """
+        Returns the cached response for key, or calls load and caches its result when it is a Success.
+        """
+        value = self.backend.get(key)
+        with self.__lock:
+            if value is not None:
+                self.hits += 1
+                return value
+            self.misses += 1
+            future = self.__loading.get(key)
+            leader = future is None
+            if leader:
+                future = self.__loading[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            value = load()
+            if isinstance(value, Success):
+                self.backend.set(key, value, self.ttl)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.__lock:
+                del self.__loading[key]
+
+    async def get_or_load_async(self, key: str, load):
+        """
+        Same as get_or_load, for a load function that returns an awaitable.
+        """
+        value = self.backend.get(key)
+        loop = asyncio.get_event_loop()
+        with self.__lock:
+            if value is not None:
+                self.hits += 1
+                return value
+            self.misses += 1
+            future = self.__loading_async.get((loop, key))
+            leader = future is None
+            if leader:
+                future = self.__loading_async[(loop, key)] = loop.create_future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return await asyncio.shield(future)
+
+        try:
+            value = await load()
+            if isinstance(value, Success):
+                self.backend.set(key, value, self.ttl)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieve the exception so asyncio does not log it when nobody was waiting.
+            future.exception()
+            raise
+        finally:
+            with self.__lock:
+                del self.__loading_async[(loop, key)]
+
+    def invalidate(self, key: str or None = None):
+        """
+        Removes the cached response for key, or every cached response when no key is given.
+        """
+        if key is None:
+            self.backend.clear()
+        else:
+            self.backend.delete(key)
+
+    def _after_fork(self):
+        self.__lock = threading.Lock()
+        # Loads in flight belong to threads of the parent.
+        self.__loading = {}
+        self.__loading_async = {}
+
+    def __str__(self):
+        return f"ResponseCache({self.backend}, {self.ttl}, {self.hits}, {self.misses})"
+
+    def __repr__(self):
+        return self.__str__()
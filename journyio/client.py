@@ -1,54 +1,122 @@
+import asyncio
+import hashlib
 import json
-from collections import defaultdict
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from urllib import parse
 
-from typing import List
+from typing import Awaitable, List, Iterable, Tuple
 
+from .cache import ResponseCache
+from .codec import JsonCodec, default_codec
 from .events import Event
-from .httpclient import HttpRequest, Method, HttpClient, HttpResponse, HttpHeaders
-from .results import Failure, Success, ApiKeyDetails, TrackingSnippetResponse
-from .utils import JournyException, status_code_to_api_error, assert_journy
+from .hooks import Hooks, Span, TimedBodyEncoder, take_serialization
+from .memo import LinkMemo, UpsertMemo, account_keys, user_keys
+from .httpclient import (
+    HttpRequest,
+    Method,
+    HttpClient,
+    AsyncHttpClient,
+    HttpResponse,
+    HttpHeaders,
+)
+from .retry import RetryPolicy, CircuitBreaker, NO_RETRIES
+from .templates import RequestTemplate, body_encoder
+from .throttle import RateLimiter
+from .results import (
+    Failure,
+    Success,
+    Skipped,
+    ApiKeyDetails,
+    TrackingSnippetResponse,
+)
+from .utils import (
+    JournyException,
+    JournyTimeoutException,
+    APIError,
+    status_code_to_api_error,
+    assert_journy,
+)
 from .user_identified import UserIdentified
 from .account_identified import AccountIdentified
 from .version import version
 
 
 class Properties(dict):
-    def __init__(self):
+    """
+    Properties of a user or an account. Keys are lowercased and stripped, datetimes are stored as ISO 8601 strings.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
         super().__init__()
-        self.properties = defaultdict(lambda _: None)
+        if args or kwargs:
+            self.update(*args, **kwargs)
+
+    @classmethod
+    def from_dict(cls, values: dict or None = None, **kwargs):
+        """
+        Creates properties from a dict and/or keyword arguments, validating them in a single pass.
+        """
+        properties = cls()
+        properties.update(values or {}, **kwargs)
+        return properties
+
+    @property
+    def properties(self):
+        # The properties used to live in a separate dict, kept so existing callers keep working.
+        return self
+
+    @staticmethod
+    def __normalize(
+        key: str, value: str or List[str] or bool or int or datetime or None
+    ) -> Tuple[str, str or List[str] or bool or int or None]:
+        if not isinstance(key, str):
+            raise JournyException("The key is not a string.")
+        if value is None or isinstance(value, (str, int)):
+            return key.lower().strip(), value
+        if isinstance(value, datetime):
+            return key.lower().strip(), value.isoformat()
+        if isinstance(value, list) and all(isinstance(el, str) for el in value):
+            return key.lower().strip(), value
+        raise JournyException(
+            "Value is not a string, number, boolean, datetime or None."
+        )
 
     def __getitem__(self, key: str):
         assert_journy(isinstance(key, str), "The key is not a string.")
-        return self.properties.get(key.lower().strip())
+        return self.get(key.lower().strip())
 
     def __setitem__(
         self, key: str, value: str or List[str] or bool or int or datetime or None
     ):
-        assert_journy(isinstance(key, str), "The key is not a string.")
-        if (
-            isinstance(value, str)
-            or isinstance(value, int)
-            or isinstance(value, bool)
-            or isinstance(value, datetime)
-            or value is None
-            or (isinstance(value, list) and all([isinstance(el, str) for el in value]))
-        ):
-            if isinstance(value, datetime):
-                value = str(value.isoformat())
-            self.properties.__setitem__(key.lower().strip(), value)
-        else:
-            raise JournyException(
-                "Value is not a string, number, boolean, datetime or None."
-            )
+        super().__setitem__(*Properties.__normalize(key, value))
+
+    def update(self, *args, **kwargs):
+        """
+        Validates all values before any of them is stored, so a failed update leaves the properties untouched.
+        """
+        normalize = Properties.__normalize
+        super().update(
+            [normalize(key, value) for key, value in dict(*args, **kwargs).items()]
+        )
+
+    def setdefault(self, key: str, default=None):
+        key, default = Properties.__normalize(key, default)
+        return super().setdefault(key, default)
 
     def union(self, other):
-        self.properties.update(other.properties)
+        if isinstance(other, Properties):
+            super().update(other)
+        else:
+            self.update(other)
         return self
 
     def __str__(self):
-        return json.dumps(self.properties)
+        return json.dumps(self)
 
     def __repr__(self):
         return self.__str__()
@@ -58,16 +126,91 @@ class Config(object):
     """
     A config for the Journy.io's python journyio client.
     This contains all the necessary information for the client to work properly.
+    timeout is the default number of seconds a call may take, including waiting for the rate limiter and retries.
     """
 
-    def __init__(self, api_key: str, root_url: str or None = "https://api.journy.io"):
+    def __init__(
+        self,
+        api_key: str,
+        root_url: str or None = "https://api.journy.io",
+        rate_limiter: RateLimiter or None = None,
+        retry_policy: RetryPolicy or None = None,
+        circuit_breaker: CircuitBreaker or None = None,
+        codec: JsonCodec or None = None,
+        cache: ResponseCache or None = None,
+        upsert_memo: UpsertMemo or None = None,
+        link_memo: LinkMemo or None = None,
+        hooks: List[Hooks] or None = None,
+        timeout: float or None = None,
+    ):
         if root_url is None:
             root_url = "https://api.journy.io"
         assert_journy(isinstance(api_key, str), "The api key is not a string.")
         assert_journy(isinstance(root_url, str), "The root url is not a string.")
+        if rate_limiter is not None:
+            assert_journy(
+                isinstance(rate_limiter, RateLimiter),
+                "The rate limiter is not a RateLimiter object.",
+            )
+        if retry_policy is not None:
+            assert_journy(
+                isinstance(retry_policy, RetryPolicy),
+                "The retry policy is not a RetryPolicy object.",
+            )
+        if circuit_breaker is not None:
+            assert_journy(
+                isinstance(circuit_breaker, CircuitBreaker),
+                "The circuit breaker is not a CircuitBreaker object.",
+            )
+
+        if cache is not None:
+            assert_journy(
+                isinstance(cache, ResponseCache),
+                "The cache is not a ResponseCache object.",
+            )
+
+        if upsert_memo is not None:
+            assert_journy(
+                isinstance(upsert_memo, UpsertMemo),
+                "The upsert memo is not an UpsertMemo object.",
+            )
+
+        if link_memo is not None:
+            assert_journy(
+                isinstance(link_memo, LinkMemo),
+                "The link memo is not a LinkMemo object.",
+            )
+
+        if hooks is not None:
+            assert_journy(
+                isinstance(hooks, list)
+                and all(isinstance(hook, Hooks) for hook in hooks),
+                "The hooks is not a list of Hooks objects.",
+            )
+
+        if timeout is not None:
+            assert_journy(
+                isinstance(timeout, (int, float)) and timeout > 0,
+                "The timeout is not a positive number.",
+            )
+
+        if codec is None:
+            codec = default_codec()
+        assert_journy(
+            isinstance(codec, JsonCodec), "The codec is not a JsonCodec object."
+        )
 
         self.api_key = api_key
         self.root_url = root_url
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.codec = codec
+        self.cache = cache
+        self.upsert_memo = upsert_memo
+        self.link_memo = link_memo
+        self.hooks = tuple(hooks or ())
+        self.timeout = timeout
 
     def __repr__(self):
         return f"Config({self.api_key}, {self.root_url})"
@@ -82,81 +225,455 @@ class Client(object):
     """
 
     def __init__(self, httpclient: HttpClient, config: Config):
-        assert_journy(
-            isinstance(httpclient, HttpClient),
-            "The httpClient is not a HttpClient object.",
-        )
+        self._assert_httpclient(httpclient)
         assert_journy(isinstance(config, Config), "The config is not a Config object.")
 
         self.httpclient = httpclient
         self.config = config
 
+        headers = HttpHeaders()
+        headers["Content-Type"] = "application/json"
+        headers["User-Agent"] = f"python-sdk/{version}"
+        headers["x-api-key"] = config.api_key
+
+        def template(method: Method, path: str) -> RequestTemplate:
+            return RequestTemplate(config.root_url + path, method, headers)
+
+        self.__encoder = body_encoder(config.codec)
+        if config.hooks:
+            self.__encoder = TimedBodyEncoder(self.__encoder)
+        # Cache and memo keys identify the API key without exposing it to a shared cache backend.
+        self.__cache_prefix = hashlib.sha256(
+            f"{config.root_url} {config.api_key}".encode("utf-8")
+        ).hexdigest()[:16]
+        self.__track = template(Method.POST, "/track")
+        self.__upsert_user = template(Method.POST, "/users/upsert")
+        self.__delete_user = template(Method.DELETE, "/users")
+        self.__upsert_account = template(Method.POST, "/accounts/upsert")
+        self.__delete_account = template(Method.DELETE, "/accounts")
+        self.__add_users = template(Method.POST, "/accounts/users/add")
+        self.__remove_users = template(Method.POST, "/accounts/users/remove")
+        self.__link = template(Method.POST, "/link")
+        self.__tracking_snippet = template(Method.GET, "/tracking/snippet")
+        self.__validate = template(Method.GET, "/validate")
+
+    @staticmethod
+    def _assert_httpclient(httpclient):
+        assert_journy(
+            isinstance(httpclient, HttpClient),
+            "The httpClient is not a HttpClient object.",
+        )
+
     def __repr__(self):
         return f"Client({self.httpclient}, {self.config})"
 
     def __str__(self):
         return self.__repr__()
 
-    def __create_url(self, path) -> str:
-        return self.config.root_url + path
-
-    def __get_headers(self) -> HttpHeaders:
-        headers = HttpHeaders()
-        headers["Content-Type"] = "application/json"
-        headers["User-Agent"] = f"python-sdk/{version}"
-        headers["x-api-key"] = self.config.api_key
-        return headers
-
     @staticmethod
     def __parse_calls_remaining(response: HttpResponse) -> int:
         remaining = response.headers["X-RateLimit-Remaining"]
         try:
             return int(remaining)
-        except ValueError:
+        except (TypeError, ValueError):
             return None
 
-    def add_event(self, event: Event) -> Success[None] or Failure:
-        assert_journy(isinstance(event, Event), "The event should be an Event object.")
-
+    @staticmethod
+    def __parse_request_id(response: HttpResponse) -> str or None:
+        # Responses without a body, e.g. 204 No Content, have no request id.
         try:
-            body = {
-                "identification": {},
-                "name": event.name,
-                "metadata": event.metadata.metadata,
-            }
-            if event.date:
-                body["triggeredAt"] = event.date.isoformat()
-            if event.user:
-                body["identification"]["user"] = event.user.format_identification()
-            if event.account:
-                body["identification"][
-                    "account"
-                ] = event.account.format_identification()
-
-            request = HttpRequest(
-                self.__create_url("/track"),
-                Method.POST,
-                self.__get_headers(),
-                json.dumps(body),
+            return response.body["meta"]["requestId"]
+        except (TypeError, KeyError):
+            return None
+
+    @staticmethod
+    def _handle_response(response: HttpResponse, parse_data=None) -> Success or Failure:
+        calls_remaining = Client.__parse_calls_remaining(response)
+        request_id = Client.__parse_request_id(response)
+        if not (200 <= response.status_code < 300):
+            return Failure(
+                request_id,
+                calls_remaining,
+                status_code_to_api_error(response.status_code),
             )
-            response = self.httpclient.send(request)
-            calls_remaining = Client.__parse_calls_remaining(response)
-            if not (200 <= response.status_code < 300):
-                return Failure(
-                    response.body["meta"]["requestId"],
-                    calls_remaining,
-                    status_code_to_api_error(response.status_code),
-                )
-            return Success[None](
-                response.body["meta"]["requestId"], calls_remaining, None
+        return Success(
+            request_id,
+            calls_remaining,
+            parse_data(response.body["data"]) if parse_data else None,
+        )
+
+    def _deadline(self, timeout: float or None) -> float or None:
+        """
+        Returns the time.monotonic() by which a call has to be done, None when it has no timeout.
+        """
+        if timeout is None:
+            timeout = self.config.timeout
+            if timeout is None:
+                return None
+        else:
+            assert_journy(
+                isinstance(timeout, (int, float)) and timeout > 0,
+                "The timeout is not a positive number.",
             )
-        except JournyException as e:
+        return time.monotonic() + timeout
+
+    @staticmethod
+    def _remaining(deadline: float or None) -> float or None:
+        """
+        Returns the number of seconds left until the deadline, raises when it has passed.
+        """
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise JournyTimeoutException("The call did not finish within its timeout.")
+        return remaining
+
+    def _before_send(self, deadline: float or None = None) -> float:
+        """
+        Returns the number of seconds to wait before the request may be sent.
+        """
+        circuit_breaker = self.config.circuit_breaker
+        if circuit_breaker is not None and not circuit_breaker.allow():
+            raise JournyException(
+                "The circuit breaker is open, the API is unavailable."
+            )
+        rate_limiter = self.config.rate_limiter
+        if rate_limiter is None:
+            return 0.0
+        try:
+            remaining = Client._remaining(deadline)
+            delay = rate_limiter.reserve(remaining)
+            if remaining is not None and delay > remaining:
+                raise JournyTimeoutException(
+                    "The rate limiter would delay the call beyond its timeout."
+                )
+        except BaseException:
+            self._release()
+            raise
+        return delay
+
+    def _release(self):
+        """
+        Ends an attempt that was allowed by the circuit breaker but did not reach the API.
+        """
+        if self.config.circuit_breaker is not None:
+            self.config.circuit_breaker.release()
+
+    def _after_send(self, response: HttpResponse or None):
+        if response is not None and self.config.rate_limiter is not None:
+            self.config.rate_limiter.observe(response)
+        if self.config.circuit_breaker is not None:
+            self.config.circuit_breaker.record(response)
+
+    def _start_span(self, request: HttpRequest) -> Span or None:
+        """
+        Returns the span to fill in for the request, None when no hooks are registered.
+        """
+        if not self.config.hooks:
+            return None
+        return Span(
+            f"{request.method.name} {parse.urlsplit(request.url).path}",
+            take_serialization() if request.body is not None else 0.0,
+        )
+
+    @staticmethod
+    def _record_response(span: Span, response: HttpResponse):
+        span.status_code = response.status_code
+        timing = getattr(response, "timing", None)
+        if timing is not None:
+            span.connect = timing.connect
+            span.ttfb = timing.ttfb
+            span.network = timing.total
+            span.response_size = timing.response_size
+
+    @staticmethod
+    def _raise_send_error(e: Exception, deadline: float or None):
+        if isinstance(e, JournyTimeoutException):
             raise e
-        except Exception:
-            raise JournyException(f"An unknown error has occurred")
+        if isinstance(e, TimeoutError) or (
+            deadline is not None and time.monotonic() >= deadline
+        ):
+            raise JournyTimeoutException(
+                "The call did not finish within its timeout."
+            ) from e
+        if isinstance(e, JournyException):
+            raise e
+        raise JournyException(f"An unknown error has occurred") from e
+
+    def _finish_span(self, span: Span, result: Success or Failure or JournyException):
+        span.duration = time.perf_counter() - span.started_at + span.serialization
+        if isinstance(result, JournyException):
+            span.error = result
+        else:
+            span.calls_remaining = result.calls_remaining
+            if isinstance(result, Failure):
+                span.error = result.error
+        for hook in self.config.hooks:
+            try:
+                hook.on_span(span)
+            except Exception:
+                pass
+
+    def _send(
+        self,
+        request: HttpRequest,
+        parse_data=None,
+        idempotent: bool = True,
+        deadline: float or None = None,
+    ) -> Success or Failure:
+        if not self.config.hooks:
+            return self.__attempt(request, parse_data, idempotent, deadline, None)
+        span = self._start_span(request)
+        try:
+            result = self.__attempt(request, parse_data, idempotent, deadline, span)
+        except JournyException as e:
+            self._finish_span(span, e)
+            raise
+        self._finish_span(span, result)
+        return result
+
+    def __attempt(
+        self,
+        request: HttpRequest,
+        parse_data,
+        idempotent: bool,
+        deadline: float or None,
+        span: Span or None,
+    ) -> Success or Failure:
+        retry = (self.config.retry_policy or NO_RETRIES).start(idempotent, deadline)
+        while True:
+            delay = self._before_send(deadline)
+            try:
+                if delay > 0:
+                    if span is not None:
+                        span.queueing += delay
+                    time.sleep(delay)
+                request.timeout = Client._remaining(deadline)
+            except BaseException:
+                self._release()
+                raise
+            try:
+                response = self.httpclient.send(request)
+            except Exception as e:
+                self._after_send(None)
+                delay = retry.on_exception()
+                if delay is None:
+                    Client._raise_send_error(e, deadline)
+            except BaseException:
+                # E.g. a cancelled task, the outcome of the request is unknown.
+                self._release()
+                raise
+            else:
+                self._after_send(response)
+                if span is not None:
+                    Client._record_response(span, response)
+                delay = retry.on_response(response)
+                if delay is None:
+                    try:
+                        return self._handle_response(response, parse_data)
+                    except JournyException as e:
+                        raise e
+                    except Exception as e:
+                        raise JournyException(f"An unknown error has occurred") from e
+            if span is not None:
+                span.retries += 1
+                span.backoff += delay
+            time.sleep(delay)
+
+    @staticmethod
+    def _assert_bulk_options(parallelism: int, chunk_size: int, timeout):
+        assert_journy(
+            isinstance(parallelism, int) and parallelism > 0,
+            "The parallelism is not a positive int.",
+        )
+        assert_journy(
+            isinstance(chunk_size, int) and chunk_size > 0,
+            "The chunk_size is not a positive int.",
+        )
+        if timeout is not None:
+            assert_journy(
+                isinstance(timeout, (int, float)) and timeout > 0,
+                "The timeout is not a positive number.",
+            )
+
+    @staticmethod
+    def _chunks(items: Iterable[tuple], chunk_size: int):
+        items = iter(items)
+        return iter(lambda: list(islice(items, chunk_size)), [])
+
+    @staticmethod
+    def _assert_bulk_item(args: tuple, arity: int):
+        assert_journy(
+            isinstance(args, tuple) and len(args) == arity,
+            f"The item is not a tuple of {arity} values.",
+        )
+
+    @staticmethod
+    def __send_bulk_item(
+        method, args: tuple, arity: int, timeout
+    ) -> Success or Failure:
+        try:
+            Client._assert_bulk_item(args, arity)
+            return method(*args, timeout=timeout)
+        except JournyTimeoutException:
+            return Failure(None, None, APIError.TimeoutError)
+        except JournyException:
+            return Failure(None, None, APIError.UnknownError)
+
+    def _send_bulk(
+        self,
+        method,
+        items: Iterable[tuple],
+        arity: int,
+        parallelism: int,
+        chunk_size: int,
+        timeout: float or None = None,
+    ) -> List[Success or Failure]:
+        results = []
+        chunks = Client._chunks(items, chunk_size)
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            for chunk in chunks:
+                results.extend(
+                    executor.map(
+                        lambda args: Client.__send_bulk_item(
+                            method, args, arity, timeout
+                        ),
+                        chunk,
+                    )
+                )
+        return results
+
+    @staticmethod
+    def __parse_tracking_snippet(data: dict) -> TrackingSnippetResponse:
+        return TrackingSnippetResponse(data["domain"], data["snippet"])
+
+    @staticmethod
+    def __parse_api_key_details(data: dict) -> ApiKeyDetails:
+        return ApiKeyDetails(data["permissions"])
+
+    @staticmethod
+    def __encode(encode, *args) -> str or bytes:
+        try:
+            return encode(*args)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise JournyException("The request body could not be serialized.") from e
+
+    def _event_body(self, event: Event) -> str or bytes:
+        return Client.__encode(self.__encoder.event, event)
+
+    def _add_event_body(
+        self, body: str or bytes, deadline: float or None = None
+    ) -> Success[None] or Failure:
+        """
+        Sends an event serialized by _event_body.
+        """
+        return self._send(
+            self.__track.request(body), idempotent=False, deadline=deadline
+        )
+
+    def _send_upsert(
+        self, request: HttpRequest, keys_of, identified, deadline: float or None
+    ) -> Success[None] or Failure:
+        memo = self.config.upsert_memo
+        if memo is None:
+            return self._send(request, deadline=deadline)
+        keys = self._upsert_keys(keys_of, identified)
+        digest = memo.digest(request.body)
+        if memo.unchanged(keys, digest):
+            return Skipped()
+        result = self._send(request, deadline=deadline)
+        if isinstance(result, Success):
+            memo.remember(keys, digest)
+        return result
+
+    def _upsert_keys(self, keys_of, identified) -> list:
+        """
+        Returns the keys of the identifiers in the upsert memo, which can be shared by clients of several API keys.
+        """
+        return [(self.__cache_prefix,) + key for key in keys_of(identified)]
+
+    def _forget_upserts(self, keys_of, identified):
+        if self.config.upsert_memo is not None:
+            self.config.upsert_memo.forget(self._upsert_keys(keys_of, identified))
+
+    def _link_key(self, user: UserIdentified, device_id: str) -> bytes or None:
+        """
+        Returns the key of the link in the link memo, None when there is no link memo.
+        """
+        memo = self.config.link_memo
+        if memo is None:
+            return None
+        return memo.key(user, device_id, self.__cache_prefix)
+
+    def _link_users(self, user: UserIdentified) -> tuple:
+        """
+        Returns the keys the links of the user are indexed by in the link memo.
+        """
+        return self.config.link_memo.identifier_keys(user, self.__cache_prefix)
+
+    def _forget_links(self, user: UserIdentified):
+        if self.config.link_memo is not None:
+            self.config.link_memo.forget(self._link_users(user))
+
+    def _send_link(
+        self,
+        user: UserIdentified,
+        device_id: str,
+        key: bytes or None,
+        deadline: float or None,
+    ) -> Success[None] or Failure:
+        """
+        Sends a link that was already looked up in the link memo, and remembers it when it succeeded.
+        """
+        result = self._send(
+            self.__link.request(Client.__encode(self.__encoder.link, user, device_id)),
+            deadline=deadline,
+        )
+        if key is not None and isinstance(result, Success):
+            self.config.link_memo.remember(key, self._link_users(user))
+        return result
+
+    def _send_delete_user(
+        self, request: HttpRequest, user: UserIdentified, deadline: float or None
+    ) -> Success[None] or Failure:
+        """
+        Sends the deletion and forgets the links of the user when it succeeded.
+        """
+        result = self._send(request, deadline=deadline)
+        if isinstance(result, Success):
+            self._forget_links(user)
+        return result
+
+    @staticmethod
+    def _skipped() -> Skipped:
+        return Skipped()
+
+    def _cached(
+        self, key: str, request: HttpRequest, parse_data, deadline: float or None
+    ) -> Success or Failure:
+        cache = self.config.cache
+        if cache is None:
+            return self._send(request, parse_data, deadline=deadline)
+        return cache.get_or_load(
+            key, lambda: self._send(request, parse_data, deadline=deadline)
+        )
+
+    def add_event(
+        self, event: Event, timeout: float or None = None
+    ) -> Success[None] or Failure:
+        assert_journy(isinstance(event, Event), "The event should be an Event object.")
+
+        deadline = self._deadline(timeout)
+        return self._add_event_body(
+            Client.__encode(self.__encoder.event, event), deadline
+        )
 
     def upsert_user(
-        self, user: UserIdentified, properties: Properties
+        self,
+        user: UserIdentified,
+        properties: Properties,
+        timeout: float or None = None,
     ) -> Success[None] or Failure:
         assert_journy(
             isinstance(user, UserIdentified), "User is not a UserIdentified object."
@@ -165,64 +682,38 @@ class Client(object):
             isinstance(properties, Properties), "Properties is not a Properties object."
         )
 
-        try:
-            request = HttpRequest(
-                self.__create_url("/users/upsert"),
-                Method.POST,
-                self.__get_headers(),
-                json.dumps(
-                    {
-                        "identification": user.format_identification(),
-                        "properties": properties.properties,
-                    }
-                ),
-            )
-            response = self.httpclient.send(request)
-            calls_remaining = Client.__parse_calls_remaining(response)
-            if not (200 <= response.status_code < 300):
-                return Failure(
-                    response.body["meta"]["requestId"],
-                    calls_remaining,
-                    status_code_to_api_error(response.status_code),
-                )
-            return Success[None](
-                response.body["meta"]["requestId"], calls_remaining, None
-            )
-        except JournyException as e:
-            raise e
-        except Exception:
-            raise JournyException(f"An unknown error has occurred")
+        deadline = self._deadline(timeout)
+        return self._send_upsert(
+            self.__upsert_user.request(
+                Client.__encode(self.__encoder.upsert_user, user, properties)
+            ),
+            user_keys,
+            user,
+            deadline,
+        )
 
-    def delete_user(self, user: UserIdentified) -> Success[None] or Failure:
+    def delete_user(
+        self, user: UserIdentified, timeout: float or None = None
+    ) -> Success[None] or Failure:
         assert_journy(
             isinstance(user, UserIdentified), "User is not a UserIdentified object."
         )
 
-        try:
-            request = HttpRequest(
-                self.__create_url("/users"),
-                Method.DELETE,
-                self.__get_headers(),
-                json.dumps({"identification": user.format_identification()}),
-            )
-            response = self.httpclient.send(request)
-            calls_remaining = Client.__parse_calls_remaining(response)
-            if not (200 <= response.status_code < 300):
-                return Failure(
-                    response.body["meta"]["requestId"],
-                    calls_remaining,
-                    status_code_to_api_error(response.status_code),
-                )
-            return Success[None](
-                response.body["meta"]["requestId"], calls_remaining, None
-            )
-        except JournyException as e:
-            raise e
-        except Exception:
-            raise JournyException(f"An unknown error has occurred")
+        deadline = self._deadline(timeout)
+        self._forget_upserts(user_keys, user)
+        return self._send_delete_user(
+            self.__delete_user.request(
+                Client.__encode(self.__encoder.delete_user, user)
+            ),
+            user,
+            deadline,
+        )
 
     def upsert_account(
-        self, account: AccountIdentified, properties: Properties or None
+        self,
+        account: AccountIdentified,
+        properties: Properties or None,
+        timeout: float or None = None,
     ) -> Success[None] or Failure:
         assert_journy(
             isinstance(account, AccountIdentified),
@@ -234,69 +725,42 @@ class Client(object):
                 "Properties is not a Properties object.",
             )
 
-        try:
-            request = HttpRequest(
-                self.__create_url("/accounts/upsert"),
-                Method.POST,
-                self.__get_headers(),
-                json.dumps(
-                    {
-                        "identification": account.format_identification(),
-                        "properties": properties.properties,
-                    }
-                ),
-            )
-            response = self.httpclient.send(request)
-            calls_remaining = Client.__parse_calls_remaining(response)
-            if not (200 <= response.status_code < 300):
-                return Failure(
-                    response.body["meta"]["requestId"],
-                    calls_remaining,
-                    status_code_to_api_error(response.status_code),
+        deadline = self._deadline(timeout)
+        return self._send_upsert(
+            self.__upsert_account.request(
+                Client.__encode(
+                    self.__encoder.upsert_account,
+                    account,
+                    properties if properties is not None else {},
                 )
-            return Success[None](
-                response.body["meta"]["requestId"], calls_remaining, None
-            )
-        except JournyException as e:
-            raise e
-        except Exception:
-            raise JournyException(f"An unknown error has occurred")
+            ),
+            account_keys,
+            account,
+            deadline,
+        )
 
-    def delete_account(self, account: AccountIdentified) -> Success[None] or Failure:
+    def delete_account(
+        self, account: AccountIdentified, timeout: float or None = None
+    ) -> Success[None] or Failure:
         assert_journy(
             isinstance(account, AccountIdentified),
             "Account is not an AccountIdentified object.",
         )
 
-        try:
-            request = HttpRequest(
-                self.__create_url("/accounts"),
-                Method.DELETE,
-                self.__get_headers(),
-                json.dumps(
-                    {
-                        "identification": account.format_identification(),
-                    }
-                ),
-            )
-            response = self.httpclient.send(request)
-            calls_remaining = Client.__parse_calls_remaining(response)
-            if not (200 <= response.status_code < 300):
-                return Failure(
-                    response.body["meta"]["requestId"],
-                    calls_remaining,
-                    status_code_to_api_error(response.status_code),
-                )
-            return Success[None](
-                response.body["meta"]["requestId"], calls_remaining, None
-            )
-        except JournyException as e:
-            raise e
-        except Exception:
-            raise JournyException(f"An unknown error has occurred")
+        deadline = self._deadline(timeout)
+        self._forget_upserts(account_keys, account)
+        return self._send(
+            self.__delete_account.request(
+                Client.__encode(self.__encoder.delete_account, account)
+            ),
+            deadline=deadline,
+        )
 
     def add_users_to_account(
-        self, account: AccountIdentified, users: List[UserIdentified]
+        self,
+        account: AccountIdentified,
+        users: List[UserIdentified],
+        timeout: float or None = None,
     ) -> Success[None] or Failure:
         assert_journy(
             isinstance(account, AccountIdentified),
@@ -308,39 +772,19 @@ class Client(object):
                 f"User {user} is not a UserIdentified object.",
             )
 
-        try:
-            request = HttpRequest(
-                self.__create_url("/accounts/users/add"),
-                Method.POST,
-                self.__get_headers(),
-                json.dumps(
-                    {
-                        "account": account.format_identification(),
-                        "users": [
-                            {"identification": user.format_identification()}
-                            for user in users
-                        ],
-                    }
-                ),
-            )
-            response = self.httpclient.send(request)
-            calls_remaining = Client.__parse_calls_remaining(response)
-            if not (200 <= response.status_code < 300):
-                return Failure(
-                    response.body["meta"]["requestId"],
-                    calls_remaining,
-                    status_code_to_api_error(response.status_code),
-                )
-            return Success[None](
-                response.body["meta"]["requestId"], calls_remaining, None
-            )
-        except JournyException as e:
-            raise e
-        except Exception:
-            raise JournyException(f"An unknown error has occurred")
+        deadline = self._deadline(timeout)
+        return self._send(
+            self.__add_users.request(
+                Client.__encode(self.__encoder.members, account, users)
+            ),
+            deadline=deadline,
+        )
 
     def remove_users_from_account(
-        self, account: AccountIdentified, users: List[UserIdentified]
+        self,
+        account: AccountIdentified,
+        users: List[UserIdentified],
+        timeout: float or None = None,
     ) -> Success[None] or Failure:
         assert_journy(
             isinstance(account, AccountIdentified),
@@ -352,127 +796,302 @@ class Client(object):
                 f"User {user} is not a UserIdentified object.",
             )
 
-        try:
-            request = HttpRequest(
-                self.__create_url("/accounts/users/remove"),
-                Method.POST,
-                self.__get_headers(),
-                json.dumps(
-                    {
-                        "account": account.format_identification(),
-                        "users": [
-                            {"identification": user.format_identification()}
-                            for user in users
-                        ],
-                    }
-                ),
-            )
-            response = self.httpclient.send(request)
-            calls_remaining = Client.__parse_calls_remaining(response)
-            if not (200 <= response.status_code < 300):
-                return Failure(
-                    response.body["meta"]["requestId"],
-                    calls_remaining,
-                    status_code_to_api_error(response.status_code),
-                )
-            return Success[None](
-                response.body["meta"]["requestId"], calls_remaining, None
-            )
-        except JournyException as e:
-            raise e
-        except Exception:
-            raise JournyException(f"An unknown error has occurred")
+        deadline = self._deadline(timeout)
+        return self._send(
+            self.__remove_users.request(
+                Client.__encode(self.__encoder.members, account, users)
+            ),
+            deadline=deadline,
+        )
 
-    def link(self, user: UserIdentified, device_id: str) -> Success[None] or Failure:
+    def link(
+        self, user: UserIdentified, device_id: str, timeout: float or None = None
+    ) -> Success[None] or Failure:
         assert_journy(
             isinstance(user, UserIdentified), "The user is not a UserIdentified object."
         )
         assert_journy(isinstance(device_id, str), "The device id is not a string.")
 
-        try:
-            request = HttpRequest(
-                self.__create_url("/link"),
-                Method.POST,
-                self.__get_headers(),
-                json.dumps(
-                    {
-                        "deviceId": device_id,
-                        "identification": user.format_identification(),
-                    }
-                ),
-            )
-            response = self.httpclient.send(request)
-            calls_remaining = Client.__parse_calls_remaining(response)
-
-            if not (200 <= response.status_code < 300):
-                return Failure(
-                    response.body["meta"]["requestId"],
-                    calls_remaining,
-                    status_code_to_api_error(response.status_code),
-                )
-            return Success[None](
-                response.body["meta"]["requestId"], calls_remaining, None
-            )
-        except JournyException as e:
-            raise e
-        except Exception:
-            raise JournyException(f"An unknown error has occurred")
+        deadline = self._deadline(timeout)
+        key = self._link_key(user, device_id)
+        if key is not None and self.config.link_memo.linked(key):
+            return self._skipped()
+        return self._send_link(user, device_id, key, deadline)
+
+    def add_events(
+        self,
+        events: Iterable[Event],
+        parallelism: int = 8,
+        chunk_size: int = 1000,
+        timeout: float or None = None,
+    ) -> List[Success[None] or Failure]:
+        """
+        Sends the events concurrently, in chunks of chunk_size events with at most parallelism requests in flight.
+        Returns one result per event, in the order of the given events.
+        An invalid event, or an event for which the request could not be performed, gets a Failure with
+        APIError.UnknownError. The timeout applies to the request of every event separately, an event that did not
+        finish within it gets a Failure with APIError.TimeoutError.
+        """
+        Client._assert_bulk_options(parallelism, chunk_size, timeout)
+        return self._send_bulk(
+            self.add_event,
+            ((event,) for event in events),
+            1,
+            parallelism,
+            chunk_size,
+            timeout,
+        )
+
+    def upsert_users(
+        self,
+        users: Iterable[Tuple[UserIdentified, Properties]],
+        parallelism: int = 8,
+        chunk_size: int = 1000,
+        timeout: float or None = None,
+    ) -> List[Success[None] or Failure]:
+        """
+        Upserts the (user, properties) pairs concurrently, see add_events.
+        """
+        Client._assert_bulk_options(parallelism, chunk_size, timeout)
+        return self._send_bulk(
+            self.upsert_user, users, 2, parallelism, chunk_size, timeout
+        )
+
+    def upsert_accounts(
+        self,
+        accounts: Iterable[Tuple[AccountIdentified, Properties or None]],
+        parallelism: int = 8,
+        chunk_size: int = 1000,
+        timeout: float or None = None,
+    ) -> List[Success[None] or Failure]:
+        """
+        Upserts the (account, properties) pairs concurrently, see add_events.
+        """
+        Client._assert_bulk_options(parallelism, chunk_size, timeout)
+        return self._send_bulk(
+            self.upsert_account, accounts, 2, parallelism, chunk_size, timeout
+        )
 
     def get_tracking_snippet(
-        self, domain: str
+        self, domain: str, timeout: float or None = None
     ) -> Success[TrackingSnippetResponse] or Failure:
         assert_journy(isinstance(domain, str), "domain should be a string.")
 
+        return self._cached(
+            f"tracking_snippet:{self.__cache_prefix}:{domain}",
+            self.__tracking_snippet.request(
+                None, "?domain={}".format(parse.quote_plus(domain))
+            ),
+            Client.__parse_tracking_snippet,
+            self._deadline(timeout),
+        )
+
+    def get_api_key_details(
+        self, timeout: float or None = None
+    ) -> Success[ApiKeyDetails] or Failure:
+        return self._cached(
+            f"api_key_details:{self.__cache_prefix}",
+            self.__validate.request(),
+            Client.__parse_api_key_details,
+            self._deadline(timeout),
+        )
+
+
+class AsyncClient(Client):
+    """
+    Journy.io's asynchronous python journyio client.
+    It has the same methods as the Client, but every method returns an awaitable resolving to a Success or Failure.
+    """
+
+    @staticmethod
+    def _assert_httpclient(httpclient):
+        assert_journy(
+            isinstance(httpclient, AsyncHttpClient),
+            "The httpClient is not an AsyncHttpClient object.",
+        )
+
+    def __repr__(self):
+        return f"AsyncClient({self.httpclient}, {self.config})"
+
+    def _send(
+        self,
+        request: HttpRequest,
+        parse_data=None,
+        idempotent: bool = True,
+        deadline: float or None = None,
+    ) -> Awaitable[Success or Failure]:
+        # The span starts right away, so it picks up the serialization time of this thread.
+        return self.__send(
+            request, parse_data, idempotent, deadline, self._start_span(request)
+        )
+
+    async def __send(
+        self,
+        request: HttpRequest,
+        parse_data,
+        idempotent: bool,
+        deadline: float or None,
+        span: Span or None,
+    ) -> Success or Failure:
+        if span is None:
+            return await self.__attempt(request, parse_data, idempotent, deadline, None)
         try:
-            request = HttpRequest(
-                self.__create_url(
-                    "/tracking/snippet?domain={}".format(parse.quote_plus(domain))
-                ),
-                Method.GET,
-                self.__get_headers(),
-                None,
-            )
-            response = self.httpclient.send(request)
-            calls_remaining = Client.__parse_calls_remaining(response)
-
-            if not (200 <= response.status_code < 300):
-                return Failure(
-                    response.body["meta"]["requestId"],
-                    calls_remaining,
-                    status_code_to_api_error(response.status_code),
-                )
-            return Success[TrackingSnippetResponse](
-                response.body["meta"]["requestId"],
-                calls_remaining,
-                TrackingSnippetResponse(
-                    response.body["data"]["domain"], response.body["data"]["snippet"]
-                ),
+            result = await self.__attempt(
+                request, parse_data, idempotent, deadline, span
             )
         except JournyException as e:
-            raise e
-        except Exception:
-            raise JournyException(f"An unknown error has occurred")
+            self._finish_span(span, e)
+            raise
+        self._finish_span(span, result)
+        return result
 
-    def get_api_key_details(self) -> Success[ApiKeyDetails] or Failure:
-        try:
-            request = HttpRequest(
-                self.__create_url("/validate"), Method.GET, self.__get_headers(), None
-            )
-            response = self.httpclient.send(request)
-            calls_remaining = Client.__parse_calls_remaining(response)
-
-            if not (200 <= response.status_code < 300):
-                return Failure(
-                    response.body["meta"]["requestId"],
-                    calls_remaining,
-                    status_code_to_api_error(response.status_code),
+    async def __send_within(self, request: HttpRequest) -> HttpResponse:
+        """
+        Sends the request, cancelling it when it takes longer than its timeout, whatever the HttpClient does with it.
+        """
+        if request.timeout is None:
+            return await self.httpclient.send(request)
+        return await asyncio.wait_for(self.httpclient.send(request), request.timeout)
+
+    async def __attempt(
+        self,
+        request: HttpRequest,
+        parse_data,
+        idempotent: bool,
+        deadline: float or None,
+        span: Span or None,
+    ) -> Success or Failure:
+        retry = (self.config.retry_policy or NO_RETRIES).start(idempotent, deadline)
+        while True:
+            delay = self._before_send(deadline)
+            try:
+                if delay > 0:
+                    if span is not None:
+                        span.queueing += delay
+                    await asyncio.sleep(delay)
+                request.timeout = Client._remaining(deadline)
+            except BaseException:
+                self._release()
+                raise
+            try:
+                response = await self.__send_within(request)
+            except Exception as e:
+                self._after_send(None)
+                delay = retry.on_exception()
+                if delay is None:
+                    Client._raise_send_error(e, deadline)
+            except BaseException:
+                # E.g. a cancelled task, the outcome of the request is unknown.
+                self._release()
+                raise
+            else:
+                self._after_send(response)
+                if span is not None:
+                    Client._record_response(span, response)
+                delay = retry.on_response(response)
+                if delay is None:
+                    try:
+                        return self._handle_response(response, parse_data)
+                    except JournyException as e:
+                        raise e
+                    except Exception as e:
+                        raise JournyException(f"An unknown error has occurred") from e
+            if span is not None:
+                span.retries += 1
+                span.backoff += delay
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    async def __send_bulk_item(
+        method, args: tuple, arity: int, timeout, semaphore: asyncio.Semaphore
+    ):
+        async with semaphore:
+            try:
+                Client._assert_bulk_item(args, arity)
+                return await method(*args, timeout=timeout)
+            except JournyTimeoutException:
+                return Failure(None, None, APIError.TimeoutError)
+            except JournyException:
+                return Failure(None, None, APIError.UnknownError)
+
+    def _send_upsert(
+        self, request: HttpRequest, keys_of, identified, deadline: float or None
+    ) -> Awaitable[Success[None] or Failure]:
+        memo = self.config.upsert_memo
+        if memo is None:
+            return self._send(request, deadline=deadline)
+        keys = self._upsert_keys(keys_of, identified)
+        digest = memo.digest(request.body)
+        if memo.unchanged(keys, digest):
+            return self._skipped()
+        return AsyncClient.__remember(
+            self._send(request, deadline=deadline), memo, keys, digest
+        )
+
+    @staticmethod
+    async def _skipped() -> Skipped:
+        return Skipped()
+
+    async def _send_link(
+        self,
+        user: UserIdentified,
+        device_id: str,
+        key: bytes or None,
+        deadline: float or None,
+    ) -> Success[None] or Failure:
+        result = await super()._send_link(user, device_id, None, deadline)
+        if key is not None and isinstance(result, Success):
+            self.config.link_memo.remember(key, self._link_users(user))
+        return result
+
+    async def _send_delete_user(
+        self, request: HttpRequest, user: UserIdentified, deadline: float or None
+    ) -> Success[None] or Failure:
+        result = await self._send(request, deadline=deadline)
+        if isinstance(result, Success):
+            self._forget_links(user)
+        return result
+
+    @staticmethod
+    async def __remember(
+        send: Awaitable[Success or Failure], memo: UpsertMemo, keys: list, digest: bytes
+    ) -> Success[None] or Failure:
+        result = await send
+        if isinstance(result, Success):
+            memo.remember(keys, digest)
+        return result
+
+    async def _cached(
+        self, key: str, request: HttpRequest, parse_data, deadline: float or None
+    ) -> Success or Failure:
+        cache = self.config.cache
+        if cache is None:
+            return await self._send(request, parse_data, deadline=deadline)
+        return await cache.get_or_load_async(
+            key, lambda: self._send(request, parse_data, deadline=deadline)
+        )
+
+    async def _send_bulk(
+        self,
+        method,
+        items: Iterable[tuple],
+        arity: int,
+        parallelism: int,
+        chunk_size: int,
+        timeout: float or None = None,
+    ) -> List[Success or Failure]:
+        results = []
+        chunks = Client._chunks(items, chunk_size)
+        semaphore = asyncio.Semaphore(parallelism)
+        for chunk in chunks:
+            results.extend(
+                await asyncio.gather(
+                    *[
+                        AsyncClient.__send_bulk_item(
+                            method, args, arity, timeout, semaphore
+                        )
+                        for args in chunk
+                    ]
                 )
-            return Success[ApiKeyDetails](
-                response.body["meta"]["requestId"],
-                calls_remaining,
-                ApiKeyDetails(response.body["data"]["permissions"]),
             )
-        except JournyException as e:
-            raise e
-        except Exception:
-            raise JournyException(f"An unknown error has occurred")
+        return results
@@ -0,0 +1,405 @@
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from .account_identified import AccountIdentified
+from .client import AsyncClient, Client, Properties
+from .memo import account_keys, user_keys
+from .process import register_after_fork
+from .user_identified import UserIdentified
+from .results import Failure
+from .utils import APIError, JournyException, assert_journy
+
+
+class PendingUpsert(object):
+    """
+    The merged properties of the upserts for one user or account that are waiting to be sent.
+    """
+
+    __slots__ = ("identified", "properties", "futures", "deadline")
+
+    def __init__(
+        self,
+        identified: UserIdentified or AccountIdentified,
+        properties: Properties,
+        deadline: float,
+    ):
+        self.identified = identified
+        self.properties = properties
+        self.futures = []
+        self.deadline = deadline
+
+    def __str__(self):
+        return (
+            f"PendingUpsert({self.identified}, {self.properties}, {len(self.futures)})"
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def merge_identification(first, second, keys_of, create):
+    """
+    Returns the identification with the identifiers of both, None when they have different values for an identifier.
+    """
+    identifiers = dict(keys_of(first))
+    for kind, value in keys_of(second):
+        if identifiers.setdefault(kind, value) != value:
+            return None
+    return create(identifiers)
+
+
+def create_user(identifiers: dict) -> UserIdentified:
+    return UserIdentified(identifiers.get("user_id"), identifiers.get("email"))
+
+
+def create_account(identifiers: dict) -> AccountIdentified:
+    return AccountIdentified(identifiers.get("account_id"), identifiers.get("domain"))
+
+
+class UpsertCoalescer(object):
+    """
+    Merges the upserts of the same user or account that happen within window seconds into a single request.
+    Properties are merged last-write-wins with Properties.union, so the final state equals sending every upsert.
+    Upserts that share an identifier are merged too, e.g. one by user id and one by user id and email. When they have
+    different values for another identifier they are sent one after another instead.
+    Every upsert returns a Future that resolves to the result of the request it was merged into.
+    Pending upserts are sent when the coalescer is closed, which happens automatically at interpreter exit, for at most
+    exit_timeout seconds.
+    """
+
+    # Once closed, the pending upserts are dropped after this many requests in a row raised.
+    MAX_CLOSE_FAILURES = 3
+
+    def __init__(
+        self,
+        client: Client,
+        window: float = 1.0,
+        parallelism: int = 8,
+        exit_timeout: float = 5.0,
+    ):
+        assert_journy(
+            isinstance(client, Client) and not isinstance(client, AsyncClient),
+            "The client is not a synchronous Client object.",
+        )
+        assert_journy(
+            isinstance(window, (int, float)) and window > 0,
+            "The window is not a positive number.",
+        )
+        assert_journy(
+            isinstance(parallelism, int) and parallelism > 0,
+            "The parallelism is not a positive int.",
+        )
+        assert_journy(
+            isinstance(exit_timeout, (int, float)) and exit_timeout > 0,
+            "The exit_timeout is not a positive number.",
+        )
+
+        self.client = client
+        self.window = window
+        self.parallelism = parallelism
+        self.exit_timeout = exit_timeout
+        self.upserts = 0
+        self.requests = 0
+        self.dropped = 0
+
+        self.__closed = False
+        self.__close_deadline = None
+        self.__reset()
+        atexit.register(self.__close_at_exit)
+        register_after_fork(self)
+
+    def __reset(self):
+        self.__users = OrderedDict()
+        self.__accounts = OrderedDict()
+        self.__user_index = {}
+        self.__account_index = {}
+        self.__sending = 0
+        self.__flush_requested = False
+        self.__failures = 0
+        self.__lock = threading.Lock()
+        self.__changed = threading.Condition(self.__lock)
+
+        self.__sender = threading.Thread(
+            target=self.__send_pending, name="journyio-coalescer", daemon=True
+        )
+        self.__sender.start()
+
+    @property
+    def pending(self) -> int:
+        return len(self.__users) + len(self.__accounts)
+
+    @property
+    def coalesced(self) -> int:
+        """
+        The number of upserts that were merged into another upsert instead of being sent on their own.
+        """
+        return self.upserts - self.requests - self.pending - self.dropped
+
+    def upsert_user(self, user: UserIdentified, properties: Properties) -> Future:
+        assert_journy(
+            isinstance(user, UserIdentified), "User is not a UserIdentified object."
+        )
+        assert_journy(
+            isinstance(properties, Properties), "Properties is not a Properties object."
+        )
+        return self.__add(
+            self.__users, self.__user_index, user_keys, create_user, user, properties
+        )
+
+    def upsert_account(
+        self, account: AccountIdentified, properties: Properties or None = None
+    ) -> Future:
+        assert_journy(
+            isinstance(account, AccountIdentified),
+            "Account is not an AccountIdentified object.",
+        )
+        assert_journy(
+            properties is None or isinstance(properties, Properties),
+            "Properties is not a Properties object.",
+        )
+        return self.__add(
+            self.__accounts,
+            self.__account_index,
+            account_keys,
+            create_account,
+            account,
+            properties or Properties(),
+        )
+
+    def flush(self, timeout: float or None = None) -> bool:
+        """
+        Sends the pending upserts without waiting for their window to pass and waits until they are handled.
+        Returns False if the timeout passed before everything was sent.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__lock:
+            self.__flush_requested = True
+            self.__changed.notify_all()
+            while self.__users or self.__accounts or self.__sending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.__changed.wait(remaining)
+            self.__flush_requested = False
+        return True
+
+    def close(self, timeout: float or None = None):
+        """
+        Sends the pending upserts and stops the sender thread, waiting at most timeout seconds in total.
+        New upserts are refused afterwards. Upserts that are not sent when the timeout passed, or after
+        MAX_CLOSE_FAILURES requests in a row raised, are dropped and their futures raise a JournyException.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__close_deadline = deadline
+            self.__changed.notify_all()
+        self.__sender.join(
+            None if deadline is None else max(deadline - time.monotonic(), 0)
+        )
+        atexit.unregister(self.__close_at_exit)
+
+    def __close_at_exit(self):
+        self.close(self.exit_timeout)
+
+    def _after_fork(self):
+        # The pending upserts are sent by the parent, the child starts without any and with a new sender.
+        if not self.__closed:
+            self.__reset()
+
+    def __add(
+        self,
+        pending: OrderedDict,
+        index: dict,
+        keys_of,
+        create,
+        identified: UserIdentified or AccountIdentified,
+        properties: Properties,
+    ) -> Future:
+        future = Future()
+        keys = keys_of(identified)
+        with self.__lock:
+            assert_journy(not self.__closed, "The coalescer is closed.")
+            matches = []
+            for key in keys:
+                match = index.get(key)
+                if match is not None and match not in matches:
+                    matches.append(match)
+            merged = None
+            if len(matches) == 1:
+                merged = merge_identification(
+                    matches[0].identified, identified, keys_of, create
+                )
+            if merged is not None:
+                upsert = matches[0]
+                upsert.identified = merged
+                upsert.properties.union(properties)
+            else:
+                # Later upserts are merged into the new one, the ones it overlaps with are sent before it.
+                for match in matches:
+                    UpsertCoalescer.__unindex(index, keys_of, match)
+                upsert = PendingUpsert(
+                    identified,
+                    Properties().union(properties),
+                    time.monotonic() + self.window,
+                )
+                pending[id(upsert)] = upsert
+                self.__changed.notify_all()
+            for key in keys_of(upsert.identified):
+                index[key] = upsert
+            upsert.futures.append(future)
+            self.upserts += 1
+        return future
+
+    @staticmethod
+    def __unindex(index: dict, keys_of, upsert: PendingUpsert):
+        for key in keys_of(upsert.identified):
+            if index.get(key) is upsert:
+                del index[key]
+
+    @staticmethod
+    def __take_due(
+        pending: OrderedDict, index: dict, keys_of, now: float or None
+    ) -> list:
+        due = []
+        while pending:
+            key, upsert = next(iter(pending.items()))
+            if now is not None and upsert.deadline > now:
+                break
+            del pending[key]
+            UpsertCoalescer.__unindex(index, keys_of, upsert)
+            due.append(upsert)
+        return due
+
+    @staticmethod
+    def __rounds(upserts: list, keys_of) -> list:
+        """
+        Splits the upserts in rounds that can be sent concurrently, upserts that share an identifier with an earlier
+        one go in a later round.
+        """
+        rounds = []
+        keys = set()
+        for upsert in upserts:
+            upsert_keys = set(keys_of(upsert.identified))
+            if not rounds or keys & upsert_keys:
+                rounds.append([])
+                keys = set()
+            rounds[-1].append(upsert)
+            keys |= upsert_keys
+        return rounds
+
+    @staticmethod
+    def __raised(result) -> bool:
+        return (
+            isinstance(result, Failure)
+            and result.request_id is None
+            and result.error in (APIError.UnknownError, APIError.TimeoutError)
+        )
+
+    @staticmethod
+    def __fail(upserts: list, e: Exception):
+        for upsert in upserts:
+            for future in upsert.futures:
+                if not future.done():
+                    future.set_exception(e)
+
+    def __remaining(self) -> float or None:
+        # The time left to send upserts in, None when there is no limit.
+        if not self.__closed:
+            return None
+        if self.__failures >= self.MAX_CLOSE_FAILURES:
+            return 0.0
+        if self.__close_deadline is None:
+            return None
+        return self.__close_deadline - time.monotonic()
+
+    def __next_due(self) -> tuple:
+        with self.__lock:
+            while True:
+                now = (
+                    None
+                    if self.__flush_requested or self.__closed
+                    else time.monotonic()
+                )
+                users = UpsertCoalescer.__take_due(
+                    self.__users, self.__user_index, user_keys, now
+                )
+                accounts = UpsertCoalescer.__take_due(
+                    self.__accounts, self.__account_index, account_keys, now
+                )
+                if users or accounts:
+                    self.__sending += len(users) + len(accounts)
+                    self.requests += len(users) + len(accounts)
+                    return users, accounts
+                if self.__closed:
+                    return [], []
+                if self.__flush_requested:
+                    self.__flush_requested = False
+                    self.__changed.notify_all()
+                deadlines = [
+                    next(iter(pending.values())).deadline
+                    for pending in (self.__users, self.__accounts)
+                    if pending
+                ]
+                self.__changed.wait(
+                    min(deadlines) - time.monotonic() if deadlines else None
+                )
+
+    def __send_pending(self):
+        while True:
+            users, accounts = self.__next_due()
+            if not users and not accounts:
+                return
+            batches = [
+                (upserts, self.client.upsert_users)
+                for upserts in UpsertCoalescer.__rounds(users, user_keys)
+            ] + [
+                (upserts, self.client.upsert_accounts)
+                for upserts in UpsertCoalescer.__rounds(accounts, account_keys)
+            ]
+            for upserts, send in batches:
+                remaining = self.__remaining()
+                if remaining is not None and remaining <= 0:
+                    with self.__lock:
+                        self.requests -= len(upserts)
+                        self.dropped += len(upserts)
+                    UpsertCoalescer.__fail(
+                        upserts,
+                        JournyException(
+                            "The coalescer was closed before the upsert was sent."
+                        ),
+                    )
+                    continue
+                try:
+                    results = send(
+                        [(upsert.identified, upsert.properties) for upsert in upserts],
+                        parallelism=self.parallelism,
+                        timeout=remaining,
+                    )
+                except Exception as e:
+                    self.__failures += len(upserts)
+                    UpsertCoalescer.__fail(upserts, e)
+                else:
+                    for upsert, result in zip(upserts, results):
+                        self.__failures = (
+                            self.__failures + 1
+                            if UpsertCoalescer.__raised(result)
+                            else 0
+                        )
+                        for future in upsert.futures:
+                            if not future.done():
+                                future.set_result(result)
+            with self.__lock:
+                self.__sending -= len(users) + len(accounts)
+                self.__changed.notify_all()
+
+    def __str__(self):
+        return f"UpsertCoalescer({self.client}, {self.window}, {self.pending})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,114 @@
+import json
+
+from .utils import assert_journy
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+
+class JsonCodec:
+    """
+    Interface for a JSON codec, used to serialize request bodies and parse response bodies.
+    dumps can return a str or UTF-8 encoded bytes, loads has to accept both.
+    """
+
+    def dumps(self, value) -> str or bytes:
+        pass
+
+    def loads(self, data: str or bytes):
+        pass
+
+
+class StdlibJsonCodec(JsonCodec):
+    def dumps(self, value) -> str:
+        return json.dumps(value)
+
+    def loads(self, data: str or bytes):
+        return json.loads(data)
+
+    def __str__(self):
+        return "StdlibJsonCodec()"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    JsonCodec using orjson, which works on bytes. Requires the orjson package.
+    Values orjson does not support, e.g. integers beyond 64 bits, are handled by the standard library.
+    """
+
+    def __init__(self):
+        assert_journy(orjson is not None, "The orjson package is not installed.")
+
+    def dumps(self, value) -> bytes or str:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            return json.dumps(value)
+
+    def loads(self, data: str or bytes):
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            return json.loads(data)
+
+    def __str__(self):
+        return "OrjsonCodec()"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class UjsonCodec(JsonCodec):
+    """
+    JsonCodec using ujson. Requires the ujson package.
+    Values ujson does not support, e.g. integers beyond 64 bits, are handled by the standard library.
+    """
+
+    def __init__(self):
+        assert_journy(ujson is not None, "The ujson package is not installed.")
+
+    def dumps(self, value) -> str:
+        try:
+            return ujson.dumps(value)
+        except (TypeError, OverflowError):
+            return json.dumps(value)
+
+    def loads(self, data: str or bytes):
+        try:
+            return ujson.loads(data)
+        except ValueError:
+            return json.loads(data)
+
+    def __str__(self):
+        return "UjsonCodec()"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def default_codec() -> JsonCodec:
+    """
+    Returns the codec used when none is configured, the standard library.
+    """
+    return StdlibJsonCodec()
+
+
+def fastest_codec() -> JsonCodec:
+    """
+    Returns the fastest available codec: orjson, then ujson, then the standard library.
+    """
+    if orjson is not None:
+        return OrjsonCodec()
+    if ujson is not None:
+        return UjsonCodec()
+    return StdlibJsonCodec()
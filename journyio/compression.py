@@ -0,0 +1,160 @@
+import threading
+import zlib
+
+from .utils import assert_journy
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Every HttpClient implementation of the SDK decodes these response encodings.
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+class Compressor:
+    """
+    Interface for a request body compressor. encoding is the value of the Content-Encoding header.
+    """
+
+    encoding = None
+
+    def compress(self, data: bytes) -> bytes:
+        pass
+
+
+class GzipCompressor(Compressor):
+    encoding = "gzip"
+
+    def __init__(self, level: int = 6):
+        assert_journy(
+            isinstance(level, int) and 0 <= level <= 9,
+            "The level is not an int between 0 and 9.",
+        )
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+
+    def __str__(self):
+        return f"GzipCompressor({self.level})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class DeflateCompressor(Compressor):
+    """
+    Compressor for the deflate content coding, which is the zlib format.
+    """
+
+    encoding = "deflate"
+
+    def __init__(self, level: int = 6):
+        assert_journy(
+            isinstance(level, int) and 0 <= level <= 9,
+            "The level is not an int between 0 and 9.",
+        )
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def __str__(self):
+        return f"DeflateCompressor({self.level})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class ZstdCompressor(Compressor):
+    """
+    Compressor using zstd, which is faster than gzip at a similar ratio. Requires the zstandard package.
+    """
+
+    encoding = "zstd"
+
+    def __init__(self, level: int = 3):
+        assert_journy(zstandard is not None, "The zstandard package is not installed.")
+        assert_journy(
+            isinstance(level, int) and 1 <= level <= 22,
+            "The level is not an int between 1 and 22.",
+        )
+        self.level = level
+        self.__local = threading.local()
+
+    def compress(self, data: bytes) -> bytes:
+        # ZstdCompressor objects are not thread-safe, so every thread gets its own.
+        compressor = getattr(self.__local, "compressor", None)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(level=self.level)
+            self.__local.compressor = compressor
+        return compressor.compress(data)
+
+    def __str__(self):
+        return f"ZstdCompressor({self.level})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class RequestCompression(object):
+    """
+    Compresses request bodies of at least threshold bytes and sets their Content-Encoding header.
+    All requests advertise the response encodings the HttpClient can decode with Accept-Encoding.
+    Passed to the HttpClient, e.g. HttpClientRequests(compression=RequestCompression()).
+    """
+
+    def __init__(self, compressor: Compressor or None = None, threshold: int = 1024):
+        if compressor is None:
+            compressor = GzipCompressor()
+        assert_journy(
+            isinstance(compressor, Compressor),
+            "The compressor is not a Compressor object.",
+        )
+        assert_journy(
+            isinstance(threshold, int) and threshold >= 0,
+            "The threshold is not a non-negative int.",
+        )
+
+        self.compressor = compressor
+        self.threshold = threshold
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.__lock = threading.Lock()
+
+    def apply(self, headers: dict, body) -> tuple:
+        """
+        Returns the headers and body to send. The headers are copied, since the request templates share them.
+        """
+        headers = dict(headers)
+        headers["accept-encoding"] = ACCEPT_ENCODING
+        if body is None:
+            return headers, body
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        if len(data) < self.threshold:
+            return headers, data
+        compressed = self.compressor.compress(data)
+        with self.__lock:
+            self.compressed += 1
+            self.bytes_in += len(data)
+            self.bytes_out += len(compressed)
+        headers["content-encoding"] = self.compressor.encoding
+        return headers, compressed
+
+    @property
+    def ratio(self) -> float or None:
+        """
+        Compressed size relative to the original size, over all compressed bodies.
+        """
+        if not self.bytes_in:
+            return None
+        return self.bytes_out / self.bytes_in
+
+    def __str__(self):
+        return f"RequestCompression({self.compressor}, {self.threshold})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -1,6 +1,6 @@
 import datetime
 import json
-from collections import defaultdict
+from typing import Tuple
 
 from .utils import JournyException, assert_journy
 from .user_identified import UserIdentified
@@ -8,29 +8,70 @@ from .account_identified import AccountIdentified
 
 
 class Metadata(dict):
-    def __init__(self):
+    """
+    Metadata of an event. Keys are lowercased and stripped.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
         super().__init__()
-        self.metadata = defaultdict(lambda _: None)
+        if args or kwargs:
+            self.update(*args, **kwargs)
+
+    @classmethod
+    def from_dict(cls, values: dict or None = None, **kwargs):
+        """
+        Creates metadata from a dict and/or keyword arguments, validating them in a single pass.
+        """
+        metadata = cls()
+        metadata.update(values or {}, **kwargs)
+        return metadata
+
+    @property
+    def metadata(self):
+        # The metadata used to live in a separate dict, kept so existing callers keep working.
+        return self
+
+    @staticmethod
+    def __normalize(
+        key: str, value: str or bool or int
+    ) -> Tuple[str, str or bool or int]:
+        if not isinstance(key, str):
+            raise JournyException("The key is not a string.")
+        if not isinstance(value, (str, int)):
+            raise JournyException("Value is not a string, number or boolean.")
+        return key.lower().strip(), value
 
     def __getitem__(self, key: str):
         assert_journy(isinstance(key, str), "The key is not a string.")
 
-        return self.metadata.get(key.lower().strip())
+        return self.get(key.lower().strip())
 
     def __setitem__(self, key: str, value: str or bool or int):
-        assert_journy(isinstance(key, str), "The key is not a string.")
+        super().__setitem__(*Metadata.__normalize(key, value))
+
+    def update(self, *args, **kwargs):
+        """
+        Validates all values before any of them is stored, so a failed update leaves the metadata untouched.
+        """
+        normalize = Metadata.__normalize
+        super().update(
+            [normalize(key, value) for key, value in dict(*args, **kwargs).items()]
+        )
 
-        if isinstance(value, str) or isinstance(value, int) or isinstance(value, bool):
-            self.metadata.__setitem__(key.lower().strip(), value)
-        else:
-            raise JournyException("Value is not a string, number or boolean.")
+    def setdefault(self, key: str, default: str or bool or int):
+        return super().setdefault(*Metadata.__normalize(key, default))
 
     def union(self, metadata):
-        self.metadata.update(metadata.metadata)
+        if isinstance(metadata, Metadata):
+            super().update(metadata)
+        else:
+            self.update(metadata)
         return self
 
     def __str__(self):
-        return json.dumps(self.metadata)
+        return json.dumps(self)
 
     def __repr__(self):
         return self.__str__()
@@ -42,6 +83,8 @@ class Event(object):
     via the constructor. Not doing using them could lead to problems.
     """
 
+    __slots__ = ("name", "user", "account", "date", "metadata")
+
     def __init__(
         self,
         name: str,
@@ -80,30 +123,80 @@ class Event(object):
         self.date = date
         self.metadata = metadata
 
+    @classmethod
+    def _unchecked(
+        cls,
+        name: str,
+        user: UserIdentified or None,
+        account: AccountIdentified or None,
+        date: datetime.datetime or None,
+        metadata: Metadata,
+    ):
+        """
+        Creates an event without validating the arguments, for callers that already did.
+        """
+        event = cls.__new__(cls)
+        event.name = name
+        event.user = user
+        event.account = account
+        event.date = date
+        event.metadata = metadata
+        return event
+
     def happened_at(self, date: str):
-        return Event(self.name, self.user, self.account, date, self.metadata)
+        if date:
+            assert_journy(
+                isinstance(date, datetime.datetime),
+                "The date is not a datetime object.",
+            )
+        return Event._unchecked(self.name, self.user, self.account, date, self.metadata)
 
     def with_metadata(self, metadata: Metadata):
-        return Event(
+        assert_journy(
+            isinstance(metadata, Metadata), "The metadata should be a Metadata object"
+        )
+        return Event._unchecked(
             self.name, self.user, self.account, self.date, self.metadata.union(metadata)
         )
 
     @staticmethod
     def for_user(name: str, user: UserIdentified):
         assert_journy(user, "User can not be empty!")
-        return Event(name, user, None, None, Metadata())
+        Event.__assert_name(name)
+        assert_journy(
+            isinstance(user, UserIdentified), "The user is not of type UserIdentified."
+        )
+        return Event._unchecked(name, user, None, None, Metadata())
 
     @staticmethod
     def for_account(name: str, account: AccountIdentified):
         assert_journy(account, "Account can not be empty!")
-        return Event(name, None, account, None, Metadata())
+        Event.__assert_name(name)
+        assert_journy(
+            isinstance(account, AccountIdentified),
+            "The account is not of type AccountIdentified.",
+        )
+        return Event._unchecked(name, None, account, None, Metadata())
 
     @staticmethod
     def for_user_in_account(
         name: str, user: UserIdentified, account: AccountIdentified
     ):
         assert_journy(account and user, "User and account can not be empty!")
-        return Event(name, user, account, None, Metadata())
+        Event.__assert_name(name)
+        assert_journy(
+            isinstance(user, UserIdentified), "The user is not of type UserIdentified."
+        )
+        assert_journy(
+            isinstance(account, AccountIdentified),
+            "The account is not of type AccountIdentified.",
+        )
+        return Event._unchecked(name, user, account, None, Metadata())
+
+    @staticmethod
+    def __assert_name(name: str):
+        assert_journy(name, "Event name cannot be empty.")
+        assert_journy(isinstance(name, str), "The name is not a string.")
 
     def __str__(self):
         return f"Event({self.name}, {self.user}, {self.account}, {self.date}, {self.metadata})"
@@ -0,0 +1,212 @@
+import atexit
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Iterable, List
+
+from .account_identified import AccountIdentified
+from .client import AsyncClient, Client, Properties
+from .events import Event
+from .process import register_after_fork
+from .results import Success
+from .user_identified import UserIdentified
+from .utils import assert_journy
+
+
+class FutureClient(object):
+    """
+    Wraps a Client and sends every call on a bounded thread pool, so independent calls overlap.
+    Every method returns a concurrent.futures.Future resolving to the Success or Failure of the call, exceptions
+    the Client raises (e.g. for invalid arguments) are raised by Future.result().
+    When max_pending calls are queued or running, new calls block until one finished.
+    The timeout of a call starts when it is taken off the pool's queue, not when it is submitted.
+    Pass an executor to share it with other code; it is not shut down by close() then.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        max_workers: int = 8,
+        max_pending: int or None = None,
+        executor: Executor or None = None,
+    ):
+        assert_journy(
+            isinstance(client, Client) and not isinstance(client, AsyncClient),
+            "The client is not a synchronous Client object.",
+        )
+        assert_journy(
+            isinstance(max_workers, int) and max_workers > 0,
+            "The max_workers is not a positive int.",
+        )
+        if max_pending is not None:
+            assert_journy(
+                isinstance(max_pending, int) and max_pending > 0,
+                "The max_pending is not a positive int.",
+            )
+        if executor is not None:
+            assert_journy(
+                isinstance(executor, Executor), "The executor is not an Executor."
+            )
+
+        self.client = client
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.__owns_executor = executor is None
+        if executor is None:
+            executor = self.__new_executor()
+            atexit.register(self.close)
+        self.executor = executor
+        self.__reset()
+        register_after_fork(self)
+
+    def __new_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="journyio-client"
+        )
+
+    def __reset(self):
+        self.__slots = (
+            threading.BoundedSemaphore(self.max_pending)
+            if self.max_pending is not None
+            else None
+        )
+        self.__pending = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of calls that are queued or running.
+        """
+        return self.__pending
+
+    def submit(self, method, *args) -> Future:
+        """
+        Calls method(*args) on the pool, e.g. submit(client.add_event, event).
+        """
+        if self.__slots is not None:
+            self.__slots.acquire()
+        with self.__lock:
+            self.__pending += 1
+        try:
+            future = self.executor.submit(method, *args)
+        except BaseException:
+            self.__done(None)
+            raise
+        future.add_done_callback(self.__done)
+        return future
+
+    def __done(self, future: Future or None):
+        with self.__lock:
+            self.__pending -= 1
+        if self.__slots is not None:
+            self.__slots.release()
+
+    def add_event(self, event: Event, timeout: float or None = None) -> Future:
+        return self.submit(self.client.add_event, event, timeout)
+
+    def upsert_user(
+        self,
+        user: UserIdentified,
+        properties: Properties,
+        timeout: float or None = None,
+    ) -> Future:
+        return self.submit(self.client.upsert_user, user, properties, timeout)
+
+    def delete_user(
+        self, user: UserIdentified, timeout: float or None = None
+    ) -> Future:
+        return self.submit(self.client.delete_user, user, timeout)
+
+    def upsert_account(
+        self,
+        account: AccountIdentified,
+        properties: Properties or None,
+        timeout: float or None = None,
+    ) -> Future:
+        return self.submit(self.client.upsert_account, account, properties, timeout)
+
+    def delete_account(
+        self, account: AccountIdentified, timeout: float or None = None
+    ) -> Future:
+        return self.submit(self.client.delete_account, account, timeout)
+
+    def add_users_to_account(
+        self,
+        account: AccountIdentified,
+        users: List[UserIdentified],
+        timeout: float or None = None,
+    ) -> Future:
+        return self.submit(self.client.add_users_to_account, account, users, timeout)
+
+    def remove_users_from_account(
+        self,
+        account: AccountIdentified,
+        users: List[UserIdentified],
+        timeout: float or None = None,
+    ) -> Future:
+        return self.submit(
+            self.client.remove_users_from_account, account, users, timeout
+        )
+
+    def link(
+        self, user: UserIdentified, device_id: str, timeout: float or None = None
+    ) -> Future:
+        return self.submit(self.client.link, user, device_id, timeout)
+
+    def get_tracking_snippet(
+        self, domain: str, timeout: float or None = None
+    ) -> Future:
+        return self.submit(self.client.get_tracking_snippet, domain, timeout)
+
+    def get_api_key_details(self, timeout: float or None = None) -> Future:
+        return self.submit(self.client.get_api_key_details, timeout)
+
+    def close(self, wait: bool = True):
+        """
+        Shuts the pool down after the submitted calls, unless the executor was passed in.
+        """
+        if self.__owns_executor:
+            self.executor.shutdown(wait=wait)
+            atexit.unregister(self.close)
+
+    def _after_fork(self):
+        # The worker threads of the pool do not exist in the child. An executor that was passed in is left alone.
+        if self.__owns_executor:
+            self.executor = self.__new_executor()
+        self.__reset()
+
+    def __str__(self):
+        return f"FutureClient({self.client}, {self.pending})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def gather(
+    futures: Iterable[Future],
+    timeout: float or None = None,
+    return_exceptions: bool = False,
+) -> list:
+    """
+    Waits for the futures and returns their results in the given order.
+    An exception of a future is raised, or returned in its place when return_exceptions is set.
+    Raises concurrent.futures.TimeoutError when the results are not all there within timeout seconds.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    results = []
+    for future in list(futures):
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if return_exceptions:
+            exception = future.exception(remaining)
+            results.append(exception if exception is not None else future.result())
+        else:
+            results.append(future.result(remaining))
+    return results
+
+
+def all_succeeded(results: Iterable) -> bool:
+    """
+    Returns whether every result of gather is a Success.
+    """
+    return all(isinstance(result, Success) for result in results)
@@ -0,0 +1,230 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import List, Tuple
+
+from .process import register_after_fork
+from .utils import assert_journy
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+SPAN_TIMINGS = ("duration", "serialization", "queueing", "connect", "ttfb", "network")
+
+
+class Span(object):
+    """
+    Timings of one Client call, in seconds. The network timings are the ones of the last attempt,
+    connect and ttfb are None when the HttpClient does not report them.
+    error is the APIError of a Failure or the raised JournyException, None for a Success.
+    """
+
+    __slots__ = (
+        "endpoint",
+        "started_at",
+        "serialization",
+        "queueing",
+        "backoff",
+        "retries",
+        "connect",
+        "ttfb",
+        "network",
+        "response_size",
+        "status_code",
+        "calls_remaining",
+        "error",
+        "duration",
+    )
+
+    def __init__(self, endpoint: str, serialization: float = 0.0):
+        self.endpoint = endpoint
+        self.started_at = time.perf_counter()
+        self.serialization = serialization
+        self.queueing = 0.0
+        self.backoff = 0.0
+        self.retries = 0
+        self.connect = None
+        self.ttfb = None
+        self.network = None
+        self.response_size = None
+        self.status_code = None
+        self.calls_remaining = None
+        self.error = None
+        self.duration = None
+
+    def __str__(self):
+        return f"Span({self.endpoint}, {self.status_code}, {self.duration}, {self.retries}, {self.error})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class Hooks:
+    """
+    Interface for observers of Client calls, registered with Config(hooks=[...]).
+    on_span is called once per call, on the thread that made it. Exceptions raised by hooks are ignored.
+    """
+
+    def on_span(self, span: Span):
+        pass
+
+
+_serialization = threading.local()
+
+
+def record_serialization(seconds: float):
+    _serialization.seconds = seconds
+
+
+def take_serialization() -> float:
+    seconds = getattr(_serialization, "seconds", 0.0)
+    _serialization.seconds = 0.0
+    return seconds
+
+
+class TimedBodyEncoder(object):
+    """
+    Wraps a BodyEncoder and records how long every encoding took, so the next span of the thread can report it.
+    Only used when hooks are registered.
+    """
+
+    def __init__(self, encoder):
+        self.encoder = encoder
+
+    def __getattr__(self, name: str):
+        encode = getattr(self.encoder, name)
+
+        def timed(*args):
+            started = time.perf_counter()
+            body = encode(*args)
+            record_serialization(time.perf_counter() - started)
+            return body
+
+        return timed
+
+
+class Histogram(object):
+    """
+    Cumulative histogram with fixed bucket upper bounds, the last bucket counts everything above the largest bound.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        assert_journy(
+            len(buckets) > 0 and list(buckets) == sorted(buckets),
+            "The buckets are not an ascending sequence of bounds.",
+        )
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float or None:
+        """
+        Estimates the q-quantile by interpolating linearly within its bucket.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def __str__(self):
+        return f"Histogram({self.count}, {self.sum})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class HistogramCollector(Hooks):
+    """
+    Keeps a latency histogram per endpoint for every timing of the spans, and counts calls and errors per endpoint.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        assert_journy(
+            len(buckets) > 0 and list(buckets) == sorted(buckets),
+            "The buckets are not an ascending sequence of bounds.",
+        )
+        self.buckets = tuple(buckets)
+        self.calls = {}
+        self.errors = {}
+        self.retries = {}
+        self.__histograms = {}
+        self.__lock = threading.Lock()
+        register_after_fork(self)
+
+    def on_span(self, span: Span):
+        with self.__lock:
+            self.calls[span.endpoint] = self.calls.get(span.endpoint, 0) + 1
+            self.retries[span.endpoint] = (
+                self.retries.get(span.endpoint, 0) + span.retries
+            )
+            if span.error is not None:
+                self.errors[span.endpoint] = self.errors.get(span.endpoint, 0) + 1
+            for timing in SPAN_TIMINGS:
+                value = getattr(span, timing)
+                if value is None:
+                    continue
+                histogram = self.__histograms.get((span.endpoint, timing))
+                if histogram is None:
+                    histogram = Histogram(self.buckets)
+                    self.__histograms[(span.endpoint, timing)] = histogram
+                histogram.observe(value)
+
+    def histogram(self, endpoint: str, timing: str = "duration") -> Histogram or None:
+        return self.__histograms.get((endpoint, timing))
+
+    @property
+    def endpoints(self) -> List[str]:
+        return sorted(self.calls)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the count, mean and p50/p90/p99 of every timing per endpoint.
+        """
+        with self.__lock:
+            snapshot = {}
+            for (endpoint, timing), histogram in sorted(self.__histograms.items()):
+                snapshot.setdefault(endpoint, {})[timing] = {
+                    "count": histogram.count,
+                    "mean": histogram.sum / histogram.count,
+                    "p50": histogram.quantile(0.5),
+                    "p90": histogram.quantile(0.9),
+                    "p99": histogram.quantile(0.99),
+                }
+            return snapshot
+
+    def _after_fork(self):
+        self.__lock = threading.Lock()
+
+    def __str__(self):
+        return f"HistogramCollector({self.endpoints})"
+
+    def __repr__(self):
+        return self.__str__()
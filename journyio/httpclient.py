@@ -1,10 +1,34 @@
+import asyncio
+import http.cookiejar
 import json
+import threading
+import time
 from collections import defaultdict
 from enum import Enum
 
 import requests
+import requests.adapters
+import urllib3.connection
+import urllib3.connectionpool
 
-from .utils import JournyException, assert_journy
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from .codec import JsonCodec, default_codec
+from .compression import RequestCompression
+from .process import register_after_fork
+from .utils import JournyException, JournyTimeoutException, assert_journy
+
+# Default timeouts of the HttpClients in seconds, so a stuck connection can not block a call forever.
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 30.0
 
 
 class Method(Enum):
@@ -46,6 +70,32 @@ class HttpHeaders(dict):
         return self.__str__()
 
 
+class ResponseHeaders(HttpHeaders):
+    """
+    Read-only view of the headers of a response, backed by the case-insensitive mapping of the underlying HTTP
+    library (e.g. requests.structures.CaseInsensitiveDict). Headers are looked up on access instead of being copied.
+    """
+
+    def __init__(self, headers):
+        dict.__init__(self)
+        self.__headers = headers
+
+    def __getitem__(self, key: str):
+        assert_journy(isinstance(key, str), "The key is not a string.")
+
+        return self.__headers.get(key.strip())
+
+    def __setitem__(self, key: str, value: str or list):
+        raise JournyException("The response headers are read-only.")
+
+    def union(self, other):
+        raise JournyException("The response headers are read-only.")
+
+    @property
+    def headers(self) -> dict:
+        return {key.lower(): value for key, value in self.__headers.items()}
+
+
 class HttpRequest(object):
     def __init__(
         self,
@@ -53,6 +103,7 @@ class HttpRequest(object):
         method: Method = Method.GET,
         headers: HttpHeaders or None = None,
         body=None,
+        timeout: float or None = None,
     ):
         if headers is None:
             headers = HttpHeaders()
@@ -62,11 +113,31 @@ class HttpRequest(object):
         assert_journy(
             isinstance(headers, HttpHeaders), "The headers is not a HttpHeaders object."
         )
+        if timeout is not None:
+            assert_journy(
+                isinstance(timeout, (int, float)) and timeout > 0,
+                "The timeout is not a positive number.",
+            )
 
         self.url = url
         self.method = method
         self.headers = headers
         self.body = body
+        # Seconds the HttpClient may spend on the request at most, set by the Client from the timeout of the call.
+        self.timeout = timeout
+
+    @classmethod
+    def _unchecked(cls, url: str, method: Method, headers: HttpHeaders, body=None):
+        """
+        Creates a request without validating the arguments, for callers that already did.
+        """
+        request = cls.__new__(cls)
+        request.url = url
+        request.method = method
+        request.headers = headers
+        request.body = body
+        request.timeout = None
+        return request
 
     def __str__(self):
         return f"HttpRequest({self.url}, {self.method}, {self.headers}, {self.body})"
@@ -75,9 +146,40 @@ class HttpRequest(object):
         return self.__str__()
 
 
+class NetworkTiming(object):
+    """
+    Network timings of a request in seconds, as reported by the HttpClient.
+    connect is None when an idle pooled connection was reused, ttfb is the time until the response headers arrived.
+    """
+
+    __slots__ = ("connect", "ttfb", "total", "response_size")
+
+    def __init__(
+        self,
+        connect: float or None,
+        ttfb: float or None,
+        total: float,
+        response_size: int or None,
+    ):
+        self.connect = connect
+        self.ttfb = ttfb
+        self.total = total
+        self.response_size = response_size
+
+    def __str__(self):
+        return f"NetworkTiming({self.connect}, {self.ttfb}, {self.total}, {self.response_size})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
 class HttpResponse(object):
     def __init__(
-        self, status_code: int = 200, headers: HttpHeaders or None = None, body=None
+        self,
+        status_code: int = 200,
+        headers: HttpHeaders or None = None,
+        body=None,
+        timing: NetworkTiming or None = None,
     ):
         if headers is None:
             headers = HttpHeaders()
@@ -94,6 +196,21 @@ class HttpResponse(object):
         self.status_code = status_code
         self.headers = headers
         self.body = body
+        self.timing = timing
+
+    @classmethod
+    def _unchecked(
+        cls, status_code: int, headers: HttpHeaders, body, timing: NetworkTiming
+    ):
+        """
+        Creates a response without validating the arguments, for HttpClients that already did.
+        """
+        response = cls.__new__(cls)
+        response.status_code = status_code
+        response.headers = headers
+        response.body = body
+        response.timing = timing
+        return response
 
     def __str__(self):
         return f"HttpResponse({self.status_code}, {self.headers}, {self.body})"
@@ -102,6 +219,28 @@ class HttpResponse(object):
         return self.__str__()
 
 
+def _http_response(
+    status_code: int, headers, content: bytes, timing: NetworkTiming, codec: JsonCodec
+) -> HttpResponse:
+    """
+    Builds the HttpResponse of an HttpClient from the status, the case-insensitive header mapping and the raw body.
+    The body is parsed straight from the bytes, 204 and other empty responses are not parsed at all.
+    """
+    body = codec.loads(content) if content and status_code != 204 else None
+    return HttpResponse._unchecked(status_code, ResponseHeaders(headers), body, timing)
+
+
+def _within(timeout: float or None, budget: float or None) -> float or None:
+    """
+    The shorter of a timeout of the HttpClient and the timeout of a request, None means no limit.
+    """
+    if budget is None:
+        return timeout
+    if timeout is None:
+        return budget
+    return min(timeout, budget)
+
+
 class HttpClient:
     """
     Interface for a HttpClient
@@ -111,40 +250,194 @@ class HttpClient:
         pass
 
 
+class AsyncHttpClient:
+    """
+    Interface for an asynchronous HttpClient
+    """
+
+    async def send(self, request: HttpRequest):
+        pass
+
+
+_connect_time = threading.local()
+
+
+def _take_connect_time() -> float or None:
+    seconds = getattr(_connect_time, "seconds", None)
+    _connect_time.seconds = None
+    return seconds
+
+
+class _TimedHTTPConnection(urllib3.connection.HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_time.seconds = time.perf_counter() - started
+
+
+class _TimedHTTPSConnection(urllib3.connection.HTTPSConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_time.seconds = time.perf_counter() - started
+
+
+class _TimedHTTPConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(urllib3.connectionpool.HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
 class HttpClientRequests(HttpClient):
-    def __init__(self):
-        self.methods = {
-            Method.GET: requests.get,
-            Method.POST: requests.post,
-            Method.PUT: requests.put,
-            Method.DELETE: requests.delete,
-            Method.HEAD: requests.head,
-            Method.PATCH: requests.patch,
+    """
+    HttpClient implementation using a pooled keep-alive requests.Session.
+    One session (and thus one connection pool per host) is kept per client, an instance can be shared across threads.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        connect_timeout: float or None = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float or None = DEFAULT_READ_TIMEOUT,
+        codec: JsonCodec or None = None,
+        compression: RequestCompression or None = None,
+    ):
+        if codec is None:
+            codec = default_codec()
+        assert_journy(
+            isinstance(codec, JsonCodec), "The codec is not a JsonCodec object."
+        )
+        if compression is not None:
+            assert_journy(
+                isinstance(compression, RequestCompression),
+                "The compression is not a RequestCompression object.",
+            )
+        assert_journy(
+            isinstance(pool_connections, int) and pool_connections > 0,
+            "The pool_connections is not a positive int.",
+        )
+        assert_journy(
+            isinstance(pool_maxsize, int) and pool_maxsize > 0,
+            "The pool_maxsize is not a positive int.",
+        )
+        if connect_timeout is not None:
+            assert_journy(
+                isinstance(connect_timeout, (int, float)) and connect_timeout > 0,
+                "The connect_timeout is not a positive number.",
+            )
+        if read_timeout is not None:
+            assert_journy(
+                isinstance(read_timeout, (int, float)) and read_timeout > 0,
+                "The read_timeout is not a positive number.",
+            )
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = (connect_timeout, read_timeout)
+        self.codec = codec
+        self.compression = compression
+        self.__session = None
+        self.__lock = threading.Lock()
+        register_after_fork(self)
+
+    def __create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        # Time new connections, so responses can report how long connecting took.
+        adapter.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
         }
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # Cookies are the only mutable per-session state, rejecting them keeps the session safe to share.
+        session.cookies.set_policy(
+            http.cookiejar.DefaultCookiePolicy(allowed_domains=[])
+        )
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        session = self.__session
+        if session is None:
+            with self.__lock:
+                if self.__session is None:
+                    self.__session = self.__create_session()
+                session = self.__session
+        return session
 
     def send(self, request: HttpRequest):
         assert_journy(
             isinstance(request, HttpRequest),
             "The request is not an HttpRequest object.",
         )
+        assert_journy(
+            isinstance(request.method, Method), "The method is not an Method object."
+        )
 
-        method = self.methods[request.method]
-        if not method:
-            raise JournyException("No correct method was given.")
         try:
-            response = method(
-                request.url, headers=request.headers.headers, data=request.body
+            headers, body = request.headers.headers, request.body
+            if self.compression is not None:
+                headers, body = self.compression.apply(headers, body)
+            _connect_time.seconds = None
+            started = time.perf_counter()
+            timeout = self.timeout
+            if request.timeout is not None:
+                timeout = (
+                    _within(timeout[0], request.timeout),
+                    _within(timeout[1], request.timeout),
+                )
+            response = self.session.request(
+                request.method.name,
+                request.url,
+                headers=headers,
+                data=body,
+                timeout=timeout,
             )
-            headers = HttpHeaders()
-            for header in response.headers:
-                headers[header] = response.headers[header]
-            return HttpResponse(
-                response.status_code, headers, json.loads(response.text)
+            content = response.content
+            timing = NetworkTiming(
+                _take_connect_time(),
+                response.elapsed.total_seconds(),
+                time.perf_counter() - started,
+                len(content),
+            )
+            return _http_response(
+                response.status_code, response.headers, content, timing, self.codec
             )
-        except:
+        except requests.Timeout as e:
+            raise JournyTimeoutException("The API request timed out.") from e
+        except Exception as e:
             raise JournyException(
                 "An unknown error has occurred while performing the API request."
-            )
+            ) from e
+
+    def close(self):
+        with self.__lock:
+            session, self.__session = self.__session, None
+        if session is not None:
+            session.close()
+
+    def _after_fork(self):
+        # The pooled connections belong to the parent, the child opens its own.
+        self.__session = None
+        self.__lock = threading.Lock()
 
     def __str__(self):
         return f"HttpClient()"
@@ -153,6 +446,152 @@ class HttpClientRequests(HttpClient):
         return self.__str__()
 
 
+class _HttpxTrace(object):
+    """
+    Collects the connect time and time to first byte of one httpx request from its trace events.
+    """
+
+    __slots__ = ("started", "connect_started", "connect", "ttfb")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.connect_started = None
+        self.connect = None
+        self.ttfb = None
+
+    async def __call__(self, event_name: str, info: dict):
+        now = time.perf_counter()
+        if event_name == "connection.connect_tcp.started":
+            self.connect_started = now
+        elif event_name in (
+            "connection.connect_tcp.complete",
+            "connection.start_tls.complete",
+        ):
+            self.connect = now - self.connect_started
+        elif event_name.endswith(".receive_response_headers.complete"):
+            self.ttfb = now - self.started
+
+    def response(self, response, codec: JsonCodec) -> HttpResponse:
+        content = response.content
+        timing = NetworkTiming(
+            self.connect, self.ttfb, time.perf_counter() - self.started, len(content)
+        )
+        return _http_response(
+            response.status_code, response.headers, content, timing, codec
+        )
+
+
+def _httpx_options(
+    http1: bool,
+    http2: bool,
+    max_connections: int,
+    connect_timeout: float or None,
+    read_timeout: float or None,
+) -> dict:
+    assert_journy(httpx is not None, "The httpx package is required for this client.")
+    assert_journy(http1 or http2, "Either http1 or http2 has to be enabled.")
+    assert_journy(
+        isinstance(max_connections, int) and max_connections > 0,
+        "The max_connections is not a positive int.",
+    )
+    return {
+        "http1": http1,
+        "http2": http2,
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+        "timeout": httpx.Timeout(None, connect=connect_timeout, read=read_timeout),
+    }
+
+
+class HttpClientHttpx(HttpClient):
+    """
+    HttpClient implementation that multiplexes the concurrent requests of all threads over a few HTTP/2 connections.
+    The requests run on an AsyncHttpClientHttpx in a background event loop thread, because the synchronous
+    httpx.Client can send the streams of concurrent threads out of order. Set http1=False to use HTTP/2 without
+    negotiation, which is needed for servers without TLS. Requires the httpx package with HTTP/2 support (httpx[http2]).
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        http1: bool = True,
+        max_connections: int = 10,
+        connect_timeout: float or None = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float or None = DEFAULT_READ_TIMEOUT,
+        codec: JsonCodec or None = None,
+        compression: RequestCompression or None = None,
+    ):
+        self.client = AsyncHttpClientHttpx(
+            http2,
+            http1,
+            max_connections,
+            connect_timeout,
+            read_timeout,
+            codec,
+            compression,
+        )
+        self.__loop = None
+        self.__thread = None
+        self.__lock = threading.Lock()
+        register_after_fork(self)
+
+    @property
+    def codec(self) -> JsonCodec:
+        return self.client.codec
+
+    @property
+    def compression(self) -> RequestCompression or None:
+        return self.client.compression
+
+    def __get_loop(self) -> asyncio.AbstractEventLoop:
+        loop = self.__loop
+        if loop is None:
+            with self.__lock:
+                if self.__loop is None:
+                    loop = asyncio.new_event_loop()
+                    self.__thread = threading.Thread(
+                        target=loop.run_forever, name="journyio-httpx", daemon=True
+                    )
+                    self.__thread.start()
+                    self.__loop = loop
+                loop = self.__loop
+        return loop
+
+    def send(self, request: HttpRequest):
+        assert_journy(
+            isinstance(request, HttpRequest),
+            "The request is not an HttpRequest object.",
+        )
+
+        return asyncio.run_coroutine_threadsafe(
+            self.client.send(request), self.__get_loop()
+        ).result()
+
+    def close(self):
+        with self.__lock:
+            loop, self.__loop = self.__loop, None
+            thread, self.__thread = self.__thread, None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self.client.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def _after_fork(self):
+        # The event loop thread does not exist in the child, a new one is started on the next request.
+        self.__loop = None
+        self.__thread = None
+        self.__lock = threading.Lock()
+
+    def __str__(self):
+        return f"HttpClientHttpx({self.client.options['http2']})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
 class HttpClientTesting(HttpClient):
     def __init__(self, dummy_response: HttpResponse):
         self.dummy_response = dummy_response
@@ -180,3 +619,266 @@ class HttpClientTesting(HttpClient):
 
     def __repr__(self):
         return self.__str__()
+
+
+class AsyncHttpClientAiohttp(AsyncHttpClient):
+    """
+    AsyncHttpClient implementation using a pooled aiohttp.ClientSession.
+    At most max_concurrency requests are in flight at the same time, further requests wait for a free slot.
+    The session is bound to the event loop it is first used in. Requires the aiohttp package.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 100,
+        pool_maxsize: int = 100,
+        keepalive_timeout: float = 15,
+        connect_timeout: float or None = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float or None = DEFAULT_READ_TIMEOUT,
+        codec: JsonCodec or None = None,
+        compression: RequestCompression or None = None,
+    ):
+        if codec is None:
+            codec = default_codec()
+        assert_journy(
+            isinstance(codec, JsonCodec), "The codec is not a JsonCodec object."
+        )
+        if compression is not None:
+            assert_journy(
+                isinstance(compression, RequestCompression),
+                "The compression is not a RequestCompression object.",
+            )
+        assert_journy(
+            aiohttp is not None, "The aiohttp package is required for this client."
+        )
+        assert_journy(
+            isinstance(max_concurrency, int) and max_concurrency > 0,
+            "The max_concurrency is not a positive int.",
+        )
+        assert_journy(
+            isinstance(pool_maxsize, int) and pool_maxsize > 0,
+            "The pool_maxsize is not a positive int.",
+        )
+
+        self.max_concurrency = max_concurrency
+        self.pool_maxsize = pool_maxsize
+        self.keepalive_timeout = keepalive_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.codec = codec
+        self.compression = compression
+        self.__session = None
+        self.__semaphore = None
+        register_after_fork(self)
+
+    def __get_session(self):
+        if self.__session is None or self.__session.closed:
+            self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+            self.__session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_maxsize, keepalive_timeout=self.keepalive_timeout
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    connect=self.connect_timeout, sock_read=self.read_timeout
+                ),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                trace_configs=[self.__trace_config()],
+            )
+        return self.__session
+
+    def __timeout(self, session, budget: float or None):
+        if budget is None:
+            return session.timeout
+        return aiohttp.ClientTimeout(
+            total=budget,
+            connect=_within(self.connect_timeout, budget),
+            sock_read=_within(self.read_timeout, budget),
+        )
+
+    @staticmethod
+    def __trace_config():
+        async def on_connection_create_start(session, context, params):
+            context.connect_started = time.perf_counter()
+
+        async def on_connection_create_end(session, context, params):
+            context.trace_request_ctx["connect"] = (
+                time.perf_counter() - context.connect_started
+            )
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        return trace_config
+
+    async def send(self, request: HttpRequest):
+        assert_journy(
+            isinstance(request, HttpRequest),
+            "The request is not an HttpRequest object.",
+        )
+        assert_journy(
+            isinstance(request.method, Method), "The method is not an Method object."
+        )
+
+        session = self.__get_session()
+        try:
+            headers, body = request.headers.headers, request.body
+            if self.compression is not None:
+                headers, body = self.compression.apply(headers, body)
+            async with self.__semaphore:
+                trace = {"connect": None}
+                started = time.perf_counter()
+                async with session.request(
+                    request.method.name,
+                    request.url,
+                    headers=headers,
+                    data=body,
+                    timeout=self.__timeout(session, request.timeout),
+                    trace_request_ctx=trace,
+                ) as response:
+                    ttfb = time.perf_counter() - started
+                    content = await response.read()
+                timing = NetworkTiming(
+                    trace["connect"], ttfb, time.perf_counter() - started, len(content)
+                )
+            return _http_response(
+                response.status, response.headers, content, timing, self.codec
+            )
+        except asyncio.TimeoutError as e:
+            raise JournyTimeoutException("The API request timed out.") from e
+        except Exception as e:
+            raise JournyException(
+                "An unknown error has occurred while performing the API request."
+            ) from e
+
+    async def close(self):
+        session, self.__session = self.__session, None
+        if session is not None:
+            await session.close()
+
+    def _after_fork(self):
+        self.__session = None
+        self.__semaphore = None
+
+    def __str__(self):
+        return f"AsyncHttpClient()"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class AsyncHttpClientHttpx(AsyncHttpClient):
+    """
+    AsyncHttpClient implementation using a httpx.AsyncClient, which multiplexes concurrent requests over
+    a few HTTP/2 connections when the server supports it. The client is bound to the event loop it is first used in.
+    Requires the httpx package with HTTP/2 support (httpx[http2]).
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        http1: bool = True,
+        max_connections: int = 10,
+        connect_timeout: float or None = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float or None = DEFAULT_READ_TIMEOUT,
+        codec: JsonCodec or None = None,
+        compression: RequestCompression or None = None,
+    ):
+        if codec is None:
+            codec = default_codec()
+        assert_journy(
+            isinstance(codec, JsonCodec), "The codec is not a JsonCodec object."
+        )
+        if compression is not None:
+            assert_journy(
+                isinstance(compression, RequestCompression),
+                "The compression is not a RequestCompression object.",
+            )
+        self.options = _httpx_options(
+            http1, http2, max_connections, connect_timeout, read_timeout
+        )
+        self.codec = codec
+        self.compression = compression
+        self.__client = None
+        register_after_fork(self)
+
+    def __timeout(self, budget: float or None):
+        if budget is None:
+            return httpx.USE_CLIENT_DEFAULT
+        timeout = self.options["timeout"]
+        return httpx.Timeout(
+            budget,
+            connect=_within(timeout.connect, budget),
+            read=_within(timeout.read, budget),
+        )
+
+    def __get_client(self):
+        if self.__client is None or self.__client.is_closed:
+            self.__client = httpx.AsyncClient(**self.options)
+        return self.__client
+
+    async def send(self, request: HttpRequest):
+        assert_journy(
+            isinstance(request, HttpRequest),
+            "The request is not an HttpRequest object.",
+        )
+        assert_journy(
+            isinstance(request.method, Method), "The method is not an Method object."
+        )
+
+        client = self.__get_client()
+        try:
+            headers, body = request.headers.headers, request.body
+            if self.compression is not None:
+                headers, body = self.compression.apply(headers, body)
+            trace = _HttpxTrace()
+            response = await client.request(
+                request.method.name,
+                request.url,
+                headers=headers,
+                content=body,
+                timeout=self.__timeout(request.timeout),
+                extensions={"trace": trace},
+            )
+            return trace.response(response, self.codec)
+        except httpx.TimeoutException as e:
+            raise JournyTimeoutException("The API request timed out.") from e
+        except Exception as e:
+            raise JournyException(
+                "An unknown error has occurred while performing the API request."
+            ) from e
+
+    async def close(self):
+        client, self.__client = self.__client, None
+        if client is not None:
+            await client.aclose()
+
+    def _after_fork(self):
+        self.__client = None
+
+    def __str__(self):
+        return f"AsyncHttpClientHttpx({self.options['http2']})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class AsyncHttpClientTesting(AsyncHttpClient):
+    def __init__(self, dummy_response: HttpResponse):
+        self.client = HttpClientTesting(dummy_response)
+
+    @property
+    def dummy_response(self):
+        return self.client.dummy_response
+
+    @property
+    def received_request(self):
+        return self.client.received_request
+
+    async def send(self, request: HttpRequest):
+        return self.client.send(request)
+
+    def __str__(self):
+        return f"AsyncHttpClientTesting({self.dummy_response}, {self.received_request})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,264 @@
+import csv
+import json
+import os
+import time
+from enum import Enum
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+
+from .account_identified import AccountIdentified
+from .client import AsyncClient, Client, Properties
+from .results import Skipped, Success
+from .user_identified import UserIdentified
+from .utils import JournyException, assert_journy
+
+
+class ImportKind(Enum):
+    USERS = 1
+    ACCOUNTS = 2
+
+
+class ImportProgress(object):
+    """
+    Counts of an import, passed to on_progress after every chunk and returned when the import is done.
+    offset is the number of records of the file that are handled, which is where a resumed import starts.
+    """
+
+    def __init__(self, offset: int = 0):
+        self.started_at = time.monotonic()
+        self.offset = offset
+        self.sent = 0
+        self.skipped = 0
+        self.failed = 0
+        self.invalid = 0
+
+    @property
+    def handled(self) -> int:
+        return self.sent + self.skipped + self.failed + self.invalid
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def records_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.handled / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self):
+        return (
+            f"ImportProgress({self.offset}, {self.sent}, {self.skipped}, {self.failed}, {self.invalid}, "
+            f"{self.records_per_second:.1f}/s)"
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def read_jsonl(path: str, offset: int = 0) -> Iterator[dict or None]:
+    """
+    Lazily reads the JSON objects of a JSONL file, one per line, starting after offset lines.
+    Yields None for lines that are empty or not a JSON object, so offsets keep matching line numbers.
+    """
+    with open(path, encoding="utf-8") as file:
+        for line in islice(file, offset, None):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield record if isinstance(record, dict) else None
+
+
+def read_csv(path: str, offset: int = 0) -> Iterator[dict]:
+    """
+    Lazily reads the rows of a CSV file with a header row as dicts, starting after offset rows.
+    Empty cells are left out, so they do not overwrite existing properties.
+    """
+    with open(path, encoding="utf-8", newline="") as file:
+        for row in islice(csv.DictReader(file), offset, None):
+            yield {
+                key: value
+                for key, value in row.items()
+                if key and value not in ("", None)
+            }
+
+
+def read_records(path: str, offset: int = 0, file_format: str or None = None):
+    """
+    Reads a CSV or JSONL file, the format is derived from the extension when file_format is not given.
+    """
+    if file_format is None:
+        extension = os.path.splitext(path)[1].lower()
+        file_format = "csv" if extension == ".csv" else "jsonl"
+    assert_journy(
+        file_format in ("csv", "jsonl"), "The file format is not csv or jsonl."
+    )
+    if file_format == "csv":
+        return read_csv(path, offset)
+    return read_jsonl(path, offset)
+
+
+class BulkImporter(object):
+    """
+    Streams records from a file to upsert_users or upsert_accounts in chunks of chunk_size records,
+    sending up to parallelism requests at the same time.
+    The identification is read from id_column and secondary_column (email for users, domain for accounts).
+    The properties are the property_columns, or every other column when they are not given.
+    With a checkpoint_path the offset is stored after every chunk, so an interrupted import resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        kind: ImportKind = ImportKind.USERS,
+        id_column: str or None = None,
+        secondary_column: str or None = None,
+        property_columns: List[str] or None = None,
+        chunk_size: int = 1000,
+        parallelism: int = 8,
+        checkpoint_path: str or None = None,
+        on_progress=None,
+    ):
+        assert_journy(
+            isinstance(client, Client) and not isinstance(client, AsyncClient),
+            "The client is not a synchronous Client object.",
+        )
+        assert_journy(
+            isinstance(kind, ImportKind), "The kind is not an ImportKind object."
+        )
+        if id_column is None:
+            id_column = "user_id" if kind is ImportKind.USERS else "account_id"
+        if secondary_column is None:
+            secondary_column = "email" if kind is ImportKind.USERS else "domain"
+        assert_journy(isinstance(id_column, str), "The id_column is not a string.")
+        assert_journy(
+            isinstance(secondary_column, str), "The secondary_column is not a string."
+        )
+        if property_columns is not None:
+            assert_journy(
+                isinstance(property_columns, list)
+                and all(isinstance(column, str) for column in property_columns),
+                "The property_columns is not a list of strings.",
+            )
+        assert_journy(
+            isinstance(chunk_size, int) and chunk_size > 0,
+            "The chunk_size is not a positive int.",
+        )
+        assert_journy(
+            isinstance(parallelism, int) and parallelism > 0,
+            "The parallelism is not a positive int.",
+        )
+
+        self.client = client
+        self.kind = kind
+        self.id_column = id_column
+        self.secondary_column = secondary_column
+        self.property_columns = property_columns
+        self.chunk_size = chunk_size
+        self.parallelism = parallelism
+        self.checkpoint_path = checkpoint_path
+        self.on_progress = on_progress
+
+    def read_checkpoint(self, path: str) -> int:
+        """
+        Returns the offset stored in the checkpoint for path, or 0 when there is none.
+        """
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path, encoding="utf-8") as file:
+            checkpoint = json.load(file)
+        if checkpoint.get("path") != os.path.abspath(path):
+            raise JournyException(
+                f"The checkpoint {self.checkpoint_path} belongs to {checkpoint.get('path')}."
+            )
+        return checkpoint["offset"]
+
+    def write_checkpoint(self, path: str, offset: int):
+        if self.checkpoint_path is None:
+            return
+        temporary = self.checkpoint_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({"path": os.path.abspath(path), "offset": offset}, file)
+        os.replace(temporary, self.checkpoint_path)
+
+    def import_file(self, path: str, file_format: str or None = None) -> ImportProgress:
+        """
+        Imports the records of a CSV or JSONL file, resuming from the checkpoint when there is one.
+        """
+        offset = self.read_checkpoint(path)
+        return self.import_records(
+            read_records(path, offset, file_format),
+            offset,
+            lambda progress: self.write_checkpoint(path, progress.offset),
+        )
+
+    def import_records(
+        self, records: Iterable[dict or None], offset: int = 0, on_chunk=None
+    ) -> ImportProgress:
+        """
+        Imports the records, offset is the number of records that were handled before.
+        None records are counted as invalid.
+        """
+        progress = ImportProgress(offset)
+        send = (
+            self.client.upsert_users
+            if self.kind is ImportKind.USERS
+            else self.client.upsert_accounts
+        )
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                break
+            entities = []
+            for record in chunk:
+                try:
+                    entities.append(self.to_entity(record))
+                except JournyException:
+                    progress.invalid += 1
+            for result in send(entities, self.parallelism, self.chunk_size):
+                if isinstance(result, Skipped):
+                    progress.skipped += 1
+                elif isinstance(result, Success):
+                    progress.sent += 1
+                else:
+                    progress.failed += 1
+            progress.offset += len(chunk)
+            if on_chunk is not None:
+                on_chunk(progress)
+            if self.on_progress is not None:
+                self.on_progress(progress)
+        return progress
+
+    def to_entity(
+        self, record: dict or None
+    ) -> Tuple[UserIdentified or AccountIdentified, Properties]:
+        """
+        Maps a record to the identification and properties to upsert, raises a JournyException for invalid records.
+        """
+        assert_journy(isinstance(record, dict), "The record is not an object.")
+        identifier = record.get(self.id_column)
+        secondary = record.get(self.secondary_column)
+        identifier = None if identifier in (None, "") else str(identifier)
+        secondary = None if secondary in (None, "") else str(secondary)
+        if self.property_columns is None:
+            properties = Properties.from_dict(
+                {
+                    key: value
+                    for key, value in record.items()
+                    if key != self.id_column and key != self.secondary_column
+                }
+            )
+        else:
+            properties = Properties.from_dict(
+                {key: record[key] for key in self.property_columns if key in record}
+            )
+        if self.kind is ImportKind.USERS:
+            return UserIdentified(identifier, secondary), properties
+        return AccountIdentified(identifier, secondary), properties
+
+    def __str__(self):
+        return f"BulkImporter({self.client}, {self.kind}, {self.chunk_size}, {self.parallelism})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,96 @@
+from collections import OrderedDict
+
+from .background import BackgroundQueue, OverflowPolicy
+from .client import Client
+from .user_identified import UserIdentified
+from .utils import assert_journy
+
+
+class BackgroundLinker(BackgroundQueue):
+    """
+    Links devices to users on background worker threads, so a login does not wait for a round trip to the API.
+    Links remembered by the LinkMemo of the client are skipped right away, and a link that is already queued or being
+    sent is not queued again. When max_queue_size links are queued, the overflow_policy decides what happens with
+    new links. Queued links are sent when the linker is closed, which happens automatically at interpreter exit, for at
+    most exit_timeout seconds.
+    """
+
+    _name = "linker"
+    _item_name = "link"
+
+    def __init__(
+        self,
+        client: Client,
+        max_queue_size: int = 10000,
+        workers: int = 1,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        on_result=None,
+        exit_timeout: float = 5.0,
+    ):
+        self.coalesced = 0
+        super().__init__(
+            client, max_queue_size, workers, overflow_policy, on_result, exit_timeout
+        )
+
+    def _reset(self):
+        self.__sending = set()
+        super()._reset()
+
+    def link(self, user: UserIdentified, device_id: str) -> bool:
+        """
+        Queues the link, returns False if the link was dropped because the queue is full.
+        """
+        assert_journy(
+            isinstance(user, UserIdentified), "The user is not a UserIdentified object."
+        )
+        assert_journy(isinstance(device_id, str), "The device id is not a string.")
+
+        key = self.client._link_key(user, device_id)
+        if key is not None and self.client.config.link_memo.linked(key):
+            return True
+        queue_key = key if key is not None else (device_id, user.user_id, user.email)
+        return self._put((queue_key, user, device_id, key))
+
+    def _new_queue(self):
+        return OrderedDict()
+
+    def _coalesce(self, link: tuple) -> bool:
+        if link[0] in self._queue or link[0] in self.__sending:
+            self.coalesced += 1
+            return True
+        return False
+
+    def _append(self, link: tuple):
+        self._queue[link[0]] = link
+        self._not_empty.notify()
+
+    def _pop_oldest(self):
+        self._queue.popitem(last=False)
+
+    def _take(self) -> list:
+        while not self._queue and not self._closed:
+            self._not_empty.wait()
+        if not self._queue:
+            return []
+        queue_key, link = self._queue.popitem(last=False)
+        self.__sending.add(queue_key)
+        return [link]
+
+    def _send(self, link: tuple, timeout: float or None):
+        _, user, device_id, key = link
+        return self.client._send_link(
+            user, device_id, key, self.client._deadline(timeout)
+        )
+
+    def _report(self, link: tuple, result):
+        self.on_result(link[1], link[2], result)
+
+    def _done(self, links: list):
+        for link in links:
+            self.__sending.discard(link[0])
+
+    def __str__(self):
+        return f"BackgroundLinker({self.client}, {self.queue_size})"
+
+    def __repr__(self):
+        return self.__str__()
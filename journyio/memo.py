@@ -0,0 +1,254 @@
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Tuple
+
+from .account_identified import AccountIdentified
+from .process import register_after_fork
+from .user_identified import UserIdentified
+from .utils import assert_journy
+
+
+def user_keys(user: UserIdentified) -> List[Tuple[str, str]]:
+    keys = []
+    if user.user_id:
+        keys.append(("user_id", user.user_id))
+    if user.email:
+        keys.append(("email", user.email))
+    return keys
+
+
+def account_keys(account: AccountIdentified) -> List[Tuple[str, str]]:
+    keys = []
+    if account.account_id:
+        keys.append(("account_id", account.account_id))
+    if account.domain:
+        keys.append(("domain", account.domain))
+    return keys
+
+
+class UpsertMemo(object):
+    """
+    Remembers a hash of the last successfully sent upsert per identifier, so the client can skip unchanged upserts.
+    At most max_size identifiers are kept, the least recently used ones and the ones older than ttl seconds are
+    forgotten. Deleting a user or account forgets the identifiers of the delete call.
+    """
+
+    def __init__(self, max_size: int = 100000, ttl: float = 86400.0):
+        assert_journy(
+            isinstance(max_size, int) and max_size > 0,
+            "The max_size is not a positive int.",
+        )
+        assert_journy(
+            isinstance(ttl, (int, float)) and ttl > 0,
+            "The ttl is not a positive number.",
+        )
+        self.max_size = max_size
+        self.ttl = ttl
+        self.skipped = 0
+        self.evictions = 0
+        self.__digests = OrderedDict()
+        self.__lock = threading.Lock()
+        register_after_fork(self)
+
+    @property
+    def size(self) -> int:
+        return len(self.__digests)
+
+    @staticmethod
+    def digest(body: str or bytes) -> bytes:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return hashlib.blake2b(body, digest_size=8).digest()
+
+    def unchanged(self, keys: List[tuple], digest: bytes) -> bool:
+        """
+        Returns True, and counts a skipped upsert, if every identifier was last sent with this digest.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            for key in keys:
+                entry = self.__digests.get(key)
+                if entry is None or entry[1] != digest:
+                    return False
+                if entry[0] <= now:
+                    del self.__digests[key]
+                    return False
+            for key in keys:
+                self.__digests.move_to_end(key)
+            self.skipped += 1
+            return True
+
+    def remember(self, keys: List[tuple], digest: bytes):
+        entry = (time.monotonic() + self.ttl, digest)
+        with self.__lock:
+            for key in keys:
+                self.__digests[key] = entry
+                self.__digests.move_to_end(key)
+            while len(self.__digests) > self.max_size:
+                self.__digests.popitem(last=False)
+                self.evictions += 1
+
+    def forget(self, keys: List[tuple]):
+        with self.__lock:
+            for key in keys:
+                self.__digests.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__digests.clear()
+
+    def _after_fork(self):
+        self.__lock = threading.Lock()
+
+    def __str__(self):
+        return f"UpsertMemo({self.max_size}, {self.ttl}, {self.size})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class LinkMemo(object):
+    """
+    Remembers the device ids that were recently linked to a user, so the client can skip linking them again.
+    Links are kept as 16 byte digests of the device id and the identification of the user, for at most ttl seconds.
+    At most max_size links are kept, the least recently used ones are forgotten first. The links are indexed by digests
+    of the identifiers of the user, so deleting a user forgets only the links of that user.
+    """
+
+    # A digest, the time it expires at and the digests of the user, plus the index entries of the user.
+    # The slots in the tables are counted by sys.getsizeof of the tables themselves.
+    ENTRY_BYTES = (
+        sys.getsizeof(bytes(16))
+        + sys.getsizeof(0.0)
+        + sys.getsizeof((0.0, ()))
+        + sys.getsizeof((bytes(16), bytes(16)))
+        + 2 * (sys.getsizeof(bytes(16)) + sys.getsizeof([bytes(16)]))
+    )
+
+    def __init__(self, max_size: int = 100000, ttl: float = 86400.0):
+        assert_journy(
+            isinstance(max_size, int) and max_size > 0,
+            "The max_size is not a positive int.",
+        )
+        assert_journy(
+            isinstance(ttl, (int, float)) and ttl > 0,
+            "The ttl is not a positive number.",
+        )
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__links = OrderedDict()
+        self.__users = {}
+        self.__lock = threading.Lock()
+        register_after_fork(self)
+
+    @property
+    def size(self) -> int:
+        return len(self.__links)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def memory_bytes(self) -> int:
+        """
+        The approximate number of bytes the remembered links take.
+        """
+        with self.__lock:
+            return (
+                sys.getsizeof(self.__links)
+                + sys.getsizeof(self.__users)
+                + len(self.__links) * self.ENTRY_BYTES
+            )
+
+    @staticmethod
+    def key(user: UserIdentified, device_id: str, scope: str = "") -> bytes:
+        """
+        The scope separates the links of clients that share the memo, e.g. clients of different API keys.
+        """
+        identification = (
+            f"{scope}\0{device_id}\0{user.user_id or ''}\0{user.email or ''}"
+        )
+        return hashlib.blake2b(identification.encode("utf-8"), digest_size=16).digest()
+
+    @staticmethod
+    def identifier_keys(user: UserIdentified, scope: str = "") -> tuple:
+        """
+        The digests of the identifiers of the user, which index the links of the user.
+        """
+        return tuple(
+            hashlib.blake2b(
+                f"{scope}\0{kind}\0{value}".encode("utf-8"), digest_size=16
+            ).digest()
+            for kind, value in user_keys(user)
+        )
+
+    def linked(self, key: bytes) -> bool:
+        """
+        Returns whether the link was sent successfully within ttl seconds, and counts a hit or a miss.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            link = self.__links.get(key)
+            if link is not None and link[0] <= now:
+                self.__delete(key)
+                link = None
+            if link is None:
+                self.misses += 1
+                return False
+            self.__links.move_to_end(key)
+            self.hits += 1
+            return True
+
+    def remember(self, key: bytes, users: tuple = ()):
+        """
+        Remembers the link, users are the identifier_keys of the user it links to.
+        """
+        expires_at = time.monotonic() + self.ttl
+        with self.__lock:
+            if key in self.__links:
+                self.__delete(key)
+            self.__links[key] = (expires_at, users)
+            for user in users:
+                self.__users.setdefault(user, []).append(key)
+            while len(self.__links) > self.max_size:
+                self.__delete(next(iter(self.__links)))
+                self.evictions += 1
+
+    def forget(self, users: tuple):
+        """
+        Forgets the links of the user with these identifier_keys.
+        """
+        with self.__lock:
+            for user in users:
+                for key in list(self.__users.get(user, ())):
+                    self.__delete(key)
+
+    def clear(self):
+        with self.__lock:
+            self.__links.clear()
+            self.__users.clear()
+
+    def __delete(self, key: bytes):
+        _, users = self.__links.pop(key)
+        for user in users:
+            keys = self.__users[user]
+            keys.remove(key)
+            if not keys:
+                del self.__users[user]
+
+    def _after_fork(self):
+        self.__lock = threading.Lock()
+
+    def __str__(self):
+        return f"LinkMemo({self.max_size}, {self.ttl}, {self.size})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,194 @@
+import threading
+from .hooks import DEFAULT_BUCKETS, Histogram, Hooks, Span
+from .process import register_after_fork
+from .utils import APIError, assert_journy
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{escape_label(str(value))}"' for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def format_value(value: int or float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(int(value))
+
+
+class Metrics(Hooks):
+    """
+    Collects request, error, retry and latency metrics of Client calls, and the depth of registered queues.
+    Register it with Config(hooks=[metrics]) and serve render() with CONTENT_TYPE to let Prometheus scrape it.
+    """
+
+    def __init__(self, namespace: str = "journyio", buckets=DEFAULT_BUCKETS):
+        assert_journy(
+            isinstance(namespace, str) and namespace.isidentifier(),
+            "The namespace is not a valid metric name.",
+        )
+        assert_journy(
+            len(buckets) > 0 and list(buckets) == sorted(buckets),
+            "The buckets are not an ascending sequence of bounds.",
+        )
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self.__requests = {}
+        self.__errors = {}
+        self.__retries = {}
+        self.__durations = {}
+        self.__rate_limit_remaining = None
+        self.__gauges = []
+        self.__lock = threading.Lock()
+        register_after_fork(self)
+
+    def on_span(self, span: Span):
+        if isinstance(span.error, APIError):
+            error = span.error.name
+        elif span.error is not None:
+            error = "exception"
+        else:
+            error = None
+        status = str(span.status_code) if span.status_code is not None else "none"
+        with self.__lock:
+            key = (span.endpoint, status)
+            self.__requests[key] = self.__requests.get(key, 0) + 1
+            if error is not None:
+                key = (span.endpoint, error)
+                self.__errors[key] = self.__errors.get(key, 0) + 1
+            if span.retries:
+                self.__retries[span.endpoint] = (
+                    self.__retries.get(span.endpoint, 0) + span.retries
+                )
+            histogram = self.__durations.get(span.endpoint)
+            if histogram is None:
+                histogram = self.__durations[span.endpoint] = Histogram(self.buckets)
+            histogram.observe(span.duration)
+            if span.calls_remaining is not None:
+                self.__rate_limit_remaining = span.calls_remaining
+
+    def register_gauge(self, name: str, help_text: str, value):
+        """
+        Adds a gauge that calls value() on every render, e.g. lambda: tracker.queue_size.
+        """
+        assert_journy(
+            isinstance(name, str) and name.isidentifier(),
+            "The name is not a valid metric name.",
+        )
+        assert_journy(callable(value), "The value is not callable.")
+        with self.__lock:
+            self.__gauges.append((name, help_text, value))
+
+    def watch_queue(self, name: str, queue):
+        """
+        Reports the depth of a BufferedTracker, EventSpool or UpsertCoalescer as <namespace>_<name>_depth.
+        """
+        attributes = [
+            attribute
+            for attribute in ("queue_size", "size", "pending")
+            if hasattr(type(queue), attribute)
+        ]
+        assert_journy(attributes, "The queue has no queue_size, size or pending.")
+        self.register_gauge(
+            f"{name}_depth",
+            f"Number of items waiting in the {name}.",
+            lambda: getattr(queue, attributes[0]),
+        )
+
+    @property
+    def rate_limit_remaining(self) -> int or None:
+        return self.__rate_limit_remaining
+
+    def render(self) -> str:
+        """
+        Renders the metrics in the OpenMetrics text format.
+        """
+        prefix = self.namespace
+        lines = []
+
+        def family(name: str, metric_type: str, help_text: str):
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+
+        def sample(name: str, labels: dict, value):
+            lines.append(
+                f"{prefix}_{name}{format_labels(labels)} {format_value(value)}"
+            )
+
+        with self.__lock:
+            family("requests", "counter", "Client calls by endpoint and status code.")
+            for (endpoint, status), count in sorted(self.__requests.items()):
+                sample(
+                    "requests_total", {"endpoint": endpoint, "status": status}, count
+                )
+
+            family("errors", "counter", "Failed Client calls by endpoint and error.")
+            for (endpoint, error), count in sorted(self.__errors.items()):
+                sample("errors_total", {"endpoint": endpoint, "error": error}, count)
+
+            family("retries", "counter", "Retried requests by endpoint.")
+            for endpoint, count in sorted(self.__retries.items()):
+                sample("retries_total", {"endpoint": endpoint}, count)
+
+            family(
+                "request_duration_seconds",
+                "histogram",
+                "Duration of Client calls, including retries.",
+            )
+            for endpoint, histogram in sorted(self.__durations.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram.counts):
+                    cumulative += count
+                    sample(
+                        "request_duration_seconds_bucket",
+                        {"endpoint": endpoint, "le": format_value(float(bound))},
+                        cumulative,
+                    )
+                sample(
+                    "request_duration_seconds_bucket",
+                    {"endpoint": endpoint, "le": "+Inf"},
+                    histogram.count,
+                )
+                sample(
+                    "request_duration_seconds_count",
+                    {"endpoint": endpoint},
+                    histogram.count,
+                )
+                sample(
+                    "request_duration_seconds_sum",
+                    {"endpoint": endpoint},
+                    histogram.sum,
+                )
+
+            family(
+                "rate_limit_remaining",
+                "gauge",
+                "Last seen X-RateLimit-Remaining of the API.",
+            )
+            if self.__rate_limit_remaining is not None:
+                sample("rate_limit_remaining", {}, self.__rate_limit_remaining)
+
+            gauges = list(self.__gauges)
+
+        for name, help_text, value in gauges:
+            family(name, "gauge", help_text)
+            sample(name, {}, value())
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _after_fork(self):
+        self.__lock = threading.Lock()
+
+    def __str__(self):
+        return f"Metrics({self.namespace})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,117 @@
+import itertools
+import os
+import threading
+import weakref
+
+from .utils import assert_journy
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# File locks, and with that FileLock, are only available on POSIX systems.
+HAS_FILE_LOCKS = fcntl is not None
+
+# Python 3.6 has no os.register_at_fork, instances are not rebuilt after a fork there.
+HAS_AFTER_FORK = hasattr(os, "register_at_fork")
+
+_after_fork = {}
+_after_fork_keys = itertools.count()
+
+
+def register_after_fork(instance):
+    """
+    Calls instance._after_fork() in the child process after every fork, for as long as the instance is alive.
+    Objects with threads, locks, sockets or file handles use it to rebuild them, since only the forking thread
+    survives in the child and resources shared with the parent must not be used by both.
+    Requires Python 3.7 or later, see HAS_AFTER_FORK.
+    """
+    key = next(_after_fork_keys)
+    _after_fork[key] = weakref.WeakMethod(
+        instance._after_fork, lambda _: _after_fork.pop(key, None)
+    )
+
+
+def _run_after_fork():
+    for reference in list(_after_fork.values()):
+        method = reference()
+        if method is None:
+            continue
+        try:
+            method()
+        except Exception:
+            pass
+
+
+if HAS_AFTER_FORK:
+    os.register_at_fork(after_in_child=_run_after_fork)
+
+
+class FileLock(object):
+    """
+    Exclusive lock shared by all threads and processes that use the same path, based on flock.
+    The lock is released when the holding process exits. Requires a POSIX system.
+    """
+
+    def __init__(self, path: str):
+        assert_journy(isinstance(path, str), "The path is not a string.")
+        assert_journy(fcntl is not None, "File locks require a POSIX system.")
+
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__fd = None
+        register_after_fork(self)
+
+    def __open(self) -> int:
+        if self.__fd is None:
+            self.__fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        return self.__fd
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if not self.__lock.acquire(blocking):
+            return False
+        try:
+            fcntl.flock(
+                self.__open(),
+                fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB,
+            )
+        except BlockingIOError:
+            self.__lock.release()
+            return False
+        except BaseException:
+            self.__lock.release()
+            raise
+        return True
+
+    def release(self):
+        fcntl.flock(self.__fd, fcntl.LOCK_UN)
+        self.__lock.release()
+
+    @property
+    def fd(self) -> int:
+        """
+        The file descriptor of the lock file, only to be used while holding the lock.
+        """
+        return self.__open()
+
+    def _after_fork(self):
+        # The inherited descriptor shares its lock with the parent, so the child needs a descriptor of its own.
+        # Closing the inherited one does not release the lock as long as the parent keeps its descriptor open.
+        if self.__fd is not None:
+            os.close(self.__fd)
+            self.__fd = None
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+    def __str__(self):
+        return f"FileLock({self.path})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -11,9 +11,15 @@ class Success(Generic[T]):
     The data optionally contains a
     """
 
-    def __init__(self, request_id: str, calls_remaining: int, data: T):
-        assert_journy(isinstance(request_id, str), "request_id is not a string.")
-        assert_journy(isinstance(calls_remaining, int), "calls_remaining is not an int")
+    __slots__ = ("request_id", "calls_remaining", "data")
+
+    def __init__(self, request_id: str or None, calls_remaining: int or None, data: T):
+        if request_id is not None:
+            assert_journy(isinstance(request_id, str), "request_id is not a string.")
+        if calls_remaining is not None:
+            assert_journy(
+                isinstance(calls_remaining, int), "calls_remaining is not an int"
+            )
 
         self.request_id = request_id
         self.calls_remaining = calls_remaining
@@ -26,11 +32,30 @@ class Success(Generic[T]):
         return self.__str__()
 
 
+class Skipped(Success[None]):
+    """
+    Skipped object, returned by the client instead of a Success when an upsert was not sent
+    because it did not change anything since the last successful one.
+    """
+
+    __slots__ = ()
+
+    def __init__(self):
+        self.request_id = None
+        self.calls_remaining = None
+        self.data = None
+
+    def __str__(self):
+        return "Skipped()"
+
+
 class Failure(object):
     """
     Failure object, returned by the client if the call to the API did not succeed.
     """
 
+    __slots__ = ("request_id", "calls_remaining", "error")
+
     def __init__(
         self, request_id: str or None, calls_remaining: int or None, error: APIError
     ):
@@ -0,0 +1,210 @@
+import random
+import threading
+import time
+from enum import Enum
+
+from .httpclient import HttpResponse
+from .process import register_after_fork
+from .throttle import parse_delay
+from .utils import assert_journy
+
+
+class RetryPolicy(object):
+    """
+    Retries transient failures with exponential backoff and full jitter.
+    429 and 503 responses are always retried, because the API did not process the request.
+    Other 5xx responses and failed requests are only retried for idempotent calls, unless retry_non_idempotent is set.
+    No attempt is started once deadline seconds have passed since the first one.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 10.0,
+        deadline: float or None = 30.0,
+        retry_non_idempotent: bool = False,
+    ):
+        assert_journy(
+            isinstance(max_attempts, int) and max_attempts > 0,
+            "The max_attempts is not a positive int.",
+        )
+        assert_journy(
+            isinstance(base_delay, (int, float)) and base_delay >= 0,
+            "The base_delay is not a positive number.",
+        )
+        assert_journy(
+            isinstance(max_delay, (int, float)) and max_delay >= base_delay,
+            "The max_delay is not a number larger than the base_delay.",
+        )
+        if deadline is not None:
+            assert_journy(
+                isinstance(deadline, (int, float)) and deadline > 0,
+                "The deadline is not a positive number.",
+            )
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_non_idempotent = retry_non_idempotent
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+    def start(self, idempotent: bool, deadline: float or None = None) -> "RetryState":
+        """
+        Starts the retry bookkeeping of a call, deadline is the time.monotonic() by which the call has to be done.
+        """
+        return RetryState(self, idempotent, deadline)
+
+    def __str__(self):
+        return f"RetryPolicy({self.max_attempts}, {self.base_delay}, {self.max_delay}, {self.deadline})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+NO_RETRIES = RetryPolicy(max_attempts=1)
+
+ALWAYS_RETRIED_STATUS_CODES = frozenset([429, 503])
+IDEMPOTENT_RETRIED_STATUS_CODES = frozenset([500, 502, 504])
+
+
+class RetryState(object):
+    """
+    Retry bookkeeping of a single call, returns the delay before the next attempt or None to stop retrying.
+    Retrying also stops when the backoff would end after the deadline of the call.
+    """
+
+    def __init__(
+        self, policy: RetryPolicy, idempotent: bool, deadline: float or None = None
+    ):
+        self.policy = policy
+        self.idempotent = idempotent or policy.retry_non_idempotent
+        self.attempts = 1
+        self.started_at = time.monotonic()
+        self.deadline = deadline
+        if policy.deadline is not None:
+            policy_deadline = self.started_at + policy.deadline
+            if deadline is None or policy_deadline < deadline:
+                self.deadline = policy_deadline
+
+    def __next_delay(self, minimum: float = 0.0) -> float or None:
+        if self.attempts >= self.policy.max_attempts:
+            return None
+        delay = max(self.policy.backoff(self.attempts), minimum)
+        if self.deadline is not None and time.monotonic() + delay > self.deadline:
+            return None
+        self.attempts += 1
+        return delay
+
+    def on_exception(self) -> float or None:
+        if not self.idempotent:
+            return None
+        return self.__next_delay()
+
+    def on_response(self, response: HttpResponse) -> float or None:
+        status_code = response.status_code
+        if status_code in ALWAYS_RETRIED_STATUS_CODES or (
+            self.idempotent and status_code in IDEMPOTENT_RETRIED_STATUS_CODES
+        ):
+            return self.__next_delay(
+                parse_delay(response.headers["Retry-After"]) or 0.0
+            )
+        return None
+
+
+class CircuitState(Enum):
+    CLOSED = 1
+    OPEN = 2
+    HALF_OPEN = 3
+
+
+class CircuitBreaker(object):
+    """
+    Fails fast while the API is down.
+    After failure_threshold consecutive failures (failed requests or 5xx responses) the circuit opens and calls are
+    refused. After reset_timeout seconds one trial call is let through, which closes the circuit again if it succeeds.
+    When the trial call never reports its outcome, another trial is let through reset_timeout seconds later.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        assert_journy(
+            isinstance(failure_threshold, int) and failure_threshold > 0,
+            "The failure_threshold is not a positive int.",
+        )
+        assert_journy(
+            isinstance(reset_timeout, (int, float)) and reset_timeout > 0,
+            "The reset_timeout is not a positive number.",
+        )
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.__lock = threading.Lock()
+        register_after_fork(self)
+        self.__state = CircuitState.CLOSED
+        self.__failures = 0
+        self.__opened_at = 0.0
+        self.__trial_started_at = None
+
+    @property
+    def state(self) -> CircuitState:
+        return self.__state
+
+    def allow(self) -> bool:
+        with self.__lock:
+            if self.__state is CircuitState.CLOSED:
+                return True
+            now = time.monotonic()
+            if self.__state is CircuitState.OPEN:
+                trial = now - self.__opened_at >= self.reset_timeout
+            else:
+                trial = (
+                    self.__trial_started_at is None
+                    or now - self.__trial_started_at >= self.reset_timeout
+                )
+            if trial:
+                self.__state = CircuitState.HALF_OPEN
+                self.__trial_started_at = now
+            return trial
+
+    def release(self):
+        """
+        Ends an allowed call without an outcome, e.g. when it was cancelled before it was sent.
+        A pending trial call is given to the next call then.
+        """
+        with self.__lock:
+            if self.__state is CircuitState.HALF_OPEN:
+                self.__trial_started_at = None
+
+    def record(self, response: HttpResponse or None):
+        """
+        Records the outcome of a call, None means the request itself failed.
+        """
+        failed = response is None or response.status_code >= 500
+        with self.__lock:
+            self.__trial_started_at = None
+            if not failed:
+                self.__failures = 0
+                self.__state = CircuitState.CLOSED
+                return
+            self.__failures += 1
+            if (
+                self.__state is CircuitState.HALF_OPEN
+                or self.__failures >= self.failure_threshold
+            ):
+                self.__state = CircuitState.OPEN
+                self.__opened_at = time.monotonic()
+
+    def _after_fork(self):
+        self.__lock = threading.Lock()
+
+    def __str__(self):
+        return f"CircuitBreaker({self.failure_threshold}, {self.reset_timeout}, {self.state})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,314 @@
+import atexit
+import sqlite3
+import threading
+import time
+
+from .client import AsyncClient, Client
+from .events import Event
+from .process import HAS_FILE_LOCKS, FileLock, register_after_fork
+from .results import Failure, Success
+from .background import OverflowPolicy
+from .utils import JournyException, APIError, assert_journy
+
+# The API rejected the payload itself, sending it again will not help.
+DROPPED_ERRORS = frozenset(
+    [APIError.BadArgumentsError, APIError.NotFoundError, APIError.UnprocessableError]
+)
+
+# Connections inherited from a parent process. They must neither be used nor closed by the child.
+_inherited_connections = []
+
+
+class EventSpool(object):
+    """
+    Durable write-ahead spool for events, backed by a SQLite database at path.
+    Events are serialized and stored on disk, a background drainer sends them to the API in the order they were added.
+    Events that could not be sent stay in the spool and are retried, also after a restart of the process.
+
+    Writes are committed (and fsynced) once every sync_every events or sync_interval seconds, whichever comes first.
+    Events added since the last commit are lost when the process crashes, call sync() to commit them right away.
+    When the stored payloads exceed max_bytes the overflow_policy decides what happens with new events.
+    on_result is called with the serialized event and its Success, Failure or JournyException after every attempt.
+
+    Several processes can add events to the same spool, e.g. after a fork. Only one of them drains it at a time,
+    which is coordinated with a lock file next to the database.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        path: str,
+        max_bytes: int = 100 * 1024 * 1024,
+        sync_every: int = 100,
+        sync_interval: float = 1.0,
+        retry_interval: float = 5.0,
+        batch_size: int = 100,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        on_result=None,
+    ):
+        assert_journy(
+            isinstance(client, Client) and not isinstance(client, AsyncClient),
+            "The client is not a synchronous Client object.",
+        )
+        assert_journy(isinstance(path, str), "The path is not a string.")
+        assert_journy(
+            isinstance(max_bytes, int) and max_bytes > 0,
+            "The max_bytes is not a positive int.",
+        )
+        assert_journy(
+            isinstance(sync_every, int) and sync_every > 0,
+            "The sync_every is not a positive int.",
+        )
+        assert_journy(
+            isinstance(sync_interval, (int, float)) and sync_interval > 0,
+            "The sync_interval is not a positive number.",
+        )
+        assert_journy(
+            isinstance(retry_interval, (int, float)) and retry_interval > 0,
+            "The retry_interval is not a positive number.",
+        )
+        assert_journy(
+            isinstance(batch_size, int) and batch_size > 0,
+            "The batch_size is not a positive int.",
+        )
+        assert_journy(
+            overflow_policy is not OverflowPolicy.BLOCK
+            and isinstance(overflow_policy, OverflowPolicy),
+            "The overflow_policy is not a non-blocking OverflowPolicy.",
+        )
+
+        self.client = client
+        self.path = path
+        self.max_bytes = max_bytes
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.retry_interval = retry_interval
+        self.batch_size = batch_size
+        self.overflow_policy = overflow_policy
+        self.on_result = on_result
+        self.dropped = 0
+
+        self.__closed = False
+        self.__drain_lock = FileLock(path + ".lock") if HAS_FILE_LOCKS else None
+        self.__reset()
+        atexit.register(self.close)
+        register_after_fork(self)
+
+    def __reset(self):
+        self.__lock = threading.Lock()
+        self.__changed = threading.Condition(self.__lock)
+        self.__draining = False
+        self.__unsynced = 0
+        self.__synced_at = time.monotonic()
+
+        self.__connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=FULL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY AUTOINCREMENT, body TEXT NOT NULL)"
+        )
+        self.__connection.commit()
+        self.__count()
+
+        self.__drainer = threading.Thread(
+            target=self.__drain, name="journyio-spool", daemon=True
+        )
+        self.__drainer.start()
+
+    def __count(self):
+        self.__size, self.__bytes = self.__connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM events"
+        ).fetchone()
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @property
+    def bytes(self) -> int:
+        return self.__bytes
+
+    def add_event(self, event: Event) -> bool:
+        """
+        Stores the event, returns False if the event was dropped because the spool is full.
+        """
+        assert_journy(isinstance(event, Event), "The event should be an Event object.")
+
+        body = self.client._event_body(event)
+        with self.__lock:
+            assert_journy(not self.__closed, "The spool is closed.")
+            while self.__size and self.__bytes + len(body) > self.max_bytes:
+                if self.overflow_policy is OverflowPolicy.RAISE:
+                    raise JournyException("The event spool is full.")
+                if self.overflow_policy is OverflowPolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                self.__delete(
+                    self.__connection.execute(
+                        "SELECT id, LENGTH(body) FROM events ORDER BY id LIMIT 1"
+                    ).fetchall()
+                )
+                self.dropped += 1
+            self.__connection.execute("INSERT INTO events (body) VALUES (?)", (body,))
+            self.__size += 1
+            self.__bytes += len(body)
+            self.__unsynced += 1
+            if self.__unsynced >= self.sync_every:
+                self.__sync()
+            self.__changed.notify_all()
+        return True
+
+    def sync(self):
+        """
+        Commits the added events to disk.
+        """
+        with self.__lock:
+            if not self.__closed:
+                self.__sync()
+
+    def flush(self, timeout: float or None = None) -> bool:
+        """
+        Waits until all events are sent. Returns False if the timeout passed before the spool was drained.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__lock:
+            self.__changed.notify_all()
+            while self.__size and not self.__closed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.__changed.wait(remaining)
+            return not self.__size
+
+    def close(self, timeout: float or None = None):
+        """
+        Stops the drainer and commits the spool to disk. Unsent events are sent after the next start.
+        """
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__changed.notify_all()
+        self.__drainer.join(timeout)
+        with self.__lock:
+            self.__sync()
+            self.__connection.close()
+            self.__connection = None
+            if self.__draining and self.__drain_lock is not None:
+                self.__drain_lock.release()
+            self.__draining = False
+        atexit.unregister(self.close)
+
+    def _after_fork(self):
+        # SQLite connections must not be used across a fork, the child opens its own connection and drainer.
+        # The drainer of the parent keeps draining the spool as long as it runs.
+        if self.__closed:
+            return
+        _inherited_connections.append(self.__connection)
+        self.__reset()
+
+    def __sync(self):
+        self.__connection.commit()
+        self.__unsynced = 0
+        self.__synced_at = time.monotonic()
+
+    def __delete(self, rows: list):
+        for row_id, length in rows:
+            # A row that is being sent can be deleted by add_event in the meantime, it is only counted once.
+            if self.__connection.execute(
+                "DELETE FROM events WHERE id = ?", (row_id,)
+            ).rowcount:
+                self.__size -= 1
+                self.__bytes -= length
+        if self.__size < 0 or self.__bytes < 0:
+            # The rows included events of other processes.
+            self.__count()
+
+    def __lock_drain(self) -> bool:
+        if self.__drain_lock is not None and not self.__drain_lock.acquire(False):
+            return False
+        # Another process may have changed the spool while it held the lock.
+        self.__count()
+        return True
+
+    def __next_batch(self, wait: float) -> list or None:
+        """
+        Returns the next batch to send, an empty list when another process drains the spool, or None when closed.
+        """
+        with self.__lock:
+            if not self.__draining and not self.__closed:
+                self.__draining = self.__lock_drain()
+            if not self.__draining:
+                wait = self.retry_interval
+            deadline = recount_at = time.monotonic() + wait
+            while not self.__closed:
+                now = time.monotonic()
+                if self.__unsynced and now - self.__synced_at >= self.sync_interval:
+                    self.__sync()
+                if self.__draining and not self.__size and now >= recount_at:
+                    # Other processes may have added events.
+                    self.__count()
+                    recount_at = now + self.sync_interval
+                ready = self.__size or not self.__draining
+                if ready and now >= deadline:
+                    break
+                timeout = deadline - now if ready else self.sync_interval
+                if self.__unsynced:
+                    timeout = min(timeout, self.sync_interval)
+                self.__changed.wait(max(timeout, 0))
+            if self.__closed:
+                return None
+            if not self.__draining:
+                # Follow the progress of the draining process, so flush() and max_bytes see it.
+                self.__count()
+                self.__changed.notify_all()
+                return []
+            batch = self.__connection.execute(
+                "SELECT id, body FROM events ORDER BY id LIMIT ?", (self.batch_size,)
+            ).fetchall()
+            if not batch:
+                self.__size, self.__bytes = 0, 0
+            return batch
+
+    def __drain(self):
+        wait = 0.0
+        while True:
+            batch = self.__next_batch(wait)
+            if batch is None:
+                return
+            if not batch:
+                continue
+            sent = []
+            wait = 0.0
+            for row_id, body in batch:
+                try:
+                    result = self.client._add_event_body(
+                        body, self.client._deadline(None)
+                    )
+                except JournyException as e:
+                    result = e
+                if isinstance(result, Success) or (
+                    isinstance(result, Failure) and result.error in DROPPED_ERRORS
+                ):
+                    sent.append((row_id, len(body)))
+                else:
+                    wait = self.retry_interval
+                if self.on_result is not None:
+                    try:
+                        self.on_result(body, result)
+                    except Exception:
+                        pass
+                if wait or self.__closed:
+                    break
+            with self.__lock:
+                if self.__connection is None:
+                    return
+                self.__delete(sent)
+                self.__sync()
+                self.__changed.notify_all()
+
+    def __str__(self):
+        return f"EventSpool({self.path}, {self.size})"
+
+    def __repr__(self):
+        return self.__str__()
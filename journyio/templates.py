@@ -0,0 +1,196 @@
+import json
+from json.encoder import encode_basestring_ascii as encode_string
+from typing import List
+
+from .account_identified import AccountIdentified
+from .codec import JsonCodec, StdlibJsonCodec
+from .events import Event
+from .httpclient import HttpRequest, HttpHeaders, Method
+from .user_identified import UserIdentified
+
+
+class RequestTemplate(object):
+    """
+    The static part of the requests to one endpoint, built once per client.
+    The headers are shared by all requests of the template and must not be changed by HttpClient implementations.
+    """
+
+    __slots__ = ("url", "method", "headers")
+
+    def __init__(self, url: str, method: Method, headers: HttpHeaders):
+        self.url = url
+        self.method = method
+        self.headers = headers
+
+    def request(self, body: str or None = None, query: str = "") -> HttpRequest:
+        return HttpRequest._unchecked(self.url + query, self.method, self.headers, body)
+
+    def __setattr__(self, key, value):
+        if hasattr(self, key):
+            raise AttributeError(f"RequestTemplate.{key} is read-only.")
+        super().__setattr__(key, value)
+
+    def __str__(self):
+        return f"RequestTemplate({self.url}, {self.method}, {self.headers})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+# The encoders below write the JSON bodies directly instead of building dictionaries for json.dumps.
+# Their output is identical to json.dumps of the equivalent dictionary.
+
+
+def _encode_pairs(first_key: str, first, second_key: str, second) -> str:
+    if first:
+        if second:
+            return (
+                f'{{"{first_key}": {encode_string(first)}, '
+                f'"{second_key}": {encode_string(second)}}}'
+            )
+        return f'{{"{first_key}": {encode_string(first)}}}'
+    if second:
+        return f'{{"{second_key}": {encode_string(second)}}}'
+    return "{}"
+
+
+def encode_user(user: UserIdentified) -> str:
+    return _encode_pairs("email", user.email, "userId", user.user_id)
+
+
+def encode_account(account: AccountIdentified) -> str:
+    return _encode_pairs("domain", account.domain, "accountId", account.account_id)
+
+
+def encode_event(event: Event) -> str:
+    if event.user:
+        if event.account:
+            identification = f'{{"user": {encode_user(event.user)}, "account": {encode_account(event.account)}}}'
+        else:
+            identification = f'{{"user": {encode_user(event.user)}}}'
+    elif event.account:
+        identification = f'{{"account": {encode_account(event.account)}}}'
+    else:
+        identification = "{}"
+    body = (
+        f'{{"identification": {identification}, "name": {encode_string(event.name)}, '
+        f'"metadata": {json.dumps(event.metadata)}'
+    )
+    if event.date:
+        return f'{body}, "triggeredAt": {encode_string(event.date.isoformat())}}}'
+    return body + "}"
+
+
+def encode_identification(identification: str) -> str:
+    return f'{{"identification": {identification}}}'
+
+
+def encode_upsert(identification: str, properties: dict) -> str:
+    return f'{{"identification": {identification}, "properties": {json.dumps(properties)}}}'
+
+
+def encode_members(account: AccountIdentified, users: List[UserIdentified]) -> str:
+    members = ", ".join(f'{{"identification": {encode_user(user)}}}' for user in users)
+    return f'{{"account": {encode_account(account)}, "users": [{members}]}}'
+
+
+def encode_link(user: UserIdentified, device_id: str) -> str:
+    return f'{{"deviceId": {encode_string(device_id)}, "identification": {encode_user(user)}}}'
+
+
+class BodyEncoder(object):
+    """
+    Serializes the request bodies of the client with a JsonCodec.
+    """
+
+    def __init__(self, codec: JsonCodec):
+        self.codec = codec
+
+    def event(self, event: Event) -> str or bytes:
+        identification = {}
+        if event.user:
+            identification["user"] = event.user.format_identification()
+        if event.account:
+            identification["account"] = event.account.format_identification()
+        body = {
+            "identification": identification,
+            "name": event.name,
+            "metadata": event.metadata,
+        }
+        if event.date:
+            body["triggeredAt"] = event.date.isoformat()
+        return self.codec.dumps(body)
+
+    def upsert_user(self, user: UserIdentified, properties: dict) -> str or bytes:
+        return self.codec.dumps(
+            {"identification": user.format_identification(), "properties": properties}
+        )
+
+    def upsert_account(
+        self, account: AccountIdentified, properties: dict
+    ) -> str or bytes:
+        return self.codec.dumps(
+            {
+                "identification": account.format_identification(),
+                "properties": properties,
+            }
+        )
+
+    def delete_user(self, user: UserIdentified) -> str or bytes:
+        return self.codec.dumps({"identification": user.format_identification()})
+
+    def delete_account(self, account: AccountIdentified) -> str or bytes:
+        return self.codec.dumps({"identification": account.format_identification()})
+
+    def members(
+        self, account: AccountIdentified, users: List[UserIdentified]
+    ) -> str or bytes:
+        return self.codec.dumps(
+            {
+                "account": account.format_identification(),
+                "users": [
+                    {"identification": user.format_identification()} for user in users
+                ],
+            }
+        )
+
+    def link(self, user: UserIdentified, device_id: str) -> str or bytes:
+        return self.codec.dumps(
+            {"deviceId": device_id, "identification": user.format_identification()}
+        )
+
+
+class StdlibBodyEncoder(BodyEncoder):
+    """
+    BodyEncoder for the StdlibJsonCodec, writes the bodies with the encode functions above.
+    """
+
+    def __init__(self, codec: StdlibJsonCodec):
+        super().__init__(codec)
+
+    def event(self, event: Event) -> str:
+        return encode_event(event)
+
+    def upsert_user(self, user: UserIdentified, properties: dict) -> str:
+        return encode_upsert(encode_user(user), properties)
+
+    def upsert_account(self, account: AccountIdentified, properties: dict) -> str:
+        return encode_upsert(encode_account(account), properties)
+
+    def delete_user(self, user: UserIdentified) -> str:
+        return encode_identification(encode_user(user))
+
+    def delete_account(self, account: AccountIdentified) -> str:
+        return encode_identification(encode_account(account))
+
+    def members(self, account: AccountIdentified, users: List[UserIdentified]) -> str:
+        return encode_members(account, users)
+
+    def link(self, user: UserIdentified, device_id: str) -> str:
+        return encode_link(user, device_id)
+
+
+def body_encoder(codec: JsonCodec) -> BodyEncoder:
+    if type(codec) is StdlibJsonCodec:
+        return StdlibBodyEncoder(codec)
+    return BodyEncoder(codec)
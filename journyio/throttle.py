@@ -0,0 +1,259 @@
+import os
+import struct
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from .httpclient import HttpResponse
+from .process import FileLock, register_after_fork
+from .utils import assert_journy
+
+
+def parse_delay(value: str or None, now: float or None = None) -> float or None:
+    """
+    Parses a Retry-After or X-RateLimit-Reset header value to a number of seconds from now.
+    The value can be a delay in seconds, a unix timestamp or an HTTP date.
+    """
+    if not value:
+        return None
+    if now is None:
+        now = time.time()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError, IndexError):
+            return None
+    if seconds > 1e9:
+        seconds -= now
+    return max(seconds, 0.0)
+
+
+class TokenBucket(object):
+    """
+    The state of a RateLimiter. Times are time.monotonic() values, which are shared by all processes of a host.
+    """
+
+    __slots__ = ("rate", "tokens", "updated_at", "blocked_until", "calls_remaining")
+
+    # calls_remaining is stored as -1 when it is not known yet.
+    FORMAT = struct.Struct("=ddddq")
+
+    def __init__(
+        self,
+        rate: float,
+        tokens: float,
+        updated_at: float,
+        blocked_until: float = 0.0,
+        calls_remaining: int or None = None,
+    ):
+        self.rate = rate
+        self.tokens = tokens
+        self.updated_at = updated_at
+        self.blocked_until = blocked_until
+        self.calls_remaining = calls_remaining
+
+    def pack(self) -> bytes:
+        return TokenBucket.FORMAT.pack(
+            self.rate,
+            self.tokens,
+            self.updated_at,
+            self.blocked_until,
+            -1 if self.calls_remaining is None else self.calls_remaining,
+        )
+
+    @classmethod
+    def unpack(cls, data: bytes):
+        rate, tokens, updated_at, blocked_until, calls_remaining = cls.FORMAT.unpack(
+            data
+        )
+        return cls(
+            rate,
+            tokens,
+            updated_at,
+            blocked_until,
+            None if calls_remaining < 0 else calls_remaining,
+        )
+
+    def __str__(self):
+        return f"TokenBucket({self.rate}, {self.tokens}, {self.calls_remaining})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class RateLimiter(object):
+    """
+    Token bucket shared by all threads that use a client.
+    Tokens refill at rate per second up to capacity. The rate is lowered to spread the X-RateLimit-Remaining calls over
+    the time left until X-RateLimit-Reset (or window seconds when the API does not send a reset).
+    A 429 response or a Retry-After header pauses all requests until the given time.
+    """
+
+    def __init__(
+        self,
+        rate: float = 30.0,
+        capacity: int = 30,
+        window: float = 60.0,
+        default_retry_after: float = 1.0,
+    ):
+        assert_journy(
+            isinstance(rate, (int, float)) and rate > 0,
+            "The rate is not a positive number.",
+        )
+        assert_journy(
+            isinstance(capacity, int) and capacity > 0,
+            "The capacity is not a positive int.",
+        )
+        assert_journy(
+            isinstance(window, (int, float)) and window > 0,
+            "The window is not a positive number.",
+        )
+
+        self.max_rate = float(rate)
+        self.capacity = capacity
+        self.window = window
+        self.default_retry_after = default_retry_after
+
+        self.__lock = threading.Lock()
+        self.__bucket = self._new_bucket()
+        register_after_fork(self)
+
+    def _new_bucket(self) -> TokenBucket:
+        return TokenBucket(self.max_rate, float(self.capacity), time.monotonic())
+
+    def _update(self, update):
+        """
+        Calls update(bucket, now) while holding the bucket and returns its result.
+        """
+        with self.__lock:
+            return update(self.__bucket, time.monotonic())
+
+    @property
+    def rate(self) -> float:
+        return self._update(lambda bucket, now: bucket.rate)
+
+    @property
+    def calls_remaining(self) -> int or None:
+        return self._update(lambda bucket, now: bucket.calls_remaining)
+
+    def __refill(self, bucket: TokenBucket, now: float):
+        elapsed = now - bucket.updated_at
+        if elapsed > 0:
+            bucket.tokens = min(self.capacity, bucket.tokens + elapsed * bucket.rate)
+            bucket.updated_at = now
+
+    def __reserve(
+        self, bucket: TokenBucket, now: float, max_delay: float or None
+    ) -> float:
+        self.__refill(bucket, now)
+        bucket.tokens -= 1
+        delay = -bucket.tokens / bucket.rate if bucket.tokens < 0 else 0.0
+        delay = max(delay, bucket.blocked_until - now)
+        if max_delay is not None and delay > max_delay:
+            bucket.tokens += 1
+        return delay
+
+    def reserve(self, max_delay: float or None = None) -> float:
+        """
+        Takes a token and returns the number of seconds the caller has to wait before sending its request.
+        Tokens can go negative, so waiting callers are served in the order they reserved.
+        When the wait would be longer than max_delay seconds, no token is taken and the caller must not send.
+        """
+        return self._update(lambda bucket, now: self.__reserve(bucket, now, max_delay))
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def observe(self, response: HttpResponse):
+        """
+        Updates the bucket with the rate limit headers of a response.
+        """
+        headers = response.headers
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+        except (TypeError, ValueError):
+            remaining = None
+        reset_after = parse_delay(headers["X-RateLimit-Reset"])
+        retry_after = parse_delay(headers["Retry-After"])
+        if retry_after is None and response.status_code == 429:
+            retry_after = reset_after or self.default_retry_after
+
+        def update(bucket: TokenBucket, now: float):
+            self.__refill(bucket, now)
+            if retry_after is not None:
+                bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+            if remaining is None:
+                return
+            bucket.calls_remaining = remaining
+            bucket.tokens = min(bucket.tokens, remaining)
+            if remaining <= 0:
+                bucket.blocked_until = max(
+                    bucket.blocked_until,
+                    now + (reset_after or self.default_retry_after),
+                )
+            else:
+                period = reset_after if reset_after else self.window
+                bucket.rate = min(self.max_rate, remaining / period)
+
+        self._update(update)
+
+    def _after_fork(self):
+        self.__lock = threading.Lock()
+
+    def __str__(self):
+        return f"RateLimiter({self.max_rate}, {self.capacity})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    RateLimiter whose bucket is shared by all processes that use the same path, e.g. the workers of a pre-fork
+    server or a multiprocessing pool. The bucket is stored in a small file and updated under a FileLock,
+    so the processes together stay under the rate and the X-RateLimit-Remaining budget of the API key.
+    Give every process the same rate and capacity. Requires a POSIX system.
+    """
+
+    # A bucket blocked for longer than this is assumed to be stale, e.g. written before a reboot.
+    MAX_BLOCKED = 86400.0
+
+    def __init__(
+        self,
+        path: str,
+        rate: float = 30.0,
+        capacity: int = 30,
+        window: float = 60.0,
+        default_retry_after: float = 1.0,
+    ):
+        assert_journy(isinstance(path, str), "The path is not a string.")
+        self.path = path
+        self.__file_lock = FileLock(path)
+        super().__init__(rate, capacity, window, default_retry_after)
+
+    def _update(self, update):
+        with self.__file_lock:
+            fd = self.__file_lock.fd
+            data = os.pread(fd, TokenBucket.FORMAT.size, 0)
+            now = time.monotonic()
+            bucket = None
+            if len(data) == TokenBucket.FORMAT.size:
+                bucket = TokenBucket.unpack(data)
+                # time.monotonic() starts over when the host reboots, a bucket from before is ahead of now.
+                if (
+                    bucket.updated_at > now
+                    or bucket.blocked_until > now + SharedRateLimiter.MAX_BLOCKED
+                ):
+                    bucket = None
+            if bucket is None:
+                bucket = self._new_bucket()
+            result = update(bucket, now)
+            os.pwrite(fd, bucket.pack(), 0)
+            return result
+
+    def __str__(self):
+        return f"SharedRateLimiter({self.path}, {self.max_rate}, {self.capacity})"
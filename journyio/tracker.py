@@ -0,0 +1,80 @@
+import time
+
+from .background import BackgroundQueue, OverflowPolicy
+from .client import Client
+from .events import Event
+from .utils import assert_journy
+
+
+class BufferedTracker(BackgroundQueue):
+    """
+    Buffers events in memory and sends them to the API on background worker threads.
+    A flush starts when flush_at events are queued or flush_interval seconds have passed, whichever comes first.
+    When max_queue_size events are queued, the overflow_policy decides what happens with new events.
+    Pending events are drained when the tracker is closed, which happens automatically at interpreter exit, for at most
+    exit_timeout seconds.
+    """
+
+    _name = "tracker"
+    _item_name = "event"
+
+    def __init__(
+        self,
+        client: Client,
+        max_queue_size: int = 10000,
+        flush_at: int = 100,
+        flush_interval: float = 1.0,
+        workers: int = 1,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        on_result=None,
+        exit_timeout: float = 5.0,
+    ):
+        assert_journy(
+            isinstance(flush_at, int) and flush_at > 0,
+            "The flush_at is not a positive int.",
+        )
+        assert_journy(
+            isinstance(flush_interval, (int, float)) and flush_interval > 0,
+            "The flush_interval is not a positive number.",
+        )
+
+        self.flush_at = flush_at
+        self.flush_interval = flush_interval
+        super().__init__(
+            client, max_queue_size, workers, overflow_policy, on_result, exit_timeout
+        )
+
+    def add_event(self, event: Event) -> bool:
+        """
+        Queues the event, returns False if the event was dropped because the queue is full.
+        """
+        assert_journy(isinstance(event, Event), "The event should be an Event object.")
+        return self._put(event)
+
+    def _append(self, event: Event):
+        self._queue.append(event)
+        if len(self._queue) >= self.flush_at:
+            self._not_empty.notify()
+
+    def _take(self) -> list:
+        deadline = time.monotonic() + self.flush_interval
+        while len(self._queue) < self.flush_at and not self._closed:
+            remaining = deadline - time.monotonic()
+            if self._queue and (self._flush_requested or remaining <= 0):
+                break
+            if remaining <= 0:
+                deadline = time.monotonic() + self.flush_interval
+                remaining = self.flush_interval
+            self._not_empty.wait(remaining)
+        return [
+            self._queue.popleft() for _ in range(min(self.flush_at, len(self._queue)))
+        ]
+
+    def _send(self, event: Event, timeout: float or None):
+        return self.client.add_event(event, timeout)
+
+    def __str__(self):
+        return f"BufferedTracker({self.client}, {self.queue_size})"
+
+    def __repr__(self):
+        return self.__str__()
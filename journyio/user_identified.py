@@ -2,6 +2,8 @@ from .utils import assert_journy
 
 
 class UserIdentified(object):
+    __slots__ = ("user_id", "email")
+
     def __init__(self, user_id: str or None, email: str or None):
         assert_journy(user_id or email, "User id and email can not both be empty")
 
@@ -11,6 +11,7 @@ class APIError(Enum):
     UnknownError = 6, "UnknownError"
     ForbiddenError = 7, "ForbiddenError"
     UnprocessableError = 8, "Unprocessable"
+    TimeoutError = 9, "TimeoutError"
 
 
 class JournyException(Exception):
@@ -24,6 +25,15 @@ class JournyException(Exception):
         return f"JournyException({self.msg})"
 
 
+class JournyTimeoutException(JournyException):
+    """
+    Raised when a call, or a request of it, did not finish within its timeout.
+    """
+
+    def __str__(self):
+        return f"JournyTimeoutException({self.msg})"
+
+
 status_code_to_api_error_mapping = defaultdict(lambda: APIError.UnknownError)
 status_code_to_api_error_mapping.update(
     {
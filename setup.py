@@ -19,5 +19,11 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     install_requires=["requests"],
+    extras_require={
+        "async": ["aiohttp"],
+        "fast": ["orjson"],
+        "http2": ["httpx[http2]"],
+        "zstd": ["zstandard"],
+    },
     python_requires=">=3.6",
 )
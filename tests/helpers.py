@@ -0,0 +1,73 @@
+import json
+import socketserver
+import threading
+from http.server import HTTPServer
+
+from journyio.httpclient import HttpClient, HttpHeaders, HttpResponse
+from journyio.utils import JournyException
+
+headers = HttpHeaders()
+headers["X-RateLimit-Remaining"] = "4999"
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """
+    http.server.ThreadingHTTPServer, which only exists on Python 3.7 and later.
+    """
+
+    daemon_threads = True
+
+
+def create_response(status_code: int) -> HttpResponse:
+    return HttpResponse(status_code, headers, {"meta": {"requestId": "requestId"}})
+
+
+created_response = create_response(201)
+
+
+class RecordingHttpClient(HttpClient):
+    """
+    Records the requests it is sent and answers them with a 201 response.
+    Requests wait for the gate when one is given, requests after the first fail_after ones raise.
+    """
+
+    def __init__(
+        self, gate: threading.Event or None = None, fail_after: int or None = None
+    ):
+        self.gate = gate
+        self.fail_after = fail_after
+        self.lock = threading.Lock()
+        self.requests = []
+
+    def send(self, request):
+        if self.gate is not None:
+            self.gate.wait()
+        with self.lock:
+            if self.fail_after is not None and len(self.requests) >= self.fail_after:
+                raise JournyException("Connection refused")
+            self.requests.append(request)
+        return created_response
+
+    @property
+    def bodies(self) -> list:
+        with self.lock:
+            return [json.loads(request.body) for request in self.requests]
+
+    @property
+    def names(self) -> list:
+        return [body["name"] for body in self.bodies]
+
+
+class SequenceHttpClient(HttpClient):
+    """
+    Answers with the given responses in order, exceptions in the list are raised.
+    """
+
+    def __init__(self, responses: list):
+        self.responses = responses
+
+    def send(self, request):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
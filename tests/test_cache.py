@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from journyio.cache import CacheBackend, LruCacheBackend, ResponseCache
+from journyio.client import AsyncClient, Client, Config
+from journyio.httpclient import AsyncHttpClientTesting, HttpClient, HttpResponse
+from journyio.results import Failure, Success, TrackingSnippetResponse
+from journyio.utils import JournyException
+
+from .helpers import create_response, headers
+
+snippet_response = HttpResponse(
+    200,
+    headers,
+    {
+        "data": {"domain": "journy.io", "snippet": "<script></script>"},
+        "meta": {"requestId": "requestId"},
+    },
+)
+rate_limited_response = create_response(429)
+
+
+class CountingHttpClient(HttpClient):
+    def __init__(self, response, gate: threading.Event or None = None):
+        self.response = response
+        self.gate = gate
+        self.urls = []
+
+    def send(self, request):
+        self.urls.append(request.url)
+        if self.gate is not None:
+            self.gate.wait(5)
+        return self.response
+
+
+class SlowAsyncHttpClient(AsyncHttpClientTesting):
+    def __init__(self, response):
+        super().__init__(response)
+        self.sent = 0
+
+    async def send(self, request):
+        self.sent += 1
+        await asyncio.sleep(0.01)
+        return await super().send(request)
+
+
+def test_lru_backend():
+    backend = LruCacheBackend(max_size=2)
+    backend.set("a", 1, 60)
+    backend.set("b", 2, 60)
+    assert backend.get("a") == 1
+    backend.set("c", 3, 60)
+
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+    assert backend.get("c") == 3
+    assert backend.evictions == 1
+
+    backend.set("d", 4, 0.01)
+    time.sleep(0.02)
+    assert backend.get("d") is None
+    backend.delete("a")
+    assert backend.get("a") is None
+    backend.clear()
+    assert len(backend) == 0
+
+    with pytest.raises(JournyException):
+        LruCacheBackend(max_size=0)
+
+
+def test_client_caches_tracking_snippet():
+    http_client = CountingHttpClient(snippet_response)
+    cache = ResponseCache(ttl=60)
+    client = Client(http_client, Config("api-key", cache=cache))
+
+    first = client.get_tracking_snippet("journy.io")
+    second = client.get_tracking_snippet("journy.io")
+    client.get_tracking_snippet("other.io")
+
+    assert isinstance(first, Success)
+    assert isinstance(first.data, TrackingSnippetResponse)
+    assert second is first
+    assert len(http_client.urls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.hit_rate == pytest.approx(1 / 3)
+
+    other_key = Client(http_client, Config("other-key", cache=cache))
+    other_key.get_tracking_snippet("journy.io")
+    assert len(http_client.urls) == 3
+
+    cache.invalidate()
+    client.get_tracking_snippet("journy.io")
+    assert len(http_client.urls) == 4
+
+
+def test_client_does_not_cache_failures():
+    http_client = CountingHttpClient(rate_limited_response)
+    client = Client(http_client, Config("api-key", cache=ResponseCache()))
+
+    assert isinstance(client.get_api_key_details(), Failure)
+    assert isinstance(client.get_api_key_details(), Failure)
+    assert len(http_client.urls) == 2
+
+
+def test_cache_single_flight():
+    gate = threading.Event()
+    http_client = CountingHttpClient(snippet_response, gate)
+    cache = ResponseCache()
+    client = Client(http_client, Config("api-key", cache=cache))
+    results = []
+
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(client.get_tracking_snippet("journy.io"))
+        )
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    while cache.misses < 5:
+        time.sleep(0.001)
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(http_client.urls) == 1
+    assert cache.coalesced == 4
+    assert all(result is results[0] for result in results)
+
+
+def test_cache_single_flight_exception():
+    cache = ResponseCache()
+
+    def load():
+        raise JournyException("failed")
+
+    with pytest.raises(JournyException):
+        cache.get_or_load("key", load)
+    assert cache.get_or_load("key", lambda: "loaded") == "loaded"
+
+
+def test_async_client_cache():
+    http_client = SlowAsyncHttpClient(snippet_response)
+    cache = ResponseCache()
+    client = AsyncClient(http_client, Config("api-key", cache=cache))
+
+    async def main():
+        return await asyncio.gather(
+            *[client.get_tracking_snippet("journy.io") for _ in range(3)]
+        )
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(main())
+        assert all(isinstance(result, Success) for result in results)
+        assert http_client.sent == 1
+        assert cache.misses == 3
+        assert cache.coalesced == 2
+        snippet = loop.run_until_complete(client.get_tracking_snippet("journy.io"))
+        assert snippet is results[0]
+    finally:
+        loop.close()
+    assert cache.hits == 1
+
+
+def test_cache_validation():
+    with pytest.raises(JournyException):
+        ResponseCache(backend={})
+    with pytest.raises(JournyException):
+        ResponseCache(ttl=0)
+    with pytest.raises(JournyException):
+        Config("api-key", cache=LruCacheBackend())
+    assert isinstance(ResponseCache().backend, CacheBackend)
@@ -1,12 +1,21 @@
+import asyncio
+import json
+import threading
 from datetime import datetime
 
 import pytest
 
-from journyio.client import Config, Properties, Client
+from journyio.client import Config, Properties, Client, AsyncClient
 from journyio.events import Event, Metadata
-from journyio.httpclient import HttpClientTesting, HttpResponse, HttpHeaders
+from journyio.httpclient import (
+    HttpClient,
+    HttpClientTesting,
+    AsyncHttpClientTesting,
+    HttpResponse,
+    HttpHeaders,
+)
 from journyio.results import Success, TrackingSnippetResponse, ApiKeyDetails, Failure
-from journyio.utils import JournyException, APIError
+from journyio.utils import JournyException, JournyTimeoutException, APIError
 from journyio.user_identified import UserIdentified
 from journyio.account_identified import AccountIdentified
 
@@ -46,6 +55,30 @@ def test_properties():
     assert properties["new"] == "value"
     assert properties["doesexist"] == "hallo"
     assert properties["thistoo"]
+    assert properties.properties is properties
+    assert len(properties) == 6
+
+
+def test_properties_from_dict():
+    properties = Properties.from_dict(
+        {" Name ": "Journy", "tags": ["a", "b"]},
+        registered_at=datetime(2020, 11, 2, 13, 37, 40),
+    )
+    assert dict(properties) == {
+        "name": "Journy",
+        "tags": ["a", "b"],
+        "registered_at": "2020-11-02T13:37:40",
+    }
+    assert Properties(name="Journy") == {"name": "Journy"}
+    assert properties.__str__() == (
+        '{"name": "Journy", "tags": ["a", "b"], "registered_at": "2020-11-02T13:37:40"}'
+    )
+
+    with pytest.raises(JournyException):
+        properties.update({"plan": "pro", "seats": 1.5})
+    assert "plan" not in properties
+    with pytest.raises(JournyException):
+        Properties.from_dict({1: "value"})
 
 
 def test_client():
@@ -197,6 +230,17 @@ def test_client_delete_user():
     )
 
 
+def test_client_delete_user_no_content():
+    client = Client(HttpClientTesting(HttpResponse(204)), Config("api-key"))
+
+    response = client.delete_user(user)
+
+    assert isinstance(response, Success)
+    assert response.request_id is None
+    assert response.calls_remaining is None
+    assert response.data is None
+
+
 def test_client_upsert_account():
     http_client_testing = HttpClientTesting(created_response)
     config = Config("api-key", "https://api.journy.io")
@@ -354,3 +398,205 @@ def test_client_get_api_key_details():
         http_client_testing.received_request.__str__()
         == 'HttpRequest(https://api.journy.io/validate, Method.GET, {"content-type": "application/json", "user-agent": "python-sdk/0.0.0", "x-api-key": "api-key"}, None)'
     )
+
+
+def test_async_client():
+    http_client_testing = AsyncHttpClientTesting(created_response)
+    config = Config("api-key", "https://api.journy.io")
+
+    client = AsyncClient(http_client_testing, config)
+    assert (
+        client.__str__()
+        == "AsyncClient(AsyncHttpClientTesting(HttpResponse(201, {\"x-ratelimit-remaining\": \"4999\"}, {'meta': {'requestId': 'requestId'}}), None), Config(api-key, https://api.journy.io))"
+    )
+
+    with pytest.raises(JournyException):
+        AsyncClient(HttpClientTesting(created_response), config)
+    with pytest.raises(JournyException):
+        client.add_event("event")
+
+    loop = asyncio.new_event_loop()
+    try:
+        response = loop.run_until_complete(client.add_event(event))
+    finally:
+        loop.close()
+
+    assert isinstance(response, Success)
+    assert response.__str__() == "Success(requestId, 4999, None)"
+    assert (
+        http_client_testing.received_request.__str__()
+        == 'HttpRequest(https://api.journy.io/track, Method.POST, {"content-type": "application/json", "user-agent": "python-sdk/0.0.0", "x-api-key": "api-key"}, {"identification": {"user": {"email": "user@journy.io", "userId": "user_id"}, "account": {"domain": "www.journy.io", "accountId": "account_id"}}, "name": "login", "metadata": {"true": true, "key": "value"}, "triggeredAt": "2020-11-02T13:37:40"})'
+    )
+
+
+def test_client_timeout():
+    http_client_testing = HttpClientTesting(created_response)
+    client = Client(http_client_testing, Config("api-key", timeout=5))
+
+    client.add_event(event)
+    assert 4.9 < http_client_testing.received_request.timeout <= 5
+    client.delete_user(user, timeout=0.5)
+    assert 0.4 < http_client_testing.received_request.timeout <= 0.5
+    client.upsert_user(user, Properties())
+    assert 4.9 < http_client_testing.received_request.timeout <= 5
+
+    client = Client(http_client_testing, Config("api-key"))
+    client.link(user, "device_id")
+    assert http_client_testing.received_request.timeout is None
+
+    with pytest.raises(JournyException):
+        client.link(user, "device_id", timeout=0)
+    with pytest.raises(JournyException):
+        client.add_events([event], timeout="1")
+    with pytest.raises(JournyException):
+        Config("api-key", timeout=-1)
+
+
+class SlowAsyncHttpClient(AsyncHttpClientTesting):
+    async def send(self, request):
+        await asyncio.sleep(1)
+        return await super().send(request)
+
+
+def test_async_client_timeout():
+    client = AsyncClient(
+        SlowAsyncHttpClient(created_response), Config("api-key", timeout=0.05)
+    )
+
+    loop = asyncio.new_event_loop()
+    try:
+        with pytest.raises(JournyTimeoutException):
+            loop.run_until_complete(client.add_event(event))
+        response = loop.run_until_complete(client.add_event(event, timeout=2))
+    finally:
+        loop.close()
+
+    assert isinstance(response, Success)
+
+
+def test_async_client_concurrent_calls():
+    config = Config("api-key", "https://api.journy.io")
+
+    async def run():
+        snippet_client = AsyncClient(
+            AsyncHttpClientTesting(tracking_snippet_response), config
+        )
+        failing_client = AsyncClient(
+            AsyncHttpClientTesting(too_many_requests_response), config
+        )
+        return await asyncio.gather(
+            snippet_client.get_tracking_snippet("journy.io"),
+            failing_client.link(user, "device_id"),
+            failing_client.upsert_user(user, Properties()),
+        )
+
+    loop = asyncio.new_event_loop()
+    try:
+        snippet, link, upsert = loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+    assert (
+        snippet.__str__()
+        == "Success(requestId, 4999, TrackingSnippetResponse(journy.io, <script>snippet</script>))"
+    )
+    assert link.error is APIError.TooManyRequests
+    assert upsert.error is APIError.TooManyRequests
+
+
+class BulkHttpClient(HttpClient):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bodies = []
+
+    def send(self, request):
+        with self.lock:
+            self.bodies.append(json.loads(request.body))
+        if "fail" in request.body:
+            return too_many_requests_response
+        if "raise" in request.body:
+            raise JournyException("Connection refused")
+        if "slow" in request.body:
+            raise JournyTimeoutException("Read timed out")
+        return created_response
+
+
+def test_client_add_events():
+    http_client = BulkHttpClient()
+    client = Client(http_client, Config("api-key", "https://api.journy.io"))
+
+    events = (
+        Event.for_user(name, user) for name in ["login", "fail", "raise", "logout"]
+    )
+    results = client.add_events(events, parallelism=2, chunk_size=3)
+
+    assert [result.__str__() for result in results] == [
+        "Success(requestId, 4999, None)",
+        "Failure(requestId, 4999, APIError.TooManyRequests)",
+        "Failure(None, None, APIError.UnknownError)",
+        "Success(requestId, 4999, None)",
+    ]
+    assert sorted(body["name"] for body in http_client.bodies) == [
+        "fail",
+        "login",
+        "logout",
+        "raise",
+    ]
+
+    results = client.add_events(["login", event, Event.for_user("slow", user)])
+
+    assert results[0].error is APIError.UnknownError
+    assert isinstance(results[1], Success)
+    assert results[2].error is APIError.TimeoutError
+    with pytest.raises(JournyException):
+        client.add_events([event], parallelism=0)
+
+
+def test_client_upsert_users_and_accounts():
+    http_client = BulkHttpClient()
+    client = Client(http_client, Config("api-key", "https://api.journy.io"))
+
+    properties = Properties()
+    properties["plan"] = "fail"
+    users = [(UserIdentified.by_user_id(str(i)), Properties()) for i in range(50)]
+    users.append((user, properties))
+
+    results = client.upsert_users(users, parallelism=4, chunk_size=7)
+
+    assert len(results) == 51
+    assert all(isinstance(result, Success) for result in results[:50])
+    assert results[50].error is APIError.TooManyRequests
+    assert len(http_client.bodies) == 51
+
+    results = client.upsert_accounts([(account, properties), (account, None)])
+
+    assert results[0].error is APIError.TooManyRequests
+    assert isinstance(results[1], Success)
+
+    results = client.upsert_users([user, (user, None), (user, Properties())])
+
+    assert [result.error for result in results[:2]] == [APIError.UnknownError] * 2
+    assert isinstance(results[2], Success)
+    results = client.upsert_accounts([(user, None)])
+    assert results[0].error is APIError.UnknownError
+    with pytest.raises(JournyException):
+        client.upsert_accounts([(account, None)], timeout=0)
+
+
+def test_async_client_add_events():
+    client = AsyncClient(
+        AsyncHttpClientTesting(created_response),
+        Config("api-key", "https://api.journy.io"),
+    )
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(
+            client.add_events([event] * 5, parallelism=2, chunk_size=2)
+        )
+    finally:
+        loop.close()
+
+    assert [result.__str__() for result in results] == [
+        "Success(requestId, 4999, None)"
+    ] * 5
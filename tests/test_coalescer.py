@@ -0,0 +1,174 @@
+import json
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from journyio.account_identified import AccountIdentified
+from journyio.client import AsyncClient, Client, Config, Properties
+from journyio.coalescer import UpsertCoalescer
+from journyio.results import Failure, Success
+from journyio.user_identified import UserIdentified
+from journyio.utils import JournyException
+
+from .helpers import RecordingHttpClient
+
+
+def canonical(body: dict) -> str:
+    return json.dumps(body, sort_keys=True)
+
+
+def create_coalescer(http_client, **kwargs):
+    return UpsertCoalescer(Client(http_client, Config("api-key")), **kwargs)
+
+
+def test_coalescer_merges_upserts():
+    http_client = RecordingHttpClient()
+    coalescer = create_coalescer(http_client, window=60)
+    user = UserIdentified("user_id", "user@journy.io")
+
+    futures = [
+        coalescer.upsert_user(user, Properties(name="Journy", plan="free")),
+        coalescer.upsert_user(
+            UserIdentified("user_id", "user@journy.io"),
+            Properties(plan="pro", since=datetime(2020, 11, 2)),
+        ),
+        coalescer.upsert_user(UserIdentified.by_user_id("other"), Properties(a="b")),
+        coalescer.upsert_account(AccountIdentified.by_domain("journy.io")),
+        coalescer.upsert_account(
+            AccountIdentified.by_domain("journy.io"), Properties(seats=5)
+        ),
+    ]
+    assert coalescer.pending == 3
+    assert coalescer.coalesced == 2
+    assert http_client.bodies == []
+
+    assert coalescer.flush(5)
+    assert all(isinstance(future.result(0), Success) for future in futures)
+    assert futures[0].result(0) is futures[1].result(0)
+    assert coalescer.requests == 3
+    assert sorted(http_client.bodies, key=canonical) == sorted(
+        [
+            {
+                "identification": {"userId": "user_id", "email": "user@journy.io"},
+                "properties": {
+                    "name": "Journy",
+                    "plan": "pro",
+                    "since": "2020-11-02T00:00:00",
+                },
+            },
+            {"identification": {"userId": "other"}, "properties": {"a": "b"}},
+            {"identification": {"domain": "journy.io"}, "properties": {"seats": 5}},
+        ],
+        key=canonical,
+    )
+    coalescer.close()
+
+
+def test_coalescer_merges_upserts_that_share_an_identifier():
+    http_client = RecordingHttpClient()
+    coalescer = create_coalescer(http_client, window=60)
+
+    coalescer.upsert_user(UserIdentified("42", "user@journy.io"), Properties(a="1"))
+    coalescer.upsert_user(UserIdentified.by_user_id("42"), Properties(a="2"))
+    coalescer.upsert_user(UserIdentified.by_email("user@journy.io"), Properties(b="3"))
+    assert coalescer.pending == 1
+
+    coalescer.upsert_user(UserIdentified("42", "other@journy.io"), Properties(a="4"))
+    coalescer.upsert_user(UserIdentified.by_user_id("42"), Properties(a="5"))
+    assert coalescer.pending == 2
+
+    assert coalescer.flush(5)
+    assert http_client.bodies == [
+        {
+            "identification": {"userId": "42", "email": "user@journy.io"},
+            "properties": {"a": "2", "b": "3"},
+        },
+        {
+            "identification": {"userId": "42", "email": "other@journy.io"},
+            "properties": {"a": "5"},
+        },
+    ]
+    coalescer.close()
+
+
+def test_coalescer_sends_after_window():
+    http_client = RecordingHttpClient()
+    coalescer = create_coalescer(http_client, window=0.05)
+    properties = Properties(name="Journy")
+
+    future = coalescer.upsert_user(UserIdentified.by_user_id("user_id"), properties)
+    properties["name"] = "changed"
+
+    assert isinstance(future.result(5), Success)
+    assert http_client.bodies[0]["properties"] == {"name": "Journy"}
+    coalescer.close()
+
+
+def test_coalescer_close():
+    http_client = RecordingHttpClient()
+    coalescer = create_coalescer(http_client, window=60)
+
+    future = coalescer.upsert_account(AccountIdentified.by_account_id("account_id"))
+    coalescer.close()
+
+    assert isinstance(future.result(0), Success)
+    with pytest.raises(JournyException):
+        coalescer.upsert_account(AccountIdentified.by_account_id("account_id"))
+
+
+def test_coalescer_validation():
+    client = Client(RecordingHttpClient(), Config("api-key"))
+
+    with pytest.raises(JournyException):
+        UpsertCoalescer(client, window=0)
+    with pytest.raises(JournyException):
+        UpsertCoalescer(client, exit_timeout=0)
+    with pytest.raises(JournyException):
+        UpsertCoalescer(AsyncClient(RecordingHttpClient(), Config("api-key")))
+
+    coalescer = UpsertCoalescer(client)
+    with pytest.raises(JournyException):
+        coalescer.upsert_user(UserIdentified.by_user_id("user_id"), {"a": "b"})
+    coalescer.close()
+
+
+def test_coalescer_close_timeout():
+    gate = threading.Event()
+    http_client = RecordingHttpClient(gate)
+    coalescer = create_coalescer(http_client, window=60)
+
+    # The same user id with different emails can not be merged, so every upsert is sent after the previous one.
+    futures = [
+        coalescer.upsert_user(UserIdentified("user_id", f"{i}@journy.io"), Properties())
+        for i in range(3)
+    ]
+    started_at = time.monotonic()
+    coalescer.close(0.2)
+
+    assert time.monotonic() - started_at < 2
+    gate.set()
+    assert coalescer.flush(5)
+    assert len(http_client.requests) == 1
+    assert coalescer.dropped == 2
+    with pytest.raises(JournyException):
+        futures[-1].result(0)
+
+
+def test_coalescer_close_stops_after_failures():
+    coalescer = create_coalescer(RecordingHttpClient(fail_after=0), window=60)
+
+    futures = [
+        coalescer.upsert_user(UserIdentified("user_id", f"{i}@journy.io"), Properties())
+        for i in range(10)
+    ]
+    coalescer.close()
+
+    failures = UpsertCoalescer.MAX_CLOSE_FAILURES
+    assert all(isinstance(future.result(0), Failure) for future in futures[:failures])
+    for future in futures[failures:]:
+        with pytest.raises(JournyException):
+            future.result(0)
+    assert coalescer.dropped == 10 - failures
+    assert coalescer.coalesced == 0
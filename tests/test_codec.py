@@ -0,0 +1,130 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from journyio.account_identified import AccountIdentified
+from journyio.client import Client, Config, Properties
+from journyio.codec import (
+    JsonCodec,
+    StdlibJsonCodec,
+    OrjsonCodec,
+    UjsonCodec,
+    default_codec,
+    fastest_codec,
+)
+from journyio.events import Event, Metadata
+from journyio.httpclient import HttpClientTesting
+from journyio.user_identified import UserIdentified
+from journyio.utils import JournyException
+
+from .helpers import create_response
+
+response = create_response(201)
+
+user = UserIdentified("user_id", "émile@journy.io")
+account = AccountIdentified("account_id", "www.journy.io")
+metadata = Metadata()
+metadata["true"] = True
+metadata["key"] = 'quote " value'
+properties = Properties()
+properties["name"] = "Journy"
+properties["tags"] = ["a", "b"]
+properties["since"] = datetime(2020, 11, 2, 13, 37, 40)
+properties["deleted"] = None
+
+
+def send_all(client: Client, http_client: HttpClientTesting) -> list:
+    calls = [
+        lambda: client.add_event(
+            Event.for_user_in_account("login", user, account)
+            .happened_at(datetime(2020, 11, 2, 13, 37, 40, 123456))
+            .with_metadata(metadata)
+        ),
+        lambda: client.add_event(Event.for_account("login", account)),
+        lambda: client.upsert_user(user, properties),
+        lambda: client.delete_user(user),
+        lambda: client.upsert_account(account, properties),
+        lambda: client.delete_account(account),
+        lambda: client.add_users_to_account(account, [user, user]),
+        lambda: client.remove_users_from_account(account, [user]),
+        lambda: client.link(user, "device_id"),
+    ]
+    bodies = []
+    for call in calls:
+        call()
+        bodies.append(http_client.received_request.body)
+    return bodies
+
+
+def assert_matches_stdlib(codec: JsonCodec):
+    stdlib_http_client = HttpClientTesting(response)
+    stdlib_client = Client(
+        stdlib_http_client, Config("api-key", codec=StdlibJsonCodec())
+    )
+    http_client = HttpClientTesting(response)
+    client = Client(http_client, Config("api-key", codec=codec))
+
+    for stdlib_body, body in zip(
+        send_all(stdlib_client, stdlib_http_client), send_all(client, http_client)
+    ):
+        assert json.loads(body) == json.loads(stdlib_body)
+        assert codec.loads(body) == json.loads(stdlib_body)
+
+
+def assert_supports_big_integers(codec: JsonCodec):
+    http_client = HttpClientTesting(response)
+    client = Client(http_client, Config("api-key", codec=codec))
+    big = Properties()
+    big["count"] = 2**70
+
+    client.upsert_user(user, big)
+
+    assert json.loads(http_client.received_request.body)["properties"] == {
+        "count": 2**70
+    }
+
+
+class BrokenCodec(StdlibJsonCodec):
+    def dumps(self, value):
+        raise TypeError("Object is not JSON serializable")
+
+
+def test_stdlib_codec():
+    codec = StdlibJsonCodec()
+
+    assert codec.dumps({"a": [1, "b"]}) == '{"a": [1, "b"]}'
+    assert codec.loads(b'{"a": [1, "b"]}') == {"a": [1, "b"]}
+    assert codec.loads('{"a": null}') == {"a": None}
+
+
+def test_orjson_codec():
+    pytest.importorskip("orjson")
+
+    assert isinstance(fastest_codec(), OrjsonCodec)
+    assert_matches_stdlib(OrjsonCodec())
+    assert_supports_big_integers(OrjsonCodec())
+
+
+def test_ujson_codec():
+    pytest.importorskip("ujson")
+
+    assert_matches_stdlib(UjsonCodec())
+    assert_supports_big_integers(UjsonCodec())
+
+
+def test_config_codec():
+    assert isinstance(default_codec(), StdlibJsonCodec)
+    assert isinstance(Config("api-key").codec, StdlibJsonCodec)
+
+    with pytest.raises(JournyException):
+        Config("api-key", codec="json")
+
+
+def test_codec_errors():
+    client = Client(HttpClientTesting(response), Config("api-key", codec=BrokenCodec()))
+
+    with pytest.raises(JournyException):
+        client.upsert_user(user, properties)
+    with pytest.raises(JournyException):
+        client.add_event(Event.for_account("login", account))
@@ -0,0 +1,168 @@
+import asyncio
+import gzip
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from journyio.account_identified import AccountIdentified
+from journyio.client import Client, Config
+from journyio.compression import (
+    DeflateCompressor,
+    GzipCompressor,
+    RequestCompression,
+    ZstdCompressor,
+)
+from journyio.httpclient import (
+    AsyncHttpClientAiohttp,
+    HttpClientHttpx,
+    HttpClientRequests,
+    HttpHeaders,
+    HttpRequest,
+    Method,
+)
+from journyio.user_identified import UserIdentified
+from journyio.utils import JournyException
+
+from .helpers import ThreadingHTTPServer
+
+
+def test_request_compression():
+    compression = RequestCompression(threshold=100)
+    shared = {"content-type": "application/json"}
+
+    headers, body = compression.apply(shared, "{}")
+    assert headers == {
+        "content-type": "application/json",
+        "accept-encoding": "gzip, deflate",
+    }
+    assert body == b"{}"
+
+    data = json.dumps({"users": ["user@journy.io"] * 100})
+    headers, body = compression.apply(shared, data)
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body).decode() == data
+    assert shared == {"content-type": "application/json"}
+    assert compression.compressed == 1
+    assert compression.bytes_in == len(data)
+    assert compression.ratio < 0.1
+
+    assert compression.apply(shared, None) == (
+        {"content-type": "application/json", "accept-encoding": "gzip, deflate"},
+        None,
+    )
+
+
+def test_compressors():
+    data = b'{"plan": "pro"}' * 100
+    assert gzip.decompress(GzipCompressor(9).compress(data)) == data
+    assert zlib.decompress(DeflateCompressor(1).compress(data)) == data
+
+    with pytest.raises(JournyException):
+        GzipCompressor(10)
+    with pytest.raises(JournyException):
+        RequestCompression(threshold=-1)
+    with pytest.raises(JournyException):
+        RequestCompression(compressor=gzip)
+
+
+def test_zstd_compressor():
+    zstandard = pytest.importorskip("zstandard")
+    data = b'{"plan": "pro"}' * 100
+
+    assert (
+        zstandard.ZstdDecompressor().decompress(ZstdCompressor().compress(data)) == data
+    )
+
+
+class DecompressingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        encoding = self.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            data = gzip.decompress(data)
+        body = json.dumps(
+            {
+                "encoding": encoding,
+                "accept": self.headers.get("Accept-Encoding"),
+                "users": len(json.loads(data).get("users", [])),
+                "meta": {"requestId": "requestId"},
+            }
+        ).encode()
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Remaining", "4999")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DecompressingHandler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_sends_compressed_bodies(server_url):
+    compression = RequestCompression(threshold=1024)
+    http_client = HttpClientRequests(compression=compression)
+    client = Client(http_client, Config("api-key", server_url))
+    account = AccountIdentified.by_account_id("account_id")
+    users = [UserIdentified.by_user_id(f"user-{i}") for i in range(1000)]
+
+    assert client.add_users_to_account(account, users).request_id == "requestId"
+    assert client.add_users_to_account(account, users[:1]).request_id == "requestId"
+    http_client.close()
+
+    assert compression.compressed == 1
+    assert compression.bytes_out < compression.bytes_in / 5
+
+
+@pytest.mark.parametrize("transport", ["requests", "aiohttp", "httpx"])
+def test_transports_compress(server_url, transport):
+    compression = RequestCompression(threshold=10)
+    body = json.dumps({"users": ["user@journy.io"] * 10})
+    request = HttpRequest(
+        server_url + "/accounts/users/add", Method.POST, HttpHeaders(), body
+    )
+
+    if transport == "requests":
+        http_client = HttpClientRequests(compression=compression)
+        response = http_client.send(request)
+        http_client.close()
+    elif transport == "aiohttp":
+        pytest.importorskip("aiohttp")
+        http_client = AsyncHttpClientAiohttp(compression=compression)
+
+        async def send():
+            try:
+                return await http_client.send(request)
+            finally:
+                await http_client.close()
+
+        loop = asyncio.new_event_loop()
+        try:
+            response = loop.run_until_complete(send())
+        finally:
+            loop.close()
+    else:
+        pytest.importorskip("httpx")
+        http_client = HttpClientHttpx(compression=compression)
+        response = http_client.send(request)
+        http_client.close()
+
+    assert response.body["encoding"] == "gzip"
+    assert response.body["accept"] == "gzip, deflate"
+    assert response.body["users"] == 10
+    assert request.headers.headers == {}
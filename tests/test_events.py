@@ -27,6 +27,18 @@ def test_metadata():
     assert metadata2["new"] == "value"
     assert metadata["doesexist"] == "hallo"
     assert metadata["thistoo"]
+    assert metadata.metadata is metadata
+    assert dict(metadata) == {
+        "doesexist": "hallo",
+        "doesexisttoo": 2,
+        "thistoo": True,
+        "new": "value",
+    }
+
+    assert Metadata.from_dict({" Plan ": "pro"}, seats=5) == {"plan": "pro", "seats": 5}
+    with pytest.raises(JournyException):
+        metadata.update({"plan": "pro", "tags": ["a"]})
+    assert "plan" not in metadata
 
 
 def test_event():
@@ -71,3 +83,16 @@ def test_event():
 
     with pytest.raises(JournyException):
         Event("login", 1234, 1234, None, Metadata())
+
+    with pytest.raises(JournyException):
+        Event.for_user(None, user)
+    with pytest.raises(JournyException):
+        Event.for_account("login", user)
+    with pytest.raises(JournyException):
+        event_1.happened_at("2020-11-02")
+    with pytest.raises(JournyException):
+        event_1.with_metadata({"key": "value"})
+
+    assert not hasattr(event_1, "__dict__")
+    assert not hasattr(user, "__dict__")
+    assert not hasattr(account, "__dict__")
@@ -0,0 +1,118 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import pytest
+
+from journyio.account_identified import AccountIdentified
+from journyio.client import AsyncClient, Client, Config, Properties
+from journyio.events import Event
+from journyio.executor import FutureClient, all_succeeded, gather
+from journyio.httpclient import AsyncHttpClientTesting, HttpClient, HttpResponse, Method
+from journyio.results import Failure, Success
+from journyio.user_identified import UserIdentified
+from journyio.utils import JournyException
+
+from .helpers import create_response, headers
+
+user = UserIdentified("user_id", "user@journy.io")
+account = AccountIdentified("account_id", "journy.io")
+
+
+class SlowHttpClient(HttpClient):
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def send(self, request):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        if request.url.endswith("/users"):
+            return create_response(404)
+        if request.method is Method.GET:
+            return HttpResponse(
+                200,
+                headers,
+                {
+                    "data": {"permissions": ["TrackData"]},
+                    "meta": {"requestId": "requestId"},
+                },
+            )
+        return create_response(201)
+
+
+def test_calls_overlap():
+    http_client = SlowHttpClient(0.1)
+    client = FutureClient(Client(http_client, Config("api-key")), max_workers=5)
+
+    started = time.monotonic()
+    results = gather(
+        [
+            client.upsert_user(user, Properties(plan="pro")),
+            client.upsert_account(account, Properties(seats=5)),
+            client.add_users_to_account(account, [user]),
+            client.add_event(Event.for_user("login", user)),
+            client.get_api_key_details(),
+        ]
+    )
+    elapsed = time.monotonic() - started
+    client.close()
+
+    assert elapsed < 0.4
+    assert http_client.max_in_flight == 5
+    assert all_succeeded(results)
+    assert results[4].data.permissions == ["TrackData"]
+    assert client.pending == 0
+
+
+def test_failures_and_exceptions():
+    client = FutureClient(Client(SlowHttpClient(0.0), Config("api-key")))
+
+    failure, error = gather(
+        [client.delete_user(user), client.add_event("not an event")],
+        return_exceptions=True,
+    )
+    assert isinstance(failure, Failure)
+    assert isinstance(error, JournyException)
+    assert not all_succeeded([failure])
+
+    with pytest.raises(JournyException):
+        gather([client.link(user, 123)])
+    client.close()
+
+
+def test_max_pending_and_timeout():
+    http_client = SlowHttpClient(0.05)
+    executor = ThreadPoolExecutor(max_workers=4)
+    client = FutureClient(
+        Client(http_client, Config("api-key")), max_pending=2, executor=executor
+    )
+
+    futures = [client.add_event(Event.for_user("login", user)) for _ in range(6)]
+    assert client.pending <= 2
+    assert http_client.max_in_flight <= 2
+    assert all(isinstance(result, Success) for result in gather(futures))
+
+    with pytest.raises(TimeoutError):
+        gather([client.get_api_key_details()], timeout=0.001)
+
+    client.close()
+    assert executor.submit(lambda: 1).result() == 1
+    executor.shutdown()
+
+
+def test_validation():
+    with pytest.raises(JournyException):
+        FutureClient(
+            AsyncClient(AsyncHttpClientTesting(HttpResponse()), Config("api-key"))
+        )
+    with pytest.raises(JournyException):
+        FutureClient(Client(SlowHttpClient(0.0), Config("api-key")), max_workers=0)
+    with pytest.raises(JournyException):
+        FutureClient(Client(SlowHttpClient(0.0), Config("api-key")), executor=object())
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from journyio.client import AsyncClient, Client, Config, Properties
+from journyio.hooks import Histogram, HistogramCollector, Hooks
+from journyio.httpclient import (
+    AsyncHttpClientTesting,
+    HttpClientRequests,
+    HttpClientTesting,
+)
+from journyio.retry import RetryPolicy
+from journyio.user_identified import UserIdentified
+from journyio.utils import APIError, JournyException
+
+from .helpers import (
+    SequenceHttpClient,
+    ThreadingHTTPServer,
+    create_response,
+    created_response,
+)
+
+user = UserIdentified("user_id", "user@journy.io")
+
+
+class RecordingHooks(Hooks):
+    def __init__(self):
+        self.spans = []
+
+    def on_span(self, span):
+        self.spans.append(span)
+
+
+class FailingHooks(Hooks):
+    def on_span(self, span):
+        raise ValueError("broken hook")
+
+
+def test_histogram():
+    histogram = Histogram((1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0, 10.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.count == 5
+    assert histogram.sum == 16.5
+    assert histogram.quantile(0.5) == pytest.approx(1.75)
+    assert histogram.quantile(1.0) == 4.0
+    assert Histogram().quantile(0.5) is None
+
+    with pytest.raises(JournyException):
+        Histogram((2.0, 1.0))
+
+
+def test_client_emits_spans():
+    hooks = RecordingHooks()
+    collector = HistogramCollector()
+    client = Client(
+        HttpClientTesting(created_response),
+        Config("api-key", hooks=[FailingHooks(), hooks, collector]),
+    )
+
+    assert client.upsert_user(user, Properties(plan="pro")).request_id == "requestId"
+    client.delete_user(user)
+
+    upsert, delete = hooks.spans
+    assert upsert.endpoint == "POST /users/upsert"
+    assert delete.endpoint == "DELETE /users"
+    assert upsert.status_code == 201
+    assert upsert.calls_remaining == 4999
+    assert upsert.serialization > 0
+    assert upsert.duration >= upsert.serialization
+    assert (upsert.retries, upsert.error, upsert.network) == (0, None, None)
+
+    assert collector.endpoints == ["DELETE /users", "POST /users/upsert"]
+    assert collector.calls["POST /users/upsert"] == 1
+    assert collector.histogram("POST /users/upsert").count == 1
+    assert collector.histogram("POST /users/upsert", "network") is None
+    assert set(collector.snapshot()["POST /users/upsert"]) == {
+        "duration",
+        "serialization",
+        "queueing",
+    }
+
+
+def test_span_retries_and_errors():
+    hooks = RecordingHooks()
+    http_client = SequenceHttpClient(
+        [
+            create_response(503),
+            create_response(404),
+            JournyException("Connection refused"),
+        ]
+    )
+    client = Client(
+        http_client,
+        Config(
+            "api-key",
+            retry_policy=RetryPolicy(max_attempts=2, base_delay=0.001),
+            hooks=[hooks],
+        ),
+    )
+
+    client.get_api_key_details()
+    with pytest.raises(JournyException):
+        client.get_tracking_snippet("journy.io")
+
+    failure, error = hooks.spans
+    assert failure.endpoint == "GET /validate"
+    assert (failure.retries, failure.status_code) == (1, 404)
+    assert failure.error is APIError.NotFoundError
+    assert failure.serialization == 0.0
+    assert isinstance(error.error, JournyException)
+    assert error.status_code is None
+
+
+class CreatedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"meta": {"requestId": "requestId"}}).encode()
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Remaining", "4999")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_network_timings():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CreatedHandler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    hooks = RecordingHooks()
+    http_client = HttpClientRequests()
+    client = Client(
+        http_client,
+        Config(
+            "api-key", f"http://127.0.0.1:{server.server_address[1]}", hooks=[hooks]
+        ),
+    )
+
+    client.upsert_user(user, Properties(plan="pro"))
+    client.upsert_user(user, Properties(plan="pro"))
+    http_client.close()
+    server.shutdown()
+    server.server_close()
+
+    first, second = hooks.spans
+    assert first.connect is not None
+    assert second.connect is None
+    assert 0 < first.ttfb <= first.network <= first.duration
+    assert first.response_size == len(
+        json.dumps({"meta": {"requestId": "requestId"}}).encode()
+    )
+
+
+def test_async_client_emits_spans():
+    hooks = RecordingHooks()
+    client = AsyncClient(
+        AsyncHttpClientTesting(created_response), Config("api-key", hooks=[hooks])
+    )
+
+    async def main():
+        await asyncio.gather(
+            *[client.upsert_user(user, Properties(plan="pro")) for _ in range(3)]
+        )
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+    assert len(hooks.spans) == 3
+    assert all(span.serialization > 0 for span in hooks.spans)
+
+
+def test_hooks_validation():
+    with pytest.raises(JournyException):
+        Config("api-key", hooks=RecordingHooks())
+    with pytest.raises(JournyException):
+        Config("api-key", hooks=[lambda span: None])
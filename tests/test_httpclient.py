@@ -1,4 +1,11 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
 import pytest
+from requests.structures import CaseInsensitiveDict
 
 from journyio.httpclient import (
     HttpHeaders,
@@ -7,8 +14,15 @@ from journyio.httpclient import (
     HttpClientRequests,
     Method,
     HttpClientTesting,
+    AsyncHttpClientAiohttp,
+    AsyncHttpClientHttpx,
+    AsyncHttpClientTesting,
+    HttpClientHttpx,
+    ResponseHeaders,
 )
-from journyio.utils import JournyException
+from journyio.utils import JournyException, JournyTimeoutException
+
+from .helpers import ThreadingHTTPServer
 
 
 def test_http_headers():
@@ -30,6 +44,27 @@ def test_http_headers():
     assert headers["thistoo"] == ["a", "b"]
 
 
+def test_response_headers():
+    source = CaseInsensitiveDict(
+        {"X-RateLimit-Remaining": "4999", "Content-Type": "application/json"}
+    )
+    headers = ResponseHeaders(source)
+    assert headers["x-ratelimit-remaining"] == "4999"
+    assert headers[" Content-Type "] == "application/json"
+    assert headers["doesnotexist"] is None
+    assert isinstance(headers, HttpHeaders)
+    assert headers.headers == {
+        "x-ratelimit-remaining": "4999",
+        "content-type": "application/json",
+    }
+    with pytest.raises(JournyException):
+        headers["new"] = "value"
+    with pytest.raises(JournyException):
+        headers.union(HttpHeaders())
+    with pytest.raises(JournyException):
+        headers[2]
+
+
 def test_http_request():
     request = HttpRequest("https://journy.io", Method.GET, None, None)
 
@@ -68,6 +103,43 @@ def test_http_client():
 
     with pytest.raises(JournyException):
         client.send(123)
+    with pytest.raises(JournyException):
+        HttpClientRequests(pool_maxsize=0)
+    with pytest.raises(JournyException):
+        HttpClientRequests(connect_timeout="1")
+
+
+def test_http_client_pooled_session():
+    client = HttpClientRequests(
+        pool_connections=2, pool_maxsize=20, connect_timeout=1, read_timeout=5
+    )
+
+    session = client.session
+    assert client.session is session
+    adapter = session.get_adapter("https://api.journy.io")
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 20
+    assert client.timeout == (1, 5)
+
+    client.close()
+    assert client.session is not session
+    assert HttpClientRequests(keep_alive=False).session.headers["Connection"] == "close"
+
+
+def test_http_client_shared_across_threads():
+    client = HttpClientRequests()
+    sessions = []
+    threads = [
+        threading.Thread(target=lambda: sessions.append(client.session))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(sessions) == 8
+    assert all(session is sessions[0] for session in sessions)
 
 
 def test_http_client_testing():
@@ -81,3 +153,212 @@ def test_http_client_testing():
 
     assert response.__str__() == dummy_response.__str__()
     assert client.received_request.__str__() == dummy_request.__str__()
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.dumps(
+            {"path": self.path, "body": self.rfile.read(length).decode()}
+        ).encode()
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Remaining", "4999")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_DELETE(self):
+        self.send_response(204)
+        self.send_header("X-RateLimit-Remaining", "4998")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class SlowHandler(EchoHandler):
+    def do_POST(self):
+        time.sleep(0.5)
+        super().do_POST()
+
+
+@pytest.fixture
+def slow_server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_client_request_timeout(slow_server_url):
+    client = HttpClientRequests()
+    started = time.monotonic()
+    with pytest.raises(JournyTimeoutException):
+        client.send(
+            HttpRequest(
+                slow_server_url + "/track", Method.POST, HttpHeaders(), "{}", 0.1
+            )
+        )
+    assert time.monotonic() - started < 0.5
+    client.close()
+
+    with pytest.raises(JournyException):
+        HttpRequest(slow_server_url, Method.GET, HttpHeaders(), None, 0)
+
+
+def test_http_client_send(server_url):
+    client = HttpClientRequests()
+    response = client.send(
+        HttpRequest(server_url + "/track", Method.POST, HttpHeaders(), "{}")
+    )
+    client.close()
+
+    assert response.status_code == 201
+    assert response.headers["X-RateLimit-Remaining"] == "4999"
+    assert response.headers["x-ratelimit-remaining"] == "4999"
+    assert response.headers.headers["content-type"] == "application/json"
+    assert response.body == {"path": "/track", "body": "{}"}
+
+
+def test_http_client_send_no_content(server_url):
+    client = HttpClientRequests()
+    response = client.send(HttpRequest(server_url + "/users", Method.DELETE))
+    client.close()
+
+    assert response.status_code == 204
+    assert response.headers["X-RateLimit-Remaining"] == "4998"
+    assert response.body is None
+    assert response.timing.response_size == 0
+
+
+def test_async_http_client_testing():
+    dummy_response = HttpResponse(201, HttpHeaders(), {"message": "created"})
+    client = AsyncHttpClientTesting(dummy_response)
+    dummy_request = HttpRequest("/test", Method.POST, HttpHeaders(), None)
+
+    loop = asyncio.new_event_loop()
+    try:
+        response = loop.run_until_complete(client.send(dummy_request))
+    finally:
+        loop.close()
+
+    assert response is dummy_response
+    assert client.received_request is dummy_request
+
+
+def test_async_http_client_aiohttp(server_url):
+    pytest.importorskip("aiohttp")
+
+    client = AsyncHttpClientAiohttp(max_concurrency=4)
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *[
+                    client.send(
+                        HttpRequest(
+                            server_url + "/track", Method.POST, HttpHeaders(), str(i)
+                        )
+                    )
+                    for i in range(10)
+                ]
+            )
+        finally:
+            await client.close()
+
+    loop = asyncio.new_event_loop()
+    try:
+        responses = loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+    assert [response.status_code for response in responses] == [201] * 10
+    assert [response.body["body"] for response in responses] == [
+        str(i) for i in range(10)
+    ]
+    assert responses[0].headers["X-RateLimit-Remaining"] == "4999"
+
+    with pytest.raises(JournyException):
+        AsyncHttpClientAiohttp(max_concurrency=0)
+
+
+def test_http_client_httpx(server_url):
+    pytest.importorskip("httpx")
+
+    client = HttpClientHttpx(max_connections=4)
+    results = {}
+
+    def send(i: int):
+        results[i] = client.send(
+            HttpRequest(server_url + "/track", Method.POST, HttpHeaders(), str(i))
+        )
+
+    threads = [threading.Thread(target=send, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    client.close()
+
+    assert [results[i].body["body"] for i in range(8)] == [str(i) for i in range(8)]
+    assert results[0].status_code == 201
+    assert results[0].headers["X-RateLimit-Remaining"] == "4999"
+    assert results[0].timing.ttfb <= results[0].timing.total
+
+    with pytest.raises(JournyException):
+        client.send(HttpRequest(server_url + "/track", Method.GET, HttpHeaders()))
+    client.close()
+    with pytest.raises(JournyException):
+        HttpClientHttpx(http1=False, http2=False)
+    with pytest.raises(JournyException):
+        HttpClientHttpx(max_connections=0)
+
+
+def test_async_http_client_httpx(server_url):
+    pytest.importorskip("httpx")
+
+    client = AsyncHttpClientHttpx()
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *[
+                    client.send(
+                        HttpRequest(
+                            server_url + "/users/upsert",
+                            Method.POST,
+                            HttpHeaders(),
+                            str(i),
+                        )
+                    )
+                    for i in range(10)
+                ]
+            )
+        finally:
+            await client.close()
+
+    loop = asyncio.new_event_loop()
+    try:
+        responses = loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+    assert [response.body for response in responses] == [
+        {"path": "/users/upsert", "body": str(i)} for i in range(10)
+    ]
+    assert responses[0].timing.connect is not None
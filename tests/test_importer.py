@@ -0,0 +1,161 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from journyio.__main__ import main
+from journyio.client import Client, Config
+from journyio.importer import BulkImporter, ImportKind, read_csv, read_jsonl
+from journyio.memo import UpsertMemo
+from journyio.utils import JournyException
+
+from .helpers import RecordingHttpClient, ThreadingHTTPServer
+
+
+def write_users_csv(path, count: int):
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write("user_id,email,plan,seats\n")
+        for i in range(count):
+            file.write(f"user-{i},user-{i}@journy.io,pro,\n")
+
+
+def test_read_files(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    write_users_csv(csv_path, 3)
+    assert list(read_csv(str(csv_path), 1)) == [
+        {"user_id": "user-1", "email": "user-1@journy.io", "plan": "pro"},
+        {"user_id": "user-2", "email": "user-2@journy.io", "plan": "pro"},
+    ]
+
+    jsonl_path = tmp_path / "accounts.jsonl"
+    jsonl_path.write_text('{"account_id": 1}\nnot json\n\n{"domain": "journy.io"}\n')
+    assert list(read_jsonl(str(jsonl_path))) == [
+        {"account_id": 1},
+        None,
+        None,
+        {"domain": "journy.io"},
+    ]
+
+
+def test_importer_maps_records():
+    http_client = RecordingHttpClient()
+    importer = BulkImporter(
+        Client(http_client, Config("api-key")),
+        ImportKind.ACCOUNTS,
+        id_column="id",
+        property_columns=["name", "seats"],
+        chunk_size=2,
+    )
+
+    progress = importer.import_records(
+        [
+            {"id": 1, "name": "Journy", "seats": 5, "ignored": "value"},
+            {"domain": "journy.io"},
+            None,
+            {"name": "no identification"},
+            {"id": "2", "seats": 1.5},
+        ]
+    )
+
+    assert (progress.offset, progress.sent, progress.invalid) == (5, 2, 3)
+    assert sorted(http_client.bodies, key=json.dumps) == sorted(
+        [
+            {
+                "identification": {"accountId": "1"},
+                "properties": {"name": "Journy", "seats": 5},
+            },
+            {"identification": {"domain": "journy.io"}, "properties": {}},
+        ],
+        key=json.dumps,
+    )
+
+
+def test_importer_resumes_from_checkpoint(tmp_path):
+    path = tmp_path / "users.csv"
+    checkpoint = tmp_path / "users.checkpoint"
+    write_users_csv(path, 10)
+
+    http_client = RecordingHttpClient(fail_after=4)
+    progresses = []
+    importer = BulkImporter(
+        Client(http_client, Config("api-key")),
+        chunk_size=4,
+        parallelism=1,
+        checkpoint_path=str(checkpoint),
+        on_progress=lambda progress: progresses.append(progress.offset),
+    )
+    progress = importer.import_file(str(path))
+    assert progresses == [4, 8, 10]
+    assert (progress.sent, progress.failed) == (4, 6)
+
+    checkpoint.write_text(json.dumps({"path": str(path), "offset": 4}))
+    http_client.fail_after = None
+    progress = importer.import_file(str(path))
+    assert (progress.offset, progress.sent, progress.failed) == (10, 6, 0)
+    assert [body["identification"]["userId"] for body in http_client.bodies] == [
+        f"user-{i}" for i in range(10)
+    ]
+    assert http_client.bodies[0]["properties"] == {"plan": "pro"}
+
+    with pytest.raises(JournyException):
+        importer.import_file(str(tmp_path / "other.csv"))
+
+
+def test_importer_counts_skipped():
+    importer = BulkImporter(
+        Client(RecordingHttpClient(), Config("api-key", upsert_memo=UpsertMemo()))
+    )
+    records = [{"user_id": "user_id", "plan": "pro"}] * 3
+
+    progress = importer.import_records(records[:1])
+    assert progress.sent == 1
+    progress = importer.import_records(records[1:])
+    assert progress.skipped == 2
+
+
+def test_importer_validation():
+    client = Client(RecordingHttpClient(), Config("api-key"))
+
+    with pytest.raises(JournyException):
+        BulkImporter(client, "users")
+    with pytest.raises(JournyException):
+        BulkImporter(client, chunk_size=0)
+    with pytest.raises(JournyException):
+        BulkImporter(client, property_columns="name")
+
+
+class CreatedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"meta": {"requestId": "requestId"}}).encode()
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Remaining", "4999")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_cli_import(tmp_path, capsys, monkeypatch):
+    path = tmp_path / "users.csv"
+    write_users_csv(path, 5)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CreatedHandler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    monkeypatch.delenv("JOURNY_API_KEY", raising=False)
+    assert main(["import", "users", str(path)]) == 2
+
+    monkeypatch.setenv("JOURNY_API_KEY", "api-key")
+    root_url = f"http://127.0.0.1:{server.server_address[1]}"
+    assert main(["import", "users", str(path), "--root-url", root_url]) == 0
+    server.shutdown()
+    server.server_close()
+
+    assert "done: offset=5 sent=5" in capsys.readouterr().err
@@ -0,0 +1,119 @@
+import threading
+
+import pytest
+
+from journyio.client import AsyncClient, Client, Config
+from journyio.httpclient import AsyncHttpClientTesting
+from journyio.linker import BackgroundLinker
+from journyio.memo import LinkMemo
+from journyio.results import Success
+from journyio.tracker import OverflowPolicy
+from journyio.user_identified import UserIdentified
+from journyio.utils import JournyException
+
+from .helpers import RecordingHttpClient, created_response
+
+user = UserIdentified("user_id", "user@journy.io")
+
+
+def test_linker():
+    http_client = RecordingHttpClient()
+    memo = LinkMemo()
+    results = []
+    linker = BackgroundLinker(
+        Client(http_client, Config("api-key", link_memo=memo)),
+        workers=2,
+        on_result=lambda user, device_id, result: results.append(result),
+    )
+
+    for i in range(10):
+        assert linker.link(user, f"device-{i}")
+    assert linker.flush(5)
+
+    assert linker.queue_size == 0
+    assert len(http_client.requests) == 10
+    assert all(isinstance(result, Success) for result in results)
+    assert memo.size == 10
+
+    assert linker.link(user, "device-0")
+    assert linker.flush(5)
+    assert len(http_client.requests) == 10
+    assert memo.hits == 1
+    linker.close()
+
+
+def test_linker_coalesces_queued_links():
+    gate = threading.Event()
+    http_client = RecordingHttpClient(gate)
+    linker = BackgroundLinker(Client(http_client, Config("api-key")))
+
+    for _ in range(5):
+        assert linker.link(user, "device")
+    assert linker.link(user, "other device")
+    gate.set()
+    assert linker.flush(5)
+
+    assert len(http_client.requests) == 2
+    assert linker.coalesced == 4
+    linker.close()
+
+
+def test_linker_overflow_policies():
+    gate = threading.Event()
+    linker = BackgroundLinker(
+        Client(RecordingHttpClient(gate), Config("api-key")),
+        max_queue_size=2,
+        overflow_policy=OverflowPolicy.DROP_NEWEST,
+    )
+    results = [linker.link(user, f"device-{i}") for i in range(5)]
+    assert results.count(False) >= 2
+    assert linker.dropped == results.count(False)
+    gate.set()
+    linker.close()
+
+    gate = threading.Event()
+    linker = BackgroundLinker(
+        Client(RecordingHttpClient(gate), Config("api-key")),
+        max_queue_size=1,
+        overflow_policy=OverflowPolicy.RAISE,
+    )
+    with pytest.raises(JournyException):
+        for i in range(5):
+            linker.link(user, f"device-{i}")
+    gate.set()
+    linker.close()
+
+
+def test_linker_close():
+    http_client = RecordingHttpClient()
+    linker = BackgroundLinker(Client(http_client, Config("api-key")))
+    linker.link(user, "device")
+    linker.close()
+
+    assert len(http_client.requests) == 1
+    with pytest.raises(JournyException):
+        linker.link(user, "device")
+
+    with pytest.raises(JournyException):
+        BackgroundLinker(
+            AsyncClient(AsyncHttpClientTesting(created_response), Config("api-key"))
+        )
+    with pytest.raises(JournyException):
+        BackgroundLinker(Client(http_client, Config("api-key")), workers=0)
+
+
+def test_linker_close_stops_after_failures():
+    gate = threading.Event()
+    results = []
+    linker = BackgroundLinker(
+        Client(RecordingHttpClient(gate, fail_after=0), Config("api-key")),
+        on_result=lambda user, device_id, result: results.append(result),
+    )
+
+    for i in range(10):
+        linker.link(user, f"device-{i}")
+    threading.Timer(0.1, gate.set).start()
+    linker.close()
+
+    assert len(results) == BackgroundLinker.MAX_CLOSE_FAILURES
+    assert linker.dropped == 10 - BackgroundLinker.MAX_CLOSE_FAILURES
@@ -0,0 +1,225 @@
+import asyncio
+import time
+
+import pytest
+
+from journyio.account_identified import AccountIdentified
+from journyio.client import AsyncClient, Client, Config, Properties
+from journyio.httpclient import AsyncHttpClientTesting, HttpClientTesting
+from journyio.memo import LinkMemo, UpsertMemo, user_keys
+from journyio.results import Failure, Skipped, Success
+from journyio.user_identified import UserIdentified
+from journyio.utils import JournyException
+
+from .helpers import create_response, created_response
+
+failed_response = create_response(500)
+user = UserIdentified("user_id", "user@journy.io")
+account = AccountIdentified("account_id", "www.journy.io")
+
+
+class CountingHttpClient(HttpClientTesting):
+    def __init__(self, response):
+        super().__init__(response)
+        self.sent = 0
+
+    def send(self, request):
+        self.sent += 1
+        return super().send(request)
+
+
+def test_memo():
+    memo = UpsertMemo(max_size=2, ttl=0.05)
+    digest = memo.digest('{"a": 1}')
+    keys = user_keys(user)
+
+    assert not memo.unchanged(keys, digest)
+    memo.remember(keys, digest)
+    assert memo.unchanged(keys, digest)
+    assert not memo.unchanged(keys, memo.digest(b'{"a": 2}'))
+    assert memo.skipped == 1
+
+    memo.forget([("email", "user@journy.io")])
+    assert not memo.unchanged(keys, digest)
+
+    memo.remember(keys, digest)
+    memo.remember([("user_id", "other")], digest)
+    assert memo.size == 2
+    assert memo.evictions == 1
+
+    time.sleep(0.06)
+    assert not memo.unchanged([("user_id", "other")], digest)
+
+    with pytest.raises(JournyException):
+        UpsertMemo(max_size=0)
+
+
+def test_client_skips_unchanged_upserts():
+    http_client = CountingHttpClient(created_response)
+    memo = UpsertMemo()
+    client = Client(http_client, Config("api-key", upsert_memo=memo))
+
+    first = client.upsert_user(user, Properties(plan="pro"))
+    second = client.upsert_user(user, Properties(plan="pro"))
+    changed = client.upsert_user(user, Properties(plan="free"))
+
+    assert type(first) is Success
+    assert isinstance(second, Skipped)
+    assert isinstance(second, Success)
+    assert second.request_id is None
+    assert type(changed) is Success
+    assert http_client.sent == 2
+
+    assert isinstance(client.upsert_account(account, None), Success)
+    assert isinstance(client.upsert_account(account, None), Skipped)
+    client.delete_account(account)
+    assert type(client.upsert_account(account, None)) is Success
+
+    client.delete_user(UserIdentified.by_email("user@journy.io"))
+    assert type(client.upsert_user(user, Properties(plan="free"))) is Success
+    assert memo.skipped == 2
+
+    results = client.upsert_users([(user, Properties(plan="free"))] * 3)
+    assert all(isinstance(result, Skipped) for result in results)
+
+
+def test_memo_shared_by_api_keys():
+    http_client = CountingHttpClient(created_response)
+    memo = UpsertMemo()
+    first = Client(http_client, Config("api-key", upsert_memo=memo))
+    second = Client(http_client, Config("other-api-key", upsert_memo=memo))
+
+    assert type(first.upsert_user(user, Properties(plan="pro"))) is Success
+    assert type(second.upsert_user(user, Properties(plan="pro"))) is Success
+    assert isinstance(second.upsert_user(user, Properties(plan="pro")), Skipped)
+    assert http_client.sent == 2
+
+
+def test_client_does_not_remember_failures():
+    http_client = CountingHttpClient(failed_response)
+    client = Client(http_client, Config("api-key", upsert_memo=UpsertMemo()))
+
+    assert isinstance(client.upsert_user(user, Properties(plan="pro")), Failure)
+    assert isinstance(client.upsert_user(user, Properties(plan="pro")), Failure)
+    assert http_client.sent == 2
+
+
+def test_async_client_skips_unchanged_upserts():
+    client = AsyncClient(
+        AsyncHttpClientTesting(created_response),
+        Config("api-key", upsert_memo=UpsertMemo()),
+    )
+
+    async def main():
+        return [
+            await client.upsert_user(user, Properties(plan="pro")),
+            await client.upsert_user(user, Properties(plan="pro")),
+        ]
+
+    loop = asyncio.new_event_loop()
+    try:
+        first, second = loop.run_until_complete(main())
+    finally:
+        loop.close()
+    assert type(first) is Success
+    assert isinstance(second, Skipped)
+
+
+def test_link_memo():
+    memo = LinkMemo(max_size=2, ttl=0.05)
+    key = memo.key(user, "device")
+
+    assert key == LinkMemo.key(UserIdentified("user_id", "user@journy.io"), "device")
+    assert key != memo.key(user, "other device")
+    assert key != memo.key(UserIdentified.by_user_id("user_id"), "device")
+    assert key != memo.key(user, "device", "scope")
+    assert not memo.linked(key)
+    memo.remember(key)
+    assert memo.linked(key)
+    assert memo.hits == 1
+    assert memo.misses == 1
+    assert memo.hit_rate == 0.5
+
+    memo.remember(memo.key(user, "device 2"))
+    memo.remember(memo.key(user, "device 3"))
+    assert memo.size == 2
+    assert memo.evictions == 1
+    assert not memo.linked(key)
+    assert memo.memory_bytes > 2 * LinkMemo.ENTRY_BYTES
+
+    time.sleep(0.06)
+    assert not memo.linked(memo.key(user, "device 3"))
+    assert memo.size == 1
+
+    other = UserIdentified.by_email("other@journy.io")
+    memo.remember(memo.key(user, "device"), LinkMemo.identifier_keys(user))
+    memo.remember(memo.key(other, "device"), LinkMemo.identifier_keys(other))
+    memo.forget(LinkMemo.identifier_keys(UserIdentified.by_user_id("user_id")))
+    assert memo.size == 1
+    assert memo.linked(memo.key(other, "device"))
+    assert LinkMemo.identifier_keys(user) != LinkMemo.identifier_keys(user, "scope")
+
+
+def test_client_skips_recent_links():
+    http_client = CountingHttpClient(created_response)
+    memo = LinkMemo()
+    client = Client(http_client, Config("api-key", link_memo=memo))
+
+    assert type(client.link(user, "device")) is Success
+    assert isinstance(client.link(user, "device"), Skipped)
+    assert type(client.link(user, "other device")) is Success
+    assert http_client.sent == 2
+
+    other = UserIdentified.by_user_id("other_user_id")
+    assert type(client.link(other, "device")) is Success
+    client.delete_user(user)
+    assert memo.size == 1
+    assert isinstance(client.link(other, "device"), Skipped)
+    assert type(client.link(user, "device")) is Success
+
+    client = Client(
+        CountingHttpClient(failed_response), Config("api-key", link_memo=memo)
+    )
+    assert isinstance(client.link(user, "new device"), Failure)
+    assert isinstance(client.link(user, "new device"), Failure)
+    assert isinstance(client.delete_user(user), Failure)
+    assert isinstance(client.link(user, "device"), Skipped)
+
+    http_client = CountingHttpClient(created_response)
+    client = Client(http_client, Config("other-api-key", link_memo=memo))
+    assert type(client.link(user, "device")) is Success
+    assert http_client.sent == 1
+
+
+def test_async_client_skips_recent_links():
+    client = AsyncClient(
+        AsyncHttpClientTesting(created_response),
+        Config("api-key", link_memo=LinkMemo()),
+    )
+
+    async def main():
+        return [
+            await client.link(user, "device"),
+            await client.link(user, "device"),
+            await client.delete_user(user),
+            await client.link(user, "device"),
+        ]
+
+    loop = asyncio.new_event_loop()
+    try:
+        first, second, deleted, third = loop.run_until_complete(main())
+    finally:
+        loop.close()
+    assert type(first) is Success
+    assert isinstance(second, Skipped)
+    assert type(deleted) is Success
+    assert type(third) is Success
+
+
+def test_memo_validation():
+    with pytest.raises(JournyException):
+        Config("api-key", upsert_memo={})
+    with pytest.raises(JournyException):
+        Config("api-key", link_memo=UpsertMemo())
+    with pytest.raises(JournyException):
+        LinkMemo(ttl=0)
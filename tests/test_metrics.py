@@ -0,0 +1,99 @@
+import pytest
+
+from journyio.client import Client, Config, Properties
+from journyio.metrics import Metrics, escape_label, format_labels
+from journyio.retry import RetryPolicy
+from journyio.tracker import BufferedTracker
+from journyio.user_identified import UserIdentified
+from journyio.utils import JournyException
+
+from .helpers import SequenceHttpClient, create_response
+
+user = UserIdentified("user_id", "user@journy.io")
+
+
+def samples(text: str) -> dict:
+    lines = text.splitlines()
+    assert lines[-1] == "# EOF"
+    return dict(line.rsplit(" ", 1) for line in lines if not line.startswith("#"))
+
+
+def test_metrics_render():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    client = Client(
+        SequenceHttpClient(
+            [
+                create_response(201),
+                create_response(503),
+                create_response(401),
+                JournyException("Connection refused"),
+            ]
+        ),
+        Config(
+            "api-key",
+            retry_policy=RetryPolicy(max_attempts=2, base_delay=0.001),
+            hooks=[metrics],
+        ),
+    )
+
+    client.upsert_user(user, Properties(plan="pro"))
+    client.upsert_user(user, Properties(plan="free"))
+    with pytest.raises(JournyException):
+        client.delete_user(user)
+
+    values = samples(metrics.render())
+    upsert = 'endpoint="POST /users/upsert"'
+    assert values["journyio_requests_total{" + upsert + ',status="201"}'] == "1"
+    assert values["journyio_requests_total{" + upsert + ',status="401"}'] == "1"
+    assert (
+        values['journyio_requests_total{endpoint="DELETE /users",status="none"}'] == "1"
+    )
+    assert (
+        values["journyio_errors_total{" + upsert + ',error="UnauthorizedError"}'] == "1"
+    )
+    assert (
+        values['journyio_errors_total{endpoint="DELETE /users",error="exception"}']
+        == "1"
+    )
+    assert values["journyio_retries_total{" + upsert + "}"] == "1"
+    assert (
+        values["journyio_request_duration_seconds_bucket{" + upsert + ',le="1.0"}']
+        == "2"
+    )
+    assert (
+        values["journyio_request_duration_seconds_bucket{" + upsert + ',le="+Inf"}']
+        == "2"
+    )
+    assert values["journyio_request_duration_seconds_count{" + upsert + "}"] == "2"
+    assert float(values["journyio_request_duration_seconds_sum{" + upsert + "}"]) > 0
+    assert values["journyio_rate_limit_remaining"] == "4999"
+    assert metrics.rate_limit_remaining == 4999
+
+
+def test_metrics_gauges():
+    metrics = Metrics(namespace="app")
+    tracker = BufferedTracker(Client(SequenceHttpClient([]), Config("api-key")))
+    metrics.watch_queue("tracker", tracker)
+    metrics.register_gauge("answer", "The answer.", lambda: 42)
+
+    text = metrics.render()
+    assert "# TYPE app_tracker_depth gauge" in text
+    assert samples(text)["app_tracker_depth"] == "0"
+    assert samples(text)["app_answer"] == "42"
+    assert "app_rate_limit_remaining" not in samples(text)
+    tracker.close()
+
+    with pytest.raises(JournyException):
+        metrics.watch_queue("list", [])
+    with pytest.raises(JournyException):
+        metrics.register_gauge("not a name", "", lambda: 0)
+    with pytest.raises(JournyException):
+        Metrics(namespace="journy.io")
+    with pytest.raises(JournyException):
+        Metrics(buckets=(1.0, 0.1))
+
+
+def test_label_escaping():
+    assert escape_label('a "quoted"\\path\n') == 'a \\"quoted\\"\\\\path\\n'
+    assert format_labels({}) == ""
+    assert format_labels({"a": 1, "b": "x"}) == '{a="1",b="x"}'
@@ -0,0 +1,177 @@
+import gc
+import os
+import threading
+import time
+
+import pytest
+
+from journyio.client import Client, Config
+from journyio.events import Event
+from journyio.executor import FutureClient
+from journyio.httpclient import HttpClientRequests
+from journyio import process, spool
+from journyio.process import HAS_AFTER_FORK, FileLock
+from journyio.spool import EventSpool
+from journyio.throttle import SharedRateLimiter, TokenBucket
+from journyio.tracker import BufferedTracker
+from journyio.user_identified import UserIdentified
+
+from .helpers import RecordingHttpClient, create_response
+
+user = UserIdentified.by_user_id("user_id")
+
+requires_fork = pytest.mark.skipif(
+    not hasattr(os, "fork") or not HAS_AFTER_FORK,
+    reason="requires fork and os.register_at_fork",
+)
+
+
+def in_child(function) -> int:
+    """
+    Runs function in a forked child and returns its exit code, 0 when it returned True.
+    """
+    pid = os.fork()
+    if pid == 0:
+        try:
+            code = 0 if function() else 1
+        except BaseException:
+            code = 2
+        os._exit(code)
+    return os.WEXITSTATUS(os.waitpid(pid, 0)[1])
+
+
+def test_file_lock(tmp_path):
+    path = str(tmp_path / "lock")
+    first, second = FileLock(path), FileLock(path)
+
+    assert first.acquire(False)
+    assert not second.acquire(False)
+    first.release()
+    with second:
+        assert not first.acquire(False)
+    assert first.acquire(False)
+    first.release()
+
+
+def test_register_after_fork_forgets_dead_instances(tmp_path):
+    gc.collect()
+    registered = len(process._after_fork)
+    for i in range(100):
+        FileLock(str(tmp_path / "lock"))
+    gc.collect()
+
+    assert len(process._after_fork) == registered
+
+
+def test_shared_rate_limiter(tmp_path):
+    path = str(tmp_path / "quota")
+    first = SharedRateLimiter(path, rate=0.001, capacity=2)
+    second = SharedRateLimiter(path, rate=0.001, capacity=2)
+
+    assert first.reserve() == 0
+    assert second.reserve() == 0
+    assert first.reserve() > 100
+
+    second.observe(create_response(201))
+    assert first.calls_remaining == 4999
+
+
+def test_shared_rate_limiter_replaces_stale_bucket(tmp_path):
+    path = str(tmp_path / "quota")
+    now = time.monotonic()
+    with open(path, "wb") as file:
+        file.write(TokenBucket(30.0, -1000.0, now + 1000, now + 2000).pack())
+
+    assert SharedRateLimiter(path, capacity=2).reserve() == 0
+
+    with open(path, "r+b") as file:
+        file.write(TokenBucket(30.0, 2.0, now, now + 1e6).pack())
+
+    assert SharedRateLimiter(path, capacity=2).reserve() == 0
+
+
+@requires_fork
+def test_shared_rate_limiter_across_processes(tmp_path):
+    rate_limiter = SharedRateLimiter(str(tmp_path / "quota"), rate=0.001, capacity=6)
+
+    def reserve_three():
+        return all(rate_limiter.reserve() == 0 for _ in range(3))
+
+    assert in_child(reserve_three) == 0
+    assert in_child(reserve_three) == 0
+    assert rate_limiter.reserve() > 100
+
+
+@requires_fork
+def test_components_rebuild_after_fork():
+    blocked = threading.Event()
+    parent_client = RecordingHttpClient(blocked)
+    tracker = BufferedTracker(
+        Client(parent_client, Config("api-key")), flush_at=1, flush_interval=0.01
+    )
+    for _ in range(3):
+        tracker.add_event(Event.for_user("parent", user))
+    http_client = HttpClientRequests()
+    session = http_client.session
+    future_client = FutureClient(Client(RecordingHttpClient(), Config("api-key")))
+    future_client.add_event(Event.for_user("parent", user)).result()
+
+    def child():
+        fresh_session = http_client.session is not session
+        empty = tracker.queue_size == 0
+        child_client = RecordingHttpClient()
+        tracker.client = Client(child_client, Config("api-key"))
+        tracker.add_event(Event.for_user("child", user))
+        flushed = tracker.flush(5)
+        sent = future_client.add_event(Event.for_user("child", user)).result(5)
+        return fresh_session and empty and flushed and sent.request_id == "requestId"
+
+    assert in_child(child) == 0
+
+    blocked.set()
+    assert tracker.flush(5)
+    assert parent_client.names == ["parent"] * 3
+    tracker.close()
+    future_client.close()
+    http_client.close()
+
+
+@requires_fork
+def test_spool_shared_after_fork(tmp_path):
+    http_client = RecordingHttpClient()
+    spool = EventSpool(
+        Client(http_client, Config("api-key")),
+        str(tmp_path / "spool.db"),
+        sync_interval=0.01,
+        retry_interval=0.05,
+    )
+    spool.add_event(Event.for_user("parent", user))
+    assert spool.flush(5)
+
+    def child():
+        for i in range(3):
+            spool.add_event(Event.for_user(f"child-{i}", user))
+        spool.close()
+        return True
+
+    assert in_child(child) == 0
+    spool.add_event(Event.for_user("parent", user))
+    assert spool.flush(5)
+    spool.close()
+
+    assert http_client.names[0] == "parent"
+    assert sorted(http_client.names[1:]) == ["child-0", "child-1", "child-2", "parent"]
+
+
+def test_spool_without_file_locks(tmp_path, monkeypatch):
+    monkeypatch.setattr(spool, "HAS_FILE_LOCKS", False)
+    http_client = RecordingHttpClient()
+    event_spool = EventSpool(
+        Client(http_client, Config("api-key")), str(tmp_path / "spool.db")
+    )
+
+    event_spool.add_event(Event.for_user("login", user))
+    assert event_spool.flush(5)
+    event_spool.close()
+
+    assert http_client.names == ["login"]
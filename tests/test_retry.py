@@ -0,0 +1,201 @@
+import time
+
+import pytest
+
+from journyio.client import Client, Config, Properties
+from journyio.events import Event
+from journyio.httpclient import HttpClient, HttpClientTesting, HttpResponse, HttpHeaders
+from journyio.results import Success, Failure
+from journyio.retry import RetryPolicy, CircuitBreaker, CircuitState
+from journyio.throttle import RateLimiter
+from journyio.user_identified import UserIdentified
+from journyio.utils import JournyException, APIError
+
+from .helpers import create_response
+
+user = UserIdentified.by_user_id("user_id")
+
+
+class SequenceHttpClient(HttpClient):
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def send(self, request):
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return create_response(outcome)
+
+
+def create_client(http_client, **kwargs):
+    return Client(http_client, Config("api-key", **kwargs))
+
+
+def test_retry_policy():
+    policy = RetryPolicy(max_attempts=5, base_delay=1, max_delay=3)
+
+    for attempt in range(1, 6):
+        assert 0 <= policy.backoff(attempt) <= min(3, 2 ** (attempt - 1))
+
+    with pytest.raises(JournyException):
+        RetryPolicy(max_attempts=0)
+    with pytest.raises(JournyException):
+        RetryPolicy(base_delay=2, max_delay=1)
+    with pytest.raises(JournyException):
+        Config("api-key", retry_policy=3)
+
+
+def test_client_retries_transient_responses():
+    http_client = SequenceHttpClient(503, 500, 201)
+    client = create_client(
+        http_client, retry_policy=RetryPolicy(max_attempts=3, base_delay=0)
+    )
+
+    response = client.upsert_user(user, Properties())
+
+    assert isinstance(response, Success)
+    assert http_client.calls == 3
+
+
+def test_client_gives_up_after_max_attempts():
+    http_client = SequenceHttpClient(429)
+    client = create_client(
+        http_client, retry_policy=RetryPolicy(max_attempts=2, base_delay=0)
+    )
+
+    response = client.get_api_key_details()
+
+    assert isinstance(response, Failure)
+    assert response.error is APIError.TooManyRequests
+    assert http_client.calls == 2
+
+
+def test_client_does_not_retry_non_idempotent_calls():
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    event = Event.for_user("login", user)
+
+    http_client = SequenceHttpClient(500, 201)
+    assert create_client(http_client, retry_policy=policy).add_event(event).error is (
+        APIError.ServerError
+    )
+    assert http_client.calls == 1
+
+    http_client = SequenceHttpClient(JournyException("Connection reset"), 201)
+    with pytest.raises(JournyException):
+        create_client(http_client, retry_policy=policy).add_event(event)
+    assert http_client.calls == 1
+
+    http_client = SequenceHttpClient(503, 201)
+    response = create_client(http_client, retry_policy=policy).add_event(event)
+    assert isinstance(response, Success)
+    assert http_client.calls == 2
+
+    http_client = SequenceHttpClient(JournyException("Connection reset"), 201)
+    client = create_client(
+        http_client,
+        retry_policy=RetryPolicy(base_delay=0, retry_non_idempotent=True),
+    )
+    assert isinstance(client.add_event(event), Success)
+
+
+def test_client_retry_deadline():
+    http_client = SequenceHttpClient(ValueError("Connection refused"))
+    client = create_client(
+        http_client,
+        retry_policy=RetryPolicy(
+            max_attempts=100, base_delay=0.04, max_delay=0.04, deadline=0.01
+        ),
+    )
+
+    with pytest.raises(JournyException):
+        client.link(user, "device_id")
+    assert http_client.calls < 100
+
+
+def test_client_timeout_stops_backoff():
+    retry_headers = HttpHeaders()
+    retry_headers["Retry-After"] = "5"
+    http_client = HttpClientTesting(
+        HttpResponse(503, retry_headers, {"meta": {"requestId": "requestId"}})
+    )
+    client = create_client(http_client, retry_policy=RetryPolicy(), timeout=1)
+
+    started = time.monotonic()
+    response = client.link(user, "device_id")
+
+    assert isinstance(response, Failure)
+    assert time.monotonic() - started < 1
+    assert 0 < http_client.received_request.timeout <= 1
+
+
+def test_circuit_breaker():
+    circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+    assert circuit_breaker.allow()
+    circuit_breaker.record(create_response(500))
+    circuit_breaker.record(create_response(429))
+    circuit_breaker.record(None)
+    assert circuit_breaker.state is CircuitState.CLOSED
+    circuit_breaker.record(None)
+    assert circuit_breaker.state is CircuitState.OPEN
+    assert not circuit_breaker.allow()
+
+    time.sleep(0.06)
+    assert circuit_breaker.allow()
+    assert circuit_breaker.state is CircuitState.HALF_OPEN
+    assert not circuit_breaker.allow()
+    circuit_breaker.record(create_response(502))
+    assert circuit_breaker.state is CircuitState.OPEN
+
+    time.sleep(0.06)
+    assert circuit_breaker.allow()
+    circuit_breaker.record(create_response(201))
+    assert circuit_breaker.state is CircuitState.CLOSED
+
+
+def test_circuit_breaker_trial_without_outcome():
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    circuit_breaker.record(None)
+
+    time.sleep(0.06)
+    assert circuit_breaker.allow()
+    circuit_breaker.release()
+    assert circuit_breaker.allow()
+    assert not circuit_breaker.allow()
+
+    time.sleep(0.06)
+    assert circuit_breaker.allow()
+    assert circuit_breaker.state is CircuitState.HALF_OPEN
+
+
+def test_client_with_circuit_breaker():
+    http_client = SequenceHttpClient(JournyException("Connection refused"))
+    client = create_client(
+        http_client, circuit_breaker=CircuitBreaker(failure_threshold=2)
+    )
+
+    for _ in range(4):
+        with pytest.raises(JournyException):
+            client.delete_user(user)
+
+    assert http_client.calls == 2
+
+
+def test_client_releases_circuit_breaker_trial_on_timeout():
+    http_client = SequenceHttpClient(JournyException("Connection refused"), 201)
+    client = create_client(
+        http_client,
+        circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05),
+        rate_limiter=RateLimiter(1, 1),
+    )
+
+    with pytest.raises(JournyException):
+        client.link(user, "device_id")
+    time.sleep(0.06)
+    with pytest.raises(JournyException):
+        client.link(user, "device_id", timeout=0.01)
+
+    assert isinstance(client.link(user, "device_id"), Success)
+    assert client.config.circuit_breaker.state is CircuitState.CLOSED
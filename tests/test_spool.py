@@ -0,0 +1,185 @@
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from journyio.client import AsyncClient, Client, Config
+from journyio.events import Event
+from journyio.httpclient import AsyncHttpClientTesting, HttpClient, HttpResponse
+from journyio.spool import EventSpool
+from journyio.tracker import OverflowPolicy
+from journyio.user_identified import UserIdentified
+from journyio.utils import JournyException
+
+from .helpers import create_response, headers
+
+user = UserIdentified.by_user_id("user_id")
+
+
+class SwitchHttpClient(HttpClient):
+    def __init__(self, status_code=201):
+        self.status_code = status_code
+        self.names = []
+
+    def send(self, request):
+        if self.status_code is None:
+            raise JournyException("Connection refused")
+        name = json.loads(request.body)["name"]
+        if name == "bad":
+            return create_response(400)
+        if self.status_code < 300:
+            self.names.append(name)
+        return HttpResponse(
+            self.status_code, headers, {"meta": {"requestId": "requestId"}}
+        )
+
+
+class GatedHttpClient(SwitchHttpClient):
+    def __init__(self):
+        super().__init__()
+        self.sending = threading.Event()
+        self.gate = threading.Event()
+
+    def send(self, request):
+        self.sending.set()
+        self.gate.wait()
+        return super().send(request)
+
+
+def create_spool(http_client, path, **kwargs):
+    return EventSpool(Client(http_client, Config("api-key")), str(path), **kwargs)
+
+
+def test_spool_sends_events_in_order(tmp_path):
+    http_client = SwitchHttpClient()
+    spool = create_spool(http_client, tmp_path / "spool.db", sync_interval=0.01)
+
+    for i in range(20):
+        assert spool.add_event(Event.for_user(f"event-{i}", user))
+    spool.add_event(Event.for_user("bad", user))
+
+    assert spool.flush(5)
+    assert http_client.names == [f"event-{i}" for i in range(20)]
+    assert spool.size == 0
+    assert spool.bytes == 0
+    spool.close()
+
+    with pytest.raises(JournyException):
+        spool.add_event(Event.for_user("login", user))
+
+
+def test_spool_survives_restart(tmp_path):
+    path = tmp_path / "spool.db"
+    http_client = SwitchHttpClient(None)
+    results = []
+    attempted = threading.Event()
+
+    def on_result(body, result):
+        results.append(result)
+        attempted.set()
+
+    spool = create_spool(
+        http_client, path, sync_every=2, retry_interval=60, on_result=on_result
+    )
+    for i in range(3):
+        spool.add_event(Event.for_user(f"event-{i}", user))
+    assert attempted.wait(5)
+    assert not spool.flush(0.05)
+    spool.close()
+
+    assert isinstance(results[0], JournyException)
+    connection = sqlite3.connect(str(path))
+    assert connection.execute("SELECT COUNT(*) FROM events").fetchone() == (3,)
+    connection.close()
+
+    http_client.status_code = 201
+    spool = create_spool(http_client, path)
+    assert spool.flush(5)
+    assert http_client.names == ["event-0", "event-1", "event-2"]
+    spool.close()
+
+
+def test_spool_retries_server_errors(tmp_path):
+    http_client = SwitchHttpClient(503)
+    attempts = []
+    spool = create_spool(
+        http_client,
+        tmp_path / "spool.db",
+        retry_interval=0.01,
+        on_result=lambda body, result: attempts.append(result),
+    )
+
+    spool.add_event(Event.for_user("login", user))
+    while len(attempts) < 2:
+        spool.flush(0.01)
+    http_client.status_code = 201
+
+    assert spool.flush(5)
+    assert http_client.names == ["login"]
+    spool.close()
+
+
+def test_spool_max_bytes(tmp_path):
+    http_client = SwitchHttpClient(None)
+    event_size = len(
+        Client(http_client, Config("api-key"))._event_body(
+            Event.for_user("event-0", user)
+        )
+    )
+    spool = create_spool(
+        http_client,
+        tmp_path / "spool.db",
+        max_bytes=event_size * 2,
+        retry_interval=60,
+    )
+
+    for i in range(4):
+        assert spool.add_event(Event.for_user(f"event-{i}", user))
+    assert spool.size == 2
+    assert spool.dropped == 2
+    assert spool.bytes <= event_size * 2
+
+    spool.overflow_policy = OverflowPolicy.DROP_NEWEST
+    assert not spool.add_event(Event.for_user("event-5", user))
+    spool.overflow_policy = OverflowPolicy.RAISE
+    with pytest.raises(JournyException):
+        spool.add_event(Event.for_user("event-6", user))
+    spool.close()
+
+    with pytest.raises(JournyException):
+        create_spool(
+            http_client, tmp_path / "other.db", overflow_policy=OverflowPolicy.BLOCK
+        )
+    with pytest.raises(JournyException):
+        create_spool(http_client, tmp_path / "other.db", retry_interval=0)
+    with pytest.raises(JournyException):
+        EventSpool(
+            AsyncClient(
+                AsyncHttpClientTesting(HttpResponse(201, headers, None)),
+                Config("api-key"),
+            ),
+            str(tmp_path / "async.db"),
+        )
+
+
+def test_spool_drops_event_that_is_being_sent(tmp_path):
+    http_client = GatedHttpClient()
+    event_size = len(
+        Client(http_client, Config("api-key"))._event_body(
+            Event.for_user("event-0", user)
+        )
+    )
+    spool = create_spool(http_client, tmp_path / "spool.db", max_bytes=event_size)
+
+    spool.add_event(Event.for_user("event-0", user))
+    assert http_client.sending.wait(5)
+    spool.add_event(Event.for_user("event-1", user))
+    assert spool.dropped == 1
+
+    threading.Timer(0.1, http_client.gate.set).start()
+    spool.close()
+
+    assert http_client.names == ["event-0"]
+    assert spool.size == 1
+    assert spool.bytes == event_size
@@ -0,0 +1,99 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from journyio.account_identified import AccountIdentified
+from journyio.events import Event, Metadata
+from journyio.httpclient import HttpHeaders, Method
+from journyio.templates import (
+    RequestTemplate,
+    encode_event,
+    encode_user,
+    encode_account,
+    encode_identification,
+    encode_upsert,
+    encode_members,
+    encode_link,
+)
+from journyio.user_identified import UserIdentified
+
+users = [
+    UserIdentified("user_id", "user@journy.io"),
+    UserIdentified.by_user_id('quote " and \\ backslash'),
+    UserIdentified.by_email("émile@journy.io"),
+]
+accounts = [
+    AccountIdentified("account_id", "www.journy.io"),
+    AccountIdentified.by_account_id("日本"),
+    AccountIdentified.by_domain("journy.io"),
+]
+
+
+def test_encode_identifications():
+    for user in users:
+        assert encode_user(user) == json.dumps(user.format_identification())
+        assert encode_identification(encode_user(user)) == json.dumps(
+            {"identification": user.format_identification()}
+        )
+    for account in accounts:
+        assert encode_account(account) == json.dumps(account.format_identification())
+
+
+def test_encode_event():
+    metadata = Metadata()
+    metadata["true"] = True
+    metadata["key"] = "välue"
+    dt = datetime.strptime("2020-11-2 13:37:40", "%Y-%m-%d %H:%M:%S")
+    events = [
+        Event.for_user("login", users[0]),
+        Event.for_account("login\n", accounts[1]).happened_at(dt),
+        Event.for_user_in_account("log\tin", users[1], accounts[0])
+        .happened_at(dt)
+        .with_metadata(metadata),
+    ]
+
+    for event in events:
+        body = {"identification": {}, "name": event.name}
+        if event.user:
+            body["identification"]["user"] = event.user.format_identification()
+        if event.account:
+            body["identification"]["account"] = event.account.format_identification()
+        body["metadata"] = event.metadata.metadata
+        if event.date:
+            body["triggeredAt"] = event.date.isoformat()
+        assert encode_event(event) == json.dumps(body)
+
+
+def test_encode_bodies():
+    properties = {"name": "Journy", "tags": ["a", "b"], "count": 2, "gone": None}
+    assert encode_upsert(encode_user(users[0]), properties) == json.dumps(
+        {"identification": users[0].format_identification(), "properties": properties}
+    )
+    for members in [[], users]:
+        assert encode_members(accounts[0], members) == json.dumps(
+            {
+                "account": accounts[0].format_identification(),
+                "users": [
+                    {"identification": user.format_identification()} for user in members
+                ],
+            }
+        )
+    assert encode_link(users[2], "dévice") == json.dumps(
+        {"deviceId": "dévice", "identification": users[2].format_identification()}
+    )
+
+
+def test_request_template():
+    headers = HttpHeaders()
+    headers["x-api-key"] = "api-key"
+    template = RequestTemplate("https://api.journy.io/validate", Method.GET, headers)
+
+    request = template.request(None, "?domain=journy.io")
+    assert request.url == "https://api.journy.io/validate?domain=journy.io"
+    assert request.method is Method.GET
+    assert request.headers is headers
+    assert request.body is None
+
+    with pytest.raises(AttributeError):
+        template.url = "https://journy.io"
@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+from journyio.client import Client, Config
+from journyio.events import Event
+from journyio.httpclient import HttpClientTesting, HttpResponse, HttpHeaders
+from journyio.throttle import RateLimiter, parse_delay
+from journyio.user_identified import UserIdentified
+from journyio.utils import JournyException, JournyTimeoutException
+
+
+def create_response(status_code=201, **header_values):
+    headers = HttpHeaders()
+    for header, value in header_values.items():
+        headers[header.replace("_", "-")] = value
+    return HttpResponse(status_code, headers, {"meta": {"requestId": "requestId"}})
+
+
+def test_parse_delay():
+    assert parse_delay(None) is None
+    assert parse_delay("") is None
+    assert parse_delay("not a date") is None
+    assert parse_delay("2.5") == 2.5
+    assert parse_delay("-3") == 0.0
+    assert parse_delay("1600000030", now=1600000000) == 30
+    assert parse_delay("Sun, 13 Sep 2020 12:27:10 GMT", now=1600000000) == 30
+
+
+def test_rate_limiter_reserve():
+    rate_limiter = RateLimiter(rate=10, capacity=2)
+
+    assert rate_limiter.reserve() == 0
+    assert rate_limiter.reserve() == 0
+    assert rate_limiter.reserve() == pytest.approx(0.1, abs=0.01)
+    assert rate_limiter.reserve() == pytest.approx(0.2, abs=0.01)
+
+    with pytest.raises(JournyException):
+        RateLimiter(rate=0)
+    with pytest.raises(JournyException):
+        RateLimiter(capacity=1.5)
+
+
+def test_rate_limiter_reserve_max_delay():
+    rate_limiter = RateLimiter(rate=10, capacity=1)
+
+    assert rate_limiter.reserve(0) == 0
+    assert rate_limiter.reserve(0.05) == pytest.approx(0.1, abs=0.01)
+    assert rate_limiter.reserve() == pytest.approx(0.1, abs=0.01)
+
+
+def test_rate_limiter_observe_remaining():
+    rate_limiter = RateLimiter(rate=100, capacity=100)
+
+    rate_limiter.observe(create_response(X_RateLimit_Remaining="120"))
+    assert rate_limiter.calls_remaining == 120
+    assert rate_limiter.rate == 2
+
+    rate_limiter.observe(
+        create_response(X_RateLimit_Remaining="50", X_RateLimit_Reset="10")
+    )
+    assert rate_limiter.rate == 5
+    assert rate_limiter.reserve() == 0
+
+    rate_limiter.observe(
+        create_response(X_RateLimit_Remaining="6000", X_RateLimit_Reset="1")
+    )
+    assert rate_limiter.rate == 100
+
+
+def test_rate_limiter_observe_too_many_requests():
+    rate_limiter = RateLimiter()
+
+    rate_limiter.observe(create_response(429, Retry_After="3"))
+    assert rate_limiter.reserve() == pytest.approx(3, abs=0.01)
+
+    rate_limiter = RateLimiter(default_retry_after=2)
+    rate_limiter.observe(create_response(429))
+    assert rate_limiter.reserve() == pytest.approx(2, abs=0.01)
+
+    rate_limiter = RateLimiter()
+    rate_limiter.observe(
+        create_response(X_RateLimit_Remaining="0", X_RateLimit_Reset="5")
+    )
+    assert rate_limiter.reserve() == pytest.approx(5, abs=0.01)
+
+
+def test_client_with_rate_limiter():
+    rate_limiter = RateLimiter()
+    config = Config("api-key", rate_limiter=rate_limiter)
+    client = Client(
+        HttpClientTesting(create_response(X_RateLimit_Remaining="4999")), config
+    )
+
+    response = client.add_event(
+        Event.for_user("login", UserIdentified.by_user_id("user_id"))
+    )
+
+    assert response.calls_remaining == 4999
+    assert rate_limiter.calls_remaining == 4999
+
+    with pytest.raises(JournyException):
+        Config("api-key", rate_limiter=30)
+
+
+def test_client_timeout_while_queued():
+    rate_limiter = RateLimiter(rate=1, capacity=1)
+    client = Client(
+        HttpClientTesting(create_response()),
+        Config("api-key", rate_limiter=rate_limiter),
+    )
+    event = Event.for_user("login", UserIdentified.by_user_id("user_id"))
+    client.add_event(event)
+
+    started = time.monotonic()
+    with pytest.raises(JournyTimeoutException):
+        client.add_event(event, timeout=0.1)
+    assert time.monotonic() - started < 0.1
+    assert rate_limiter.reserve() == pytest.approx(1, abs=0.05)
@@ -0,0 +1,162 @@
+import threading
+import time
+
+import pytest
+
+from journyio.client import AsyncClient, Client, Config
+from journyio.events import Event
+from journyio.httpclient import AsyncHttpClientTesting
+from journyio.results import Success
+from journyio.tracker import BufferedTracker, OverflowPolicy
+from journyio.user_identified import UserIdentified
+from journyio.utils import JournyException
+
+from .helpers import RecordingHttpClient, created_response
+
+user = UserIdentified("user_id", "user@journy.io")
+
+
+def create_tracker(http_client, **kwargs):
+    return BufferedTracker(Client(http_client, Config("api-key")), **kwargs)
+
+
+def test_tracker_flush():
+    http_client = RecordingHttpClient()
+    results = []
+    tracker = create_tracker(
+        http_client,
+        flush_at=1000,
+        flush_interval=60,
+        workers=2,
+        on_result=lambda event, result: results.append(result),
+    )
+
+    for i in range(10):
+        assert tracker.add_event(Event.for_user(f"event-{i}", user))
+    assert tracker.flush(5)
+
+    assert tracker.queue_size == 0
+    assert len(http_client.requests) == 10
+    assert len(results) == 10
+    assert all(isinstance(result, Success) for result in results)
+    tracker.close()
+
+
+def test_tracker_flush_at_size():
+    http_client = RecordingHttpClient()
+    done = threading.Event()
+    tracker = create_tracker(
+        http_client,
+        flush_at=5,
+        flush_interval=60,
+        on_result=lambda event, result: (
+            done.set() if len(http_client.requests) == 5 else None
+        ),
+    )
+
+    for i in range(5):
+        tracker.add_event(Event.for_user("login", user))
+
+    assert done.wait(5)
+    tracker.close()
+
+
+def test_tracker_flush_interval():
+    http_client = RecordingHttpClient()
+    done = threading.Event()
+    tracker = create_tracker(
+        http_client,
+        flush_at=100,
+        flush_interval=0.05,
+        on_result=lambda event, result: done.set(),
+    )
+
+    tracker.add_event(Event.for_user("login", user))
+
+    assert done.wait(5)
+    tracker.close()
+
+
+def test_tracker_overflow_policies():
+    gate = threading.Event()
+    tracker = create_tracker(
+        RecordingHttpClient(gate),
+        max_queue_size=2,
+        flush_at=100,
+        flush_interval=60,
+        overflow_policy=OverflowPolicy.DROP_NEWEST,
+    )
+    assert tracker.add_event(Event.for_user("first", user))
+    assert tracker.add_event(Event.for_user("second", user))
+    assert not tracker.add_event(Event.for_user("third", user))
+    assert tracker.dropped == 1
+
+    tracker.overflow_policy = OverflowPolicy.RAISE
+    with pytest.raises(JournyException):
+        tracker.add_event(Event.for_user("third", user))
+
+    tracker.overflow_policy = OverflowPolicy.DROP_OLDEST
+    assert tracker.add_event(Event.for_user("third", user))
+    assert tracker.dropped == 2
+    assert tracker.queue_size == 2
+
+    gate.set()
+    tracker.close()
+
+
+def test_tracker_close():
+    http_client = RecordingHttpClient()
+    tracker = create_tracker(http_client, flush_at=100, flush_interval=60)
+
+    for i in range(3):
+        tracker.add_event(Event.for_user("login", user))
+    tracker.close()
+
+    assert len(http_client.requests) == 3
+    with pytest.raises(JournyException):
+        tracker.add_event(Event.for_user("login", user))
+    with pytest.raises(JournyException):
+        tracker.add_event("event")
+    with pytest.raises(JournyException):
+        create_tracker(http_client, workers=0)
+    with pytest.raises(JournyException):
+        create_tracker(http_client, exit_timeout=0)
+    with pytest.raises(JournyException):
+        BufferedTracker(
+            AsyncClient(AsyncHttpClientTesting(created_response), Config("api-key"))
+        )
+
+
+def test_tracker_close_timeout():
+    gate = threading.Event()
+    http_client = RecordingHttpClient(gate)
+    tracker = create_tracker(http_client, flush_at=1, flush_interval=60)
+
+    for i in range(3):
+        tracker.add_event(Event.for_user("login", user))
+    started_at = time.monotonic()
+    tracker.close(0.2)
+
+    assert time.monotonic() - started_at < 2
+    gate.set()
+    assert tracker.flush(5)
+    assert len(http_client.requests) == 1
+    assert tracker.dropped == 2
+
+
+def test_tracker_close_stops_after_failures():
+    results = []
+    tracker = create_tracker(
+        RecordingHttpClient(fail_after=0),
+        flush_at=100,
+        flush_interval=60,
+        on_result=lambda event, result: results.append(result),
+    )
+
+    for i in range(10):
+        tracker.add_event(Event.for_user("login", user))
+    tracker.close()
+
+    assert len(results) == BufferedTracker.MAX_CLOSE_FAILURES
+    assert all(isinstance(result, JournyException) for result in results)
+    assert tracker.dropped == 10 - BufferedTracker.MAX_CLOSE_FAILURES